@@ -1,11 +1,31 @@
+import gzip
+import io
 import json
+import logging
+import threading
+import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Union
+from typing import IO, Iterator, List, Literal, Optional, Union, cast
 
 from pylabrobot import __version__
 from pylabrobot.io.errors import ValidationError
 
+try:
+  import zstandard  # type: ignore[import-not-found]
+
+  USE_ZSTD = True
+except ImportError:
+  USE_ZSTD = False
+
+
+logger = logging.getLogger(__name__)
+
+Compression = Literal["gzip", "zstd"]
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
 
 @dataclass
 class Command:
@@ -14,40 +34,151 @@ class Command:
   action: str
 
 
+def _segment_path(path: Path, segment: int) -> Path:
+  """The path of a segment of a capture: `run.jsonl.gz`, `run.1.jsonl.gz`, `run.2.jsonl.gz`..."""
+  if segment == 0:
+    return path
+  base, dot, suffixes = path.name.partition(".")
+  return path.with_name(f"{base}.{segment}{dot}{suffixes}")
+
+
+def _open_for_writing(path: Path, compression: Optional[Compression]) -> IO[bytes]:
+  if compression == "gzip":
+    return gzip.open(path, "wb")  # type: ignore[return-value]
+  if compression == "zstd":
+    if not USE_ZSTD:
+      raise RuntimeError("zstd compression requires zstandard: `pip install zstandard`.")
+    return cast(IO[bytes], zstandard.ZstdCompressor().stream_writer(open(path, "wb")))
+  return open(path, "wb")
+
+
+def _open_for_reading(path: Path) -> IO[bytes]:
+  with open(path, "rb") as f:
+    magic = f.read(4)
+  if magic.startswith(_GZIP_MAGIC):
+    return gzip.open(path, "rb")  # type: ignore[return-value]
+  if magic.startswith(_ZSTD_MAGIC):
+    if not USE_ZSTD:
+      raise RuntimeError(f"{path} is zstd compressed. Install zstandard to read it.")
+    reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+    return cast(IO[bytes], io.BufferedReader(reader))
+  return open(path, "rb")
+
+
 class _CaptureWriter:
+  """Streams recorded commands to a JSON Lines file.
+
+  The first line of each file is a header with the PyLabRobot version and a capture id, and every
+  following line is a command. Commands are buffered in memory and written by a background thread
+  every `flush_interval` seconds, or as soon as `max_buffered_commands` are buffered, so a capture
+  that is interrupted loses at most the last interval and memory use is bounded. If
+  `max_file_size` is set, a new file is started when the uncompressed size of the current file
+  exceeds it.
+  """
+
   def __init__(self):
-    self._path = None
-    self._commands: List[Command] = []
+    self._path: Optional[Path] = None
     self._capture_active = False
+    self._buffer: List[dict] = []
+    self._buffer_lock = threading.Lock()
+    self._file_lock = threading.Lock()
+    self._file: Optional[IO[bytes]] = None
+    self._capture_id = ""
+    self._segment = 0
+    self._segment_size = 0
+    self._flush_thread: Optional[threading.Thread] = None
+    self._flush_requested = threading.Event()
+    self._stop_flushing = threading.Event()
+
+    self.compression: Optional[Compression] = None
+    self.flush_interval = 1.0
+    self.max_file_size: Optional[int] = None
+    self.max_buffered_commands = 10_000
 
   def record(self, command: Command):
     if self._capture_active:
-      self._commands.append(command)
+      with self._buffer_lock:
+        self._buffer.append(dict(command.__dict__))
+        if len(self._buffer) >= self.max_buffered_commands:
+          self._flush_requested.set()
 
-  def start(self, path: Path):
+  def start(
+    self,
+    path: Path,
+    compression: Optional[Compression] = None,
+    flush_interval: float = 1.0,
+    max_file_size: Optional[int] = None,
+  ):
     if self._capture_active:
       raise RuntimeError("io capture already active")
-    self._commands = []
+    if compression is None:
+      compression = {".gz": "gzip", ".zst": "zstd"}.get(path.suffix)  # type: ignore[assignment]
+
     self._path = path
+    self.compression = compression
+    self.flush_interval = flush_interval
+    self.max_file_size = max_file_size
+    self._buffer = []
+    self._capture_id = uuid.uuid4().hex
+    self._segment = 0
+    self._open_segment()
+
     self._capture_active = True
+    self._stop_flushing.clear()
+    self._flush_requested.clear()
+    self._flush_thread = threading.Thread(target=self._flush_continuously, daemon=True)
+    self._flush_thread.start()
+
+  def _open_segment(self):
+    assert self._path is not None
+    self._file = _open_for_writing(_segment_path(self._path, self._segment), self.compression)
+    header = {"version": __version__, "capture_id": self._capture_id, "segment": self._segment}
+    line = (json.dumps(header) + "\n").encode()
+    self._file.write(line)
+    self._segment_size = len(line)
+
+  def _flush_continuously(self):
+    while not self._stop_flushing.is_set():
+      self._flush_requested.wait(self.flush_interval)
+      self._flush_requested.clear()
+      self.flush()
+
+  def flush(self):
+    """Write buffered commands to disk."""
+
+    with self._buffer_lock:
+      commands, self._buffer = self._buffer, []
+
+    with self._file_lock:
+      if self._file is None:
+        return
+      for command in commands:
+        if self.max_file_size is not None and self._segment_size >= self.max_file_size:
+          self._file.close()
+          self._segment += 1
+          self._open_segment()
+        line = (json.dumps(command) + "\n").encode()
+        self._file.write(line)
+        self._segment_size += len(line)
+      self._file.flush()
 
   def stop(self):
     if self._path is None:
       raise RuntimeError("io capture not active. Call start() first.")
-    with open(self._path, "w") as f:
-      json.dump(
-        {
-          "version": __version__,
-          "commands": [c.__dict__ for c in self._commands],
-        },
-        f,
-        indent=2,
-      )
-
-    print(f"Validation file written to {self._path}")
 
     self._capture_active = False
-    self._commands = []
+    self._stop_flushing.set()
+    self._flush_requested.set()
+    if self._flush_thread is not None:
+      self._flush_thread.join()
+      self._flush_thread = None
+    self.flush()
+    with self._file_lock:
+      assert self._file is not None
+      self._file.close()
+      self._file = None
+
+    print(f"Validation file written to {self._path}")
     self._path = None
 
   @property
@@ -55,44 +186,106 @@ class _CaptureWriter:
     return self._capture_active
 
 
+def read_capture(path: Union[Path, str]) -> Iterator[dict]:
+  """Lazily iterate over the commands in a capture, including all of its segments.
+
+  Files written by older versions of PyLabRobot, which are a single JSON document, are also
+  supported, but are loaded at once.
+  """
+
+  path = Path(path)
+  capture_id = None
+  segment = 0
+  while True:
+    segment_path = _segment_path(path, segment)
+    if segment > 0 and not segment_path.exists():
+      return
+
+    with _open_for_reading(segment_path) as f:
+      first_line = f.readline()
+      try:
+        header = json.loads(first_line)
+      except json.JSONDecodeError:
+        header = None
+      if not isinstance(header, dict) or "commands" in header:  # single JSON document
+        f.seek(0)
+        yield from json.load(f)["commands"]
+        return
+
+      if segment > 0 and header.get("capture_id") != capture_id:
+        return  # left over from another capture
+      capture_id = header.get("capture_id")
+
+      try:
+        for line in f:
+          if line.strip() != b"":
+            yield json.loads(line)
+      except (json.JSONDecodeError, EOFError) as e:
+        logger.warning("Capture file %s is truncated: %s", segment_path, e)
+        return
+
+    segment += 1
+
+
 class CaptureReader:
   def __init__(self, path: str):
     self.path = path
-    self.commands: List[dict] = []
-    with open(path, "r") as f:
-      data = json.load(f)
-      for c in data["commands"]:
-        self.commands.append(c)
-    self._command_idx = 0
+    self.reset()
+
+  def __iter__(self) -> Iterator[dict]:
+    return read_capture(self.path)
+
+  @property
+  def commands(self) -> List[dict]:
+    """All commands in the capture. This reads the whole capture into memory."""
+    return list(self)
 
   def next_command(self) -> dict:
-    command = self.commands[self._command_idx]
+    try:
+      command = next(self._commands)
+    except StopIteration:
+      raise ValidationError("Log file fully read, but another command was sent.")
     self._command_idx += 1
     return command
 
   def done(self):
-    if self._command_idx < len(self.commands):
-      left = len(self.commands) - self._command_idx
-      next_command = self.commands[self._command_idx]
-      raise ValidationError(
-        f"Log file not fully read, {left} lines left. First command: {next_command}"
-      )
+    first = next(self._commands, None)
+    if first is not None:
+      left = 1 + sum(1 for _ in self._commands)
+      raise ValidationError(f"Log file not fully read, {left} lines left. First command: {first}")
     print("Validation successful!")
 
   def reset(self):
+    self._commands = iter(self)
     self._command_idx = 0
 
 
 capturer = _CaptureWriter()
 
 
-def start_capture(fp: Union[Path, str] = Path("./validation")):
-  """Start capturing all IO events to log file."""
+def start_capture(
+  fp: Union[Path, str] = Path("./validation"),
+  compression: Optional[Compression] = None,
+  flush_interval: float = 1.0,
+  max_file_size: Optional[int] = None,
+):
+  """Start capturing all IO events to log file.
+
+  Args:
+    fp: path of the capture file.
+    compression: "gzip" or "zstd". If `None`, inferred from the suffix of `fp` (".gz" or ".zst").
+    flush_interval: seconds between writes to disk.
+    max_file_size: if set, start a new file when the uncompressed size of the current file exceeds
+      this number of bytes. Files after the first are named like `fp` with the file number
+      inserted before the suffixes, e.g. `capture.1.jsonl.gz`.
+  """
   if not isinstance(fp, Path):
     fp = Path(fp)
   if fp.is_dir():
     raise ValueError("Path is a directory, please provide a file path.")
-  capturer.start(fp)
+  capturer.start(
+    fp, compression=compression, flush_interval=flush_interval, max_file_size=max_file_size
+  )
 
 
 def stop_capture():
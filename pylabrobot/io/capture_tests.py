@@ -0,0 +1,85 @@
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from pylabrobot.io.capture import (
+  USE_ZSTD,
+  CaptureReader,
+  Command,
+  _CaptureWriter,
+  read_capture,
+)
+from pylabrobot.io.errors import ValidationError
+
+
+class TestCapture(unittest.TestCase):
+  def setUp(self):
+    self.dir = tempfile.TemporaryDirectory()
+    self.writer = _CaptureWriter()
+
+  def tearDown(self):
+    self.dir.cleanup()
+
+  def capture(self, name: str, num_commands: int = 3, **kwargs) -> Path:
+    path = Path(self.dir.name) / name
+    self.writer.start(path, **kwargs)
+    for i in range(num_commands):
+      self.writer.record(Command(module="usb", device_id="dev", action=f"write {i}"))
+    self.writer.stop()
+    return path
+
+  def test_jsonl(self):
+    path = self.capture("capture.jsonl")
+    with open(path) as f:
+      lines = f.read().splitlines()
+    self.assertEqual(len(lines), 4)
+    self.assertIn("capture_id", json.loads(lines[0]))
+    self.assertEqual([c["action"] for c in read_capture(path)], ["write 0", "write 1", "write 2"])
+
+  def test_gzip(self):
+    path = self.capture("capture.jsonl.gz")
+    with gzip.open(path, "rt") as f:
+      self.assertEqual(len(f.read().splitlines()), 4)
+    self.assertEqual(len(list(read_capture(path))), 3)
+
+  @unittest.skipIf(not USE_ZSTD, "zstandard is not installed")
+  def test_zstd(self):
+    path = self.capture("capture.jsonl.zst")
+    self.assertEqual(len(list(read_capture(path))), 3)
+
+  def test_rotation(self):
+    path = self.capture("capture.jsonl", num_commands=10, max_file_size=200)
+    self.assertTrue((Path(self.dir.name) / "capture.1.jsonl").exists())
+    self.assertEqual([c["action"] for c in read_capture(path)], [f"write {i}" for i in range(10)])
+
+    # segments left over from an earlier capture are not read
+    self.capture("capture.jsonl", num_commands=1)
+    self.assertEqual(len(list(read_capture(path))), 1)
+
+  def test_flush(self):
+    path = Path(self.dir.name) / "capture.jsonl"
+    self.writer.start(path, flush_interval=60)
+    self.writer.record(Command(module="usb", device_id="dev", action="write"))
+    self.writer.flush()
+    self.assertEqual(len(list(read_capture(path))), 1)
+    self.writer.stop()
+
+  def test_legacy_format(self):
+    path = Path(self.dir.name) / "validation"
+    with open(path, "w") as f:
+      json.dump({"version": "0.1", "commands": [{"module": "usb", "action": "read"}]}, f, indent=2)
+    self.assertEqual(list(read_capture(path)), [{"module": "usb", "action": "read"}])
+
+  def test_reader(self):
+    reader = CaptureReader(str(self.capture("capture.jsonl")))
+    self.assertEqual(reader.next_command()["action"], "write 0")
+    with self.assertRaises(ValidationError):
+      reader.done()
+    reader.reset()
+    for _ in range(3):
+      reader.next_command()
+    reader.done()
+    with self.assertRaises(ValidationError):
+      reader.next_command()
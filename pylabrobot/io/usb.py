@@ -1,7 +1,10 @@
+import asyncio
+import errno
 import logging
+import threading
 import time
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, List, Optional, Union
 
 from pylabrobot.io.capture import Command, capturer
 from pylabrobot.io.errors import ValidationError
@@ -81,6 +84,11 @@ class USB(IOBase):
     self.read_endpoint: Optional[usb.core.Endpoint] = None
     self.write_endpoint: Optional[usb.core.Endpoint] = None
 
+    # background reader, see `start_reader`
+    self._reader_thread: Optional[threading.Thread] = None
+    self._reader_stop = threading.Event()
+    self._frames: Optional["asyncio.Queue[Union[bytes, Exception]]"] = None
+
     # unique id in the logs
     self._unique_id = f"[{hex(self._id_vendor)}:{hex(self._id_product)}][{self._serial_number or ''}][{self._device_address or ''}]"
 
@@ -105,9 +113,22 @@ class USB(IOBase):
       USBCommand(device_id=self._unique_id, action="write", data=data.decode("unicode_escape"))
     )
 
-  def _read_packet(self) -> Optional[bytearray]:
+  async def write_async(self, data: bytes, timeout: Optional[float] = None):
+    """Write data to the device without blocking the event loop.
+
+    The write is run in the default executor. See :meth:`write` for the arguments.
+    """
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, self.write, data, timeout)
+
+  def _read_packet(self, raise_errors: bool = False) -> Optional[bytearray]:
     """Read a packet from the machine.
 
+    Args:
+      raise_errors: If `True`, raise USB errors other than timeouts, for example when the device
+        was disconnected. If `False`, all USB errors are treated as no data being available.
+
     Returns:
       A string containing the decoded packet, or None if no packet was received.
     """
@@ -124,19 +145,55 @@ class USB(IOBase):
       if res is not None:
         return bytearray(res)  # convert res into text
       return None
-    except usb.core.USBError:
+    except usb.core.USBError as e:
       # No data available (yet), this will give a timeout error. Don't reraise.
-      return None
+      if not raise_errors:
+        return None
+      if isinstance(e, getattr(usb.core, "USBTimeoutError", ())) or e.errno == errno.ETIMEDOUT:
+        return None
+      raise
+
+  def _read_frame(self, raise_errors: bool = False) -> Optional[bytearray]:
+    """Read a frame from the device: packets are read until a packet is smaller than the max
+    packet size, because if the packet is that size, there may be more data to read.
+
+    Args:
+      raise_errors: Passed to :meth:`_read_packet`.
+
+    Returns:
+      The frame, or None if no data was received within `packet_read_timeout`.
+    """
+
+    assert self.read_endpoint is not None, "Device not connected."
+
+    resp = bytearray()
+    while True:  # read while we have data, and while the last packet is the max size.
+      last_packet = self._read_packet(raise_errors=raise_errors)
+      if last_packet is not None:
+        resp += last_packet
+      if last_packet is None or len(last_packet) != self.read_endpoint.wMaxPacketSize:
+        break
+    return resp if len(resp) > 0 else None
+
+  def _record_read(self, resp: bytes) -> None:
+    logger.log(LOG_LEVEL_IO, "%s read: %s", self._unique_id, resp)
+    capturer.record(
+      USBCommand(device_id=self._unique_id, action="read", data=resp.decode("unicode_escape"))
+    )
 
   def read(self, timeout: Optional[int] = None) -> bytes:
     """Read a response from the device.
 
+    This blocks the calling thread. In async code, use :meth:`read_async`.
+
     Args:
       timeout: The timeout for reading from the device in seconds. If `None`, use the default
         timeout (specified by the `read_timeout` attribute).
     """
 
     assert self.read_endpoint is not None, "Device not connected."
+    if self._reader_thread is not None:
+      raise RuntimeError("The background reader is running, use read_async instead.")
 
     if timeout is None:
       timeout = self.read_timeout
@@ -145,28 +202,99 @@ class USB(IOBase):
     timeout_time = time.time() + timeout
 
     while time.time() < timeout_time:
-      # read response from endpoint, and keep reading until the packet is smaller than the max
-      # packet size: if the packet is that size, it means that there may be more data to read.
-      resp = bytearray()
-      last_packet: Optional[bytearray] = None
-      while True:  # read while we have data, and while the last packet is the max size.
-        last_packet = self._read_packet()
-        if last_packet is not None:
-          resp += last_packet
-        if last_packet is None or len(last_packet) != self.read_endpoint.wMaxPacketSize:
-          break
-
-      if len(resp) == 0:
+      frame = self._read_frame()
+      if frame is None:
         continue
 
-      logger.log(LOG_LEVEL_IO, "%s read: %s", self._unique_id, resp)
-      capturer.record(
-        USBCommand(device_id=self._unique_id, action="read", data=resp.decode("unicode_escape"))
-      )
+      resp = bytes(frame)
+      self._record_read(resp)
       return resp
 
     raise TimeoutError("Timeout while reading.")
 
+  def start_reader(self) -> None:
+    """Start a background thread that continuously reads frames from the device into a queue.
+
+    Frames are handed to the event loop that called this method, and are consumed with
+    :meth:`read_async`. The reader is started automatically by the first call to `read_async`, and
+    stopped by :meth:`stop_reader` or :meth:`stop`. If reading fails, for example because the
+    device was disconnected, the reader stops and the error is raised by `read_async`.
+    """
+
+    assert self.dev is not None and self.read_endpoint is not None, "Device not connected."
+    if self._reader_thread is not None:
+      return
+
+    loop = asyncio.get_running_loop()
+    frames: "asyncio.Queue[Union[bytes, Exception]]" = asyncio.Queue()
+    self._frames = frames
+    self._reader_stop.clear()
+
+    def read_continuously():
+      while not self._reader_stop.is_set():
+        item: Union[bytes, Exception]
+        try:
+          # USB errors other than timeouts are raised here, so that a disconnected device stops the
+          # reader instead of spinning. `read` keeps treating them as no data.
+          frame = self._read_frame(raise_errors=True)
+          if frame is None:
+            continue
+          item = bytes(frame)
+        except Exception as e:
+          logger.error("%s stopped reading: %s", self._unique_id, e)
+          item = e
+        try:
+          loop.call_soon_threadsafe(frames.put_nowait, item)
+        except RuntimeError:  # event loop is closed
+          break
+        if isinstance(item, Exception):
+          break
+
+    self._reader_thread = threading.Thread(target=read_continuously, daemon=True)
+    self._reader_thread.start()
+
+  async def stop_reader(self) -> None:
+    """Stop the background reader, waiting for at most one `packet_read_timeout`. Frames that
+    have been read but not consumed are discarded."""
+
+    if self._reader_thread is None:
+      return
+    self._reader_stop.set()
+    await asyncio.get_running_loop().run_in_executor(None, self._reader_thread.join)
+    self._reader_thread = None
+    self._frames = None
+
+  async def read_async(self, timeout: Optional[float] = None) -> bytes:
+    """Read a response from the device without blocking the event loop.
+
+    Frames are read by a background thread (see :meth:`start_reader`), so no data is lost between
+    calls. If the reader failed, its error is raised, and the next call starts a new reader.
+
+    Args:
+      timeout: The timeout for reading from the device in seconds. If `None`, use the default
+        timeout (specified by the `read_timeout` attribute).
+    """
+
+    if self._reader_thread is None:
+      self.start_reader()
+    assert self._frames is not None
+
+    if timeout is None:
+      timeout = self.read_timeout
+
+    try:
+      resp = await asyncio.wait_for(self._frames.get(), timeout=timeout)
+    except asyncio.TimeoutError:
+      raise TimeoutError("Timeout while reading.")
+
+    if isinstance(resp, Exception):
+      self._reader_thread = None
+      self._frames = None
+      raise resp
+
+    self._record_read(resp)
+    return resp
+
   def get_available_devices(self) -> List["usb.core.Device"]:
     """Get a list of available devices that match the specified vendor and product IDs, and serial
     number and device_address if specified."""
@@ -267,6 +395,7 @@ class USB(IOBase):
 
     if self.dev is None:
       raise ValueError("USB device was not connected.")
+    await self.stop_reader()
     logging.warning("Closing connection to USB device.")
     usb.util.dispose_resources(self.dev)
     self.dev = None
@@ -324,6 +453,9 @@ class USBValidator(USB):
       align_sequences(expected=next_command.data, actual=data.decode("unicode_escape"))
       raise ValidationError("Data mismatch: difference was written to stdout.")
 
+  async def write_async(self, data: bytes, timeout: Optional[float] = None):
+    self.write(data, timeout=timeout)
+
   def read(self, timeout: Optional[float] = None) -> bytes:
     next_command = USBCommand(**self.cr.next_command())
     if not (
@@ -333,3 +465,6 @@ class USBValidator(USB):
     ):
       raise ValidationError("next command is not read")
     return next_command.data.encode()
+
+  async def read_async(self, timeout: Optional[float] = None) -> bytes:
+    return self.read(timeout=timeout)
@@ -0,0 +1,94 @@
+import asyncio
+import unittest
+import unittest.mock
+
+from pylabrobot.io.usb import USB, USE_USB
+
+if USE_USB:
+  import usb.core
+
+
+class TestUSBReader(unittest.IsolatedAsyncioTestCase):
+  async def asyncSetUp(self):
+    self.usb = USB(id_vendor=0x08AF, id_product=0x8000, packet_read_timeout=1, read_timeout=2)
+    self.dev = unittest.mock.MagicMock()
+    self.usb.dev = self.dev
+    self.usb.read_endpoint = unittest.mock.MagicMock(wMaxPacketSize=64)
+    self.frames = [b"C0QMid0001", b"C0RFid0002"]
+
+    def read_frame(raise_errors=False):
+      if len(self.frames) > 0:
+        return bytearray(self.frames.pop(0))
+      self.usb._reader_stop.wait(0.01)
+      return None
+
+    self.usb._read_frame = read_frame  # type: ignore[method-assign]
+
+  async def asyncTearDown(self):
+    await self.usb.stop_reader()
+
+  async def test_read_async(self):
+    self.assertEqual(await self.usb.read_async(), b"C0QMid0001")
+    self.assertEqual(await self.usb.read_async(), b"C0RFid0002")
+    with self.assertRaises(TimeoutError):
+      await self.usb.read_async(timeout=0.05)
+    with self.assertRaises(RuntimeError):
+      self.usb.read()
+
+  async def test_reader_error(self):
+    error = OSError("No such device")
+
+    def read_frame(raise_errors=False):
+      raise error
+
+    self.usb._read_frame = read_frame  # type: ignore[method-assign]
+    with self.assertLogs("pylabrobot.io.usb", level="ERROR"):
+      with self.assertRaises(OSError):
+        await self.usb.read_async(timeout=1)
+    self.assertIsNone(self.usb._reader_thread)
+
+  async def test_event_loop_not_blocked(self):
+    self.frames = []
+    ticks = 0
+
+    async def tick():
+      nonlocal ticks
+      while True:
+        ticks += 1
+        await asyncio.sleep(0.005)
+
+    ticker = asyncio.create_task(tick())
+    with self.assertRaises(TimeoutError):
+      await self.usb.read_async(timeout=0.1)
+    ticker.cancel()
+    self.assertGreater(ticks, 5)
+
+  async def test_write_async(self):
+    await self.usb.write_async(b"C0QMid0001")
+    self.dev.write.assert_called_once_with(
+      self.usb.write_endpoint, b"C0QMid0001", timeout=self.usb.write_timeout
+    )
+
+
+@unittest.skipIf(not USE_USB, "pyusb is not installed")
+class TestUSBReadPacket(unittest.IsolatedAsyncioTestCase):
+  async def asyncSetUp(self):
+    self.usb = USB(id_vendor=0x08AF, id_product=0x8000, packet_read_timeout=1, read_timeout=2)
+    self.dev = unittest.mock.MagicMock()
+    self.dev.read.side_effect = usb.core.USBError("No such device", errno=19)
+    self.usb.dev = self.dev
+    self.usb.read_endpoint = unittest.mock.MagicMock(wMaxPacketSize=64)
+
+  async def asyncTearDown(self):
+    await self.usb.stop_reader()
+
+  def test_read_frame_ignores_usb_errors(self):
+    # `read` treats USB errors as no data being available, as it did before the background reader
+    self.assertIsNone(self.usb._read_frame())
+    with self.assertRaises(usb.core.USBError):
+      self.usb._read_frame(raise_errors=True)
+
+  async def test_reader_raises_usb_errors(self):
+    with self.assertLogs("pylabrobot.io.usb", level="ERROR"):
+      with self.assertRaises(usb.core.USBError):
+        await self.usb.read_async()
@@ -6,12 +6,15 @@ import re
 from abc import ABCMeta
 from contextlib import asynccontextmanager, contextmanager
 from typing import (
+  Any,
   Callable,
   Dict,
+  Iterable,
   List,
   Literal,
   Optional,
   Sequence,
+  Tuple,
   Type,
   TypeVar,
   Union,
@@ -22,6 +25,7 @@ from pylabrobot import audio
 from pylabrobot.liquid_handling.backends.hamilton.base import (
   HamiltonLiquidHandler,
 )
+from pylabrobot.liquid_handling.backends.hamilton.pipelining import CommandPipeline
 from pylabrobot.liquid_handling.errors import ChannelizedError
 from pylabrobot.liquid_handling.liquid_classes.hamilton import (
   HamiltonLiquidClass,
@@ -171,77 +175,111 @@ def parse_star_fw_string(resp: str, fmt: str = "") -> dict:
     ```
   """
 
-  # Remove device and cmd identifier from response.
-  resp = resp[4:]
-
-  # Parse the parameters in the fmt string.
-  info = {}
+  return _compile_fw_format(fmt).parse(resp)
+
+
+# C0 sends errors as er##/##. P1 raises errors as er## where the first group is the error code, and
+# the second group is the trace information. Beyond that, specific errors may be added for
+# individual channels and modules. These are formatted as P1##/## H0##/##, etc. These items are
+# added programmatically as named capturing groups to the regex.
+_C0_ERROR_REGEX = re.compile(
+  r"er(?P<C0>[0-9]{2}/[0-9]{2})"
+  + "".join(
+    f" ?(?:{module}(?P<{module}>[0-9]{{2}}/[0-9]{{2}}))?"
+    for module in ["X0", "I0", "W1", "W2", "T1", "T2", "R0"]
+    + [f"P{c}" for c in "123456789ABCDEFG"]
+    + ["H0", "HW", "HU", "HV", "N0", "D0", "NP", "M1"]
+  )
+)
 
-  def find_param(param):
-    name, data = param[0:2], param[2:]
-    type_ = {"#": "int", "*": "hex", "&": "str"}[data[0]]
 
-    # Build a regex to match this parameter.
-    exp = {
-      "int": r"[-+]?[\d ]",
-      "hex": r"[\da-fA-F ]",
-      "str": ".",
-    }[type_]
-    len_ = len(data.split(" ")[0])  # Get length of first block.
-    regex = f"{name}((?:{exp}{ {len_} }"
+@functools.lru_cache(maxsize=None)
+def _get_module_error_regex(module: str) -> "re.Pattern[str]":
+  # Other modules send errors as er##, and do not contain slave errors.
+  return re.compile(f"er(?P<{module}>[0-9]{{2}})")
 
-    if param.endswith(" (n)"):
-      regex += " ?)+)"
-      is_list = True
-    else:
-      regex += "))"
-      is_list = False
 
-    # Match response against regex, save results in right datatype.
-    r = re.search(regex, resp)
-    if r is None:
-      raise ValueError(f"could not find matches for parameter {name}")
+class _FwFormatParser:
+  """A format string for :func:`parse_star_fw_string`, compiled into a single regex.
 
-    g = r.groups()
-    if len(g) == 0:
-      raise ValueError(f"could not find value for parameter {name}")
-    m = g[0]
-
-    if is_list:
-      m = m.split(" ")
+  Each parameter is matched at the first position in the string where it occurs, as if it was
+  searched for separately. The regex is a lookahead with one alternative per parameter, so that
+  matches of different parameters may overlap, and the string is scanned once.
+  """
 
-      if type_ == "str":
-        info[name] = m
-      elif type_ == "int":
-        info[name] = [int(m_) for m_ in m if m_ != ""]
-      elif type_ == "hex":
-        info[name] = [int(m_, base=16) for m_ in m if m_ != ""]
-    else:
-      if type_ == "str":
+  _EXPRESSIONS = {"#": r"[-+]?[\d ]", "*": r"[\da-fA-F ]", "&": "."}
+
+  def __init__(self, fmt: str):
+    # Find params in string. All params are identified by 2 lowercase chars.
+    params: List[str] = []
+    param = ""
+    prevchar = None
+    for char in fmt:
+      if char.islower() and prevchar != "(":
+        if len(param) > 2:
+          params.append(param)
+          param = ""
+      param += char
+      prevchar = char
+    if param != "":
+      params.append(param)  # last parameter is not closed by loop.
+
+    # If id not in fmt, add it.
+    if not any(param.startswith("id") for param in params):
+      params.append("id####")
+
+    # (name, type, is_list) for each parameter, in order of the format
+    self.params: List[Tuple[str, str, bool]] = []
+    alternatives: List[str] = []
+    for param in params:
+      name, data = param[0:2], param[2:]
+      if any(name == n for n, _, _ in self.params):
+        continue
+      type_ = data[0]
+      len_ = len(data.split(" ")[0])  # Get length of first block.
+      is_list = param.endswith(" (n)")
+      exp = f"(?:{self._EXPRESSIONS[type_]}{ {len_} }" + (" ?)+" if is_list else ")")
+      alternatives.append(f"{name}(?P<p{len(self.params)}>{exp})")
+      self.params.append((name, type_, is_list))
+    self.regex = re.compile("(?=" + "|".join(alternatives) + ")")
+
+  def parse(self, resp: str) -> dict:
+    # Remove device and cmd identifier from response.
+    resp = resp[4:]
+
+    values: Dict[int, str] = {}
+    for match in self.regex.finditer(resp):
+      index = match.lastindex - 1  # type: ignore[operator]
+      if index not in values:
+        values[index] = match.group(index + 1)
+        if len(values) == len(self.params):
+          break
+
+    info: Dict[str, Any] = {}
+    for i, (name, type_, is_list) in enumerate(self.params):
+      if i not in values:
+        raise ValueError(f"could not find matches for parameter {name}")
+      m = values[i]
+      if is_list:
+        items = m.split(" ")
+        if type_ == "&":
+          info[name] = items
+        elif type_ == "#":
+          info[name] = [int(m_) for m_ in items if m_ != ""]
+        else:
+          info[name] = [int(m_, base=16) for m_ in items if m_ != ""]
+      elif type_ == "&":
         info[name] = m
-      elif type_ == "int":
+      elif type_ == "#":
         info[name] = int(m)
-      elif type_ == "hex":
+      else:
         info[name] = int(m, base=16)
+    return info
 
-  # Find params in string. All params are identified by 2 lowercase chars.
-  param = ""
-  prevchar = None
-  for char in fmt:
-    if char.islower() and prevchar != "(":
-      if len(param) > 2:
-        find_param(param)
-        param = ""
-    param += char
-    prevchar = char
-  if param != "":
-    find_param(param)  # last parameter is not closed by loop.
-
-  # If id not in fmt, add it.
-  if "id" not in info:
-    find_param("id####")
 
-  return info
+@functools.lru_cache(maxsize=None)
+def _compile_fw_format(fmt: str) -> _FwFormatParser:
+  return _FwFormatParser(fmt)
 
 
 class STARModuleError(Exception, metaclass=ABCMeta):
@@ -1222,6 +1260,30 @@ class STAR(HamiltonLiquidHandler):
   def module_id_length(self):
     return 2
 
+  def enable_pipelining(self, conflicts: Optional[Iterable[Iterable[str]]] = None):
+    """Let commands to independent modules be in flight at the same time.
+
+    Commands sent from concurrent tasks, for example with `asyncio.gather`, are then only
+    serialized if they act on the same part of the machine ("pip", "core96", "iswap", "autoload",
+    "status" or another module), or on parts that conflict. Commands to the modules of single
+    channels (P1, P2, ...) are part of "pip". Commands for the same part are always sent and
+    completed in order. Initialization, arm and cover commands, and master module commands that
+    are not known to be safe, wait for all other commands to complete. See
+    :mod:`pylabrobot.liquid_handling.backends.hamilton.pipelining` for the tables.
+
+    Args:
+      conflicts: groups of parts whose commands must serialize. By default, the pipetting channels,
+        the 96 head and the iSWAP conflict, because they share the X arm. Use
+        `[("pip", "core96")]` to let iSWAP commands overlap with pipetting on instruments where the
+        iSWAP moves independently.
+    """
+
+    self._pipeline = CommandPipeline.for_star(conflicts=conflicts)
+
+  def disable_pipelining(self):
+    """Stop pipelining commands. See :meth:`enable_pipelining`."""
+    self._pipeline = None
+
   @property
   def extended_conf(self) -> dict:
     """Extended configuration."""
@@ -1266,52 +1328,9 @@ class STAR(HamiltonLiquidHandler):
     # Parse errors.
     module = resp[:2]
     if module == "C0":
-      # C0 sends errors as er##/##. P1 raises errors as er## where the first group is the error
-      # code, and the second group is the trace information.
-      # Beyond that, specific errors may be added for individual channels and modules. These
-      # are formatted as P1##/## H0##/##, etc. These items are added programmatically as
-      # named capturing groups to the regex.
-
-      exp = r"er(?P<C0>[0-9]{2}/[0-9]{2})"
-      for module in [
-        "X0",
-        "I0",
-        "W1",
-        "W2",
-        "T1",
-        "T2",
-        "R0",
-        "P1",
-        "P2",
-        "P3",
-        "P4",
-        "P5",
-        "P6",
-        "P7",
-        "P8",
-        "P9",
-        "PA",
-        "PB",
-        "PC",
-        "PD",
-        "PE",
-        "PF",
-        "PG",
-        "H0",
-        "HW",
-        "HU",
-        "HV",
-        "N0",
-        "D0",
-        "NP",
-        "M1",
-      ]:
-        exp += f" ?(?:{module}(?P<{module}>[0-9]{{2}}/[0-9]{{2}}))?"
-      errors = re.search(exp, resp)
+      errors = _C0_ERROR_REGEX.search(resp)
     else:
-      # Other modules send errors as er##, and do not contain slave errors.
-      exp = f"er(?P<{module}>[0-9]{{2}})"
-      errors = re.search(exp, resp)
+      errors = _get_module_error_regex(module).search(resp)
 
     if errors is not None:
       # filter None elements
@@ -72,7 +72,7 @@ class STARChatterboxBackend(STAR):
     id_: Optional[int],
     cmd: str,
     write_timeout: Optional[int] = None,
-    read_timeout: Optional[int] = None,
+    read_timeout: Optional[float] = None,
     wait: bool = True,
   ) -> Optional[str]:
     # print(f"Sending command: {module}{command} with args {args} and kwargs {kwargs}.")
@@ -83,7 +83,7 @@ class STARChatterboxBackend(STAR):
     self,
     command: str,
     write_timeout: Optional[int] = None,
-    read_timeout: Optional[int] = None,
+    read_timeout: Optional[float] = None,
     wait: bool = True,
   ) -> Optional[str]:
     print(command)
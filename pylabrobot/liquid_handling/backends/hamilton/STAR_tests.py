@@ -1,9 +1,11 @@
 # mypy: disable-error-code="attr-defined,method-assign"
 
+import asyncio
 import unittest
 import unittest.mock
 from typing import cast
 
+from pylabrobot.io.usb import USB
 from pylabrobot.liquid_handling import LiquidHandler
 from pylabrobot.liquid_handling.standard import GripDirection, Pickup
 from pylabrobot.plate_reading import PlateReader
@@ -71,6 +73,14 @@ class TestSTARResponseParsing(unittest.TestCase):
     with self.assertRaises(ValueError):
       parse_star_fw_string("C0RV", "")
 
+  def test_parse_response_list_params(self):
+    parsed = parse_star_fw_string("C0RTid0001yp1457 1367&rt1 1 0", "rt# (n)yp#### (n)")
+    self.assertEqual(parsed, {"rt": [1, 1, 0], "yp": [1457, 1367], "id": 1})
+
+    # parameters are found independently, even if they overlap with the value of another
+    parsed = parse_star_fw_string("C0QMid0001aabb12bb34", "aa&&&&bb##")
+    self.assertEqual(parsed, {"aa": "bb12", "bb": 12, "id": 1})
+
   def test_parse_response_no_errors(self):
     parsed = parse_star_fw_string("C0QMid1111", "")
     self.assertEqual(parsed, {"id": 1111})
@@ -144,24 +154,106 @@ class TestSTARUSBComms(unittest.IsolatedAsyncioTestCase):
   async def asyncSetUp(self):
     self.star = STAR(read_timeout=2, packet_read_timeout=1)
     self.star.set_deck(STARLetDeck())
-    self.star.io = unittest.mock.MagicMock()
+    self.star.io = unittest.mock.MagicMock(spec=USB)
     await super().asyncSetUp()
 
   async def test_send_command_correct_response(self):
-    self.star.io.read.side_effect = [b"C0QMid0001"]
+    self.star.io.read_async.side_effect = [b"C0QMid0001"]
     resp = await self.star.send_command("C0", command="QM", fmt="id####")
     self.assertEqual(resp, {"id": 1})
 
   async def test_send_command_wrong_id(self):
-    self.star.io.read.side_effect = lambda: b"C0QMid0002"
+    self.star.io.read_async.side_effect = lambda timeout: b"C0QMid0002"
     with self.assertRaises(TimeoutError):
       await self.star.send_command("C0", command="QM", fmt="id####")
 
   async def test_send_command_plaintext_response(self):
-    self.star.io.read.side_effect = lambda: b"this is plaintext"
+    self.star.io.read_async.side_effect = lambda timeout: b"this is plaintext"
     with self.assertRaises(TimeoutError):
       await self.star.send_command("C0", command="QM", fmt="id####")
 
+  async def test_repeated_unparsable_response(self):
+    self.star.io.read_async.side_effect = lambda timeout: b"this is plaintext"
+    with self.assertLogs("pylabrobot", level="WARNING") as logs:
+      with self.assertRaises(TimeoutError):
+        await self.star.send_command("C0", command="QM", fmt="id####", read_timeout=0.05)
+    self.assertEqual(sum("Could not parse response" in line for line in logs.output), 1)
+
+  async def test_commands_in_flight(self):
+    responses: asyncio.Queue = asyncio.Queue()
+
+    async def read_async(timeout):
+      try:
+        return await asyncio.wait_for(responses.get(), timeout)
+      except asyncio.TimeoutError:
+        raise TimeoutError()
+
+    self.star.io.read_async.side_effect = read_async
+    self.star.id_ = 0
+    qm = asyncio.create_task(self.star.send_command("C0", command="QM", fmt="id####"))
+    rt = asyncio.create_task(self.star.send_command("C0", command="RT", fmt="id####"))
+    no_id = asyncio.create_task(self.star.send_command("H0", command="RF", auto_id=False))
+    await asyncio.sleep(0)
+    self.assertEqual(self.star.num_commands_in_flight, 3)
+    self.assertEqual(self.star.get_in_flight_counts(), {"C0": 2, "H0": 1})
+
+    # responses arrive out of order
+    for resp in [b"H0RFrf1.0", b"C0RTid0002", b"C0QMid0001"]:
+      responses.put_nowait(resp)
+    self.assertEqual(await qm, {"id": 1})
+    self.assertEqual(await rt, {"id": 2})
+    self.assertEqual(await no_id, "H0RFrf1.0")
+    self.assertEqual(self.star.num_commands_in_flight, 0)
+    self.assertEqual(len(self.star.round_trip_latencies["C0QM"]), 1)
+
+  async def test_response_before_write_returns(self):
+    responses: asyncio.Queue = asyncio.Queue()
+
+    async def read_async(timeout):
+      try:
+        return await asyncio.wait_for(responses.get(), timeout)
+      except asyncio.TimeoutError:
+        raise TimeoutError()
+
+    async def write_async(data, timeout=None):
+      if data.startswith(b"C0RT"):
+        # the response arrives, and is read, before the write returns
+        responses.put_nowait(b"C0RTid0002")
+        await asyncio.sleep(0.01)
+
+    self.star.io.read_async.side_effect = read_async
+    self.star.io.write_async.side_effect = write_async
+    self.star.id_ = 0
+    qm = asyncio.create_task(self.star.send_command("C0", command="QM", fmt="id####"))
+    await asyncio.sleep(0)
+    rt = await self.star.send_command("C0", command="RT", fmt="id####", read_timeout=0.5)
+    self.assertEqual(rt, {"id": 2})
+    responses.put_nowait(b"C0QMid0001")
+    self.assertEqual(await qm, {"id": 1})
+
+  async def test_pipelining(self):
+    responses: asyncio.Queue = asyncio.Queue()
+
+    async def read_async(timeout):
+      return await responses.get()
+
+    self.star.io.read_async.side_effect = read_async
+    self.star.id_ = 0
+    self.star.enable_pipelining(conflicts=[("pip", "core96")])  # iSWAP on its own arm
+    pip = [asyncio.create_task(self.star.send_command("C0", command=c)) for c in ["AS", "DS"]]
+    iswap = asyncio.create_task(self.star.send_command("C0", command="PP"))
+    await asyncio.sleep(0)
+    # the dispense waits for the aspiration, the iSWAP command is sent right away
+    self.assertEqual(self.star.get_in_flight_counts(), {"C0": 2})
+
+    responses.put_nowait(b"C0PPid0003")
+    self.assertEqual(await iswap, "C0PPid0003")
+    responses.put_nowait(b"C0ASid0001")
+    await pip[0]
+    await asyncio.sleep(0)
+    responses.put_nowait(b"C0DSid0002")
+    await pip[1]
+
 
 class STARCommandCatcher(STAR):
   """Mock backend for star that catches commands and saves them instead of sending them to the
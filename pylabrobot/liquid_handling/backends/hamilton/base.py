@@ -1,12 +1,16 @@
 import asyncio
 import datetime
+import heapq
+import itertools
 import logging
-import threading
 import time
 from abc import ABCMeta, abstractmethod
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 from typing import (
   Any,
+  Deque,
+  Dict,
   List,
   Optional,
   Sequence,
@@ -18,6 +22,7 @@ from pylabrobot.io.usb import USB
 from pylabrobot.liquid_handling.backends.backend import (
   LiquidHandlerBackend,
 )
+from pylabrobot.liquid_handling.backends.hamilton.pipelining import CommandPipeline
 from pylabrobot.liquid_handling.standard import PipettingOp
 from pylabrobot.resources import TipSpot
 from pylabrobot.resources.hamilton import (
@@ -31,15 +36,16 @@ T = TypeVar("T")
 logger = logging.getLogger("pylabrobot")
 
 
-@dataclass
+@dataclass(eq=False)
 class HamiltonTask:
   """A command that has been sent, awaiting a response."""
 
   id_: Optional[int]
-  loop: asyncio.AbstractEventLoop
   fut: asyncio.Future
   cmd: str
-  timeout_time: float
+  timeout_time: float  # `time.monotonic()` deadline
+  module_and_command: str = ""
+  sent_time: float = field(default_factory=time.monotonic)
 
 
 class HamiltonLiquidHandler(LiquidHandlerBackend, metaclass=ABCMeta):
@@ -81,8 +87,20 @@ class HamiltonLiquidHandler(LiquidHandlerBackend, metaclass=ABCMeta):
 
     self.id_ = 0
 
-    self._reading_thread: Optional[threading.Thread] = None
-    self._waiting_tasks: List[HamiltonTask] = []
+    # Commands in flight, indexed by id, and by module and command for commands without an id.
+    self._tasks_by_id: Dict[int, HamiltonTask] = {}
+    self._tasks_without_id: Dict[str, Deque[HamiltonTask]] = {}
+    self._timeouts: List[Tuple[float, int, HamiltonTask]] = []  # heap of (timeout_time, seq, task)
+    self._timeout_seq = itertools.count()
+    self._reading_task: Optional[asyncio.Task] = None
+    self._tasks_available: Optional[asyncio.Event] = None
+
+    # Round-trip times in seconds of the most recent responses, by module and command.
+    self.round_trip_latencies: Dict[str, Deque[float]] = {}
+    self.num_latencies_kept = 100
+
+    # If set, commands sent concurrently to independent modules are in flight together.
+    self._pipeline: Optional[CommandPipeline] = None
     self._tth2tti: dict[int, int] = {}  # hash to tip type index
 
     # Whether to allow the firmware to plan liquid handling operations when the y positions are
@@ -96,9 +114,10 @@ class HamiltonLiquidHandler(LiquidHandlerBackend, metaclass=ABCMeta):
     await self.io.setup()
 
   async def stop(self):
-    for task in self._waiting_tasks:
-      task.fut.set_exception(RuntimeError("Stopping HamiltonLiquidHandler."))
-    self._waiting_tasks.clear()
+    if self._reading_task is not None:
+      self._reading_task.cancel()
+      self._reading_task = None
+    self._fail_all_tasks(RuntimeError("Stopping HamiltonLiquidHandler."))
     self._tth2tti.clear()
 
   def serialize(self) -> dict:
@@ -214,7 +233,7 @@ class HamiltonLiquidHandler(LiquidHandlerBackend, metaclass=ABCMeta):
     auto_id=True,
     tip_pattern: Optional[List[bool]] = None,
     write_timeout: Optional[int] = None,
-    read_timeout: Optional[int] = None,
+    read_timeout: Optional[float] = None,
     wait=True,
     fmt: Optional[Any] = None,
     **kwargs,
@@ -244,13 +263,23 @@ class HamiltonLiquidHandler(LiquidHandlerBackend, metaclass=ABCMeta):
       auto_id=auto_id,
       **kwargs,
     )
-    resp = await self._write_and_read_command(
-      id_=id_,
-      cmd=cmd,
-      write_timeout=write_timeout,
-      read_timeout=read_timeout,
-      wait=wait,
-    )
+    if self._pipeline is None:
+      resp = await self._write_and_read_command(
+        id_=id_,
+        cmd=cmd,
+        write_timeout=write_timeout,
+        read_timeout=read_timeout,
+        wait=wait,
+      )
+    else:
+      async with self._pipeline.slot(module, command):
+        resp = await self._write_and_read_command(
+          id_=id_,
+          cmd=cmd,
+          write_timeout=write_timeout,
+          read_timeout=read_timeout,
+          wait=wait,
+        )
     if resp is not None and fmt is not None:
       return self._parse_response(resp, fmt)
     return resp
@@ -260,24 +289,42 @@ class HamiltonLiquidHandler(LiquidHandlerBackend, metaclass=ABCMeta):
     id_: Optional[int],
     cmd: str,
     write_timeout: Optional[int] = None,
-    read_timeout: Optional[int] = None,
+    read_timeout: Optional[float] = None,
     wait: bool = True,
   ) -> Optional[str]:
     """Write a command to the Hamilton machine and read the response."""
-    self.io.write(cmd.encode(), timeout=write_timeout)
-
     if not wait:
+      await self.io.write_async(cmd.encode(), timeout=write_timeout)
       return None
 
     # Attempt to read packets until timeout, or when we identify the right id.
     if read_timeout is None:
       read_timeout = self.read_timeout
 
+    # The command is registered before it is written: while other commands are in flight, the
+    # reading task may receive the response before `write_async` returns.
     loop = asyncio.get_event_loop()
     fut: asyncio.Future[str] = loop.create_future()
-    self._start_reading(id_, loop, fut, cmd, read_timeout)
-    result = await fut
-    return result
+    task = self._start_reading(id_, loop, fut, cmd, read_timeout)
+    try:
+      await self.io.write_async(cmd.encode(), timeout=write_timeout)
+      return await fut
+    finally:
+      self._remove_task(task)
+
+  @property
+  def num_commands_in_flight(self) -> int:
+    """The number of commands that have been sent and are awaiting a response."""
+    return len(self._tasks_by_id) + sum(len(q) for q in self._tasks_without_id.values())
+
+  def get_in_flight_counts(self) -> Dict[str, int]:
+    """The number of commands awaiting a response, by module."""
+    counts: Dict[str, int] = {}
+    tasks = itertools.chain(self._tasks_by_id.values(), *self._tasks_without_id.values())
+    for task in tasks:
+      module = task.module_and_command[: self.module_id_length]
+      counts[module] = counts.get(module, 0) + 1
+    return counts
 
   def _start_reading(
     self,
@@ -285,19 +332,85 @@ class HamiltonLiquidHandler(LiquidHandlerBackend, metaclass=ABCMeta):
     loop: asyncio.AbstractEventLoop,
     fut: asyncio.Future,
     cmd: str,
-    timeout: int,
-  ) -> None:
-    """Submit a task to the reading thread. Starts reading thread if it is not already running."""
+    timeout: float,
+  ) -> HamiltonTask:
+    """Register a command awaiting a response. Starts the reading task if it is not running."""
 
-    timeout_time = time.time() + timeout
-    self._waiting_tasks.append(
-      HamiltonTask(id_=id_, loop=loop, fut=fut, cmd=cmd, timeout_time=timeout_time)
+    task = HamiltonTask(
+      id_=id_,
+      fut=fut,
+      cmd=cmd,
+      timeout_time=time.monotonic() + timeout,
+      module_and_command=cmd[: self.module_id_length + 2],
     )
+    if id_ is not None:
+      if id_ in self._tasks_by_id:
+        raise RuntimeError(f"A command with id {id_} is already in flight.")
+      self._tasks_by_id[id_] = task
+    else:
+      self._tasks_without_id.setdefault(task.module_and_command, deque()).append(task)
+    heapq.heappush(self._timeouts, (task.timeout_time, next(self._timeout_seq), task))
+
+    if self._reading_task is None or self._reading_task.done():
+      self._tasks_available = asyncio.Event()
+      self._reading_task = loop.create_task(self._continuously_read())
+    assert self._tasks_available is not None
+    self._tasks_available.set()
+    return task
+
+  def _remove_task(self, task: HamiltonTask) -> None:
+    """Stop waiting for a response to a command. Its entry in the timeout heap is dropped lazily."""
+    if task.id_ is not None:
+      if self._tasks_by_id.get(task.id_) is task:
+        del self._tasks_by_id[task.id_]
+    else:
+      queue = self._tasks_without_id.get(task.module_and_command)
+      if queue is not None and task in queue:
+        queue.remove(task)
+        if len(queue) == 0:
+          del self._tasks_without_id[task.module_and_command]
+
+  def _fail_all_tasks(self, exc: BaseException) -> None:
+    for task in itertools.chain(self._tasks_by_id.values(), *self._tasks_without_id.values()):
+      if not task.fut.done():
+        task.fut.set_exception(exc)
+    self._tasks_by_id.clear()
+    self._tasks_without_id.clear()
+    self._timeouts.clear()
+
+  def _expire_tasks(self) -> Optional[float]:
+    """Fail commands whose timeout has passed.
 
-    # Start reading thread if it is not already running.
-    if len(self._waiting_tasks) == 1:  # self._reading_thread is None
-      self._reading_thread = threading.Thread(target=self._continuously_read)
-      self._reading_thread.start()
+    Returns:
+      The number of seconds until the next timeout, or `None` if no commands are in flight.
+    """
+
+    now = time.monotonic()
+    while len(self._timeouts) > 0:
+      timeout_time, _, task = self._timeouts[0]
+      if task.fut.done():
+        heapq.heappop(self._timeouts)
+        continue
+      if timeout_time > now:
+        return timeout_time - now
+      heapq.heappop(self._timeouts)
+      logger.warning("Timeout while waiting for response to command %s.", task.cmd)
+      task.fut.set_exception(
+        TimeoutError(f"Timeout while waiting for response to command {task.cmd}.")
+      )
+      self._remove_task(task)
+    return None
+
+  def _find_task(self, resp: str, response_id: Optional[int]) -> Optional[HamiltonTask]:
+    if response_id is not None:
+      task = self._tasks_by_id.get(response_id)
+      if task is not None:
+        return task
+    # if the command has no id, we have to check the command itself
+    queue = self._tasks_without_id.get(resp[: self.module_id_length + 2])
+    if queue is not None and len(queue) > 0:
+      return queue[0]
+    return None
 
   @abstractmethod
   def get_id_from_fw_response(self, resp: str) -> Optional[int]:
@@ -311,61 +424,69 @@ class HamiltonLiquidHandler(LiquidHandlerBackend, metaclass=ABCMeta):
   def _parse_response(self, resp: str, fmt: Any) -> dict:
     """Parse a firmware response."""
 
-  def _continuously_read(self) -> None:
-    """Continuously read from the USB port until all tasks are completed.
+  async def _continuously_read(self) -> None:
+    """Read responses from the USB port and dispatch them to the commands awaiting them.
 
-    Tasks are stored in the `self._waiting_tasks` list, and contain a future that will be
-    completed when the task is finished. Tasks are submitted to the list using the
-    `self._start_reading` method.
+    Commands are registered with `self._start_reading`. They are indexed by id, and commands
+    without an id are matched on their module and command, first sent first. Timeouts are kept in
+    a heap, and the read timeout is the time until the first command times out. When no commands
+    are in flight, the task waits without reading, so responses are only read when expected.
 
-    On each iteration, read the USB port. If a response is received, parse it and check if it is
-    relevant to any of the tasks. If so, complete the future and remove the task from the
-    list. If a task has timed out, complete the future with a `TimeoutError`.
+    This task is started with the first command, and runs until `stop` is called or reading fails.
     """
 
-    while len(self._waiting_tasks) > 0:
-      for idx in range(len(self._waiting_tasks) - 1, -1, -1):  # reverse order to allow deletion
-        task = self._waiting_tasks[idx]
-        if time.time() > task.timeout_time:
-          logger.warning("Timeout while waiting for response to command %s.", task.cmd)
-          task.loop.call_soon_threadsafe(
-            task.fut.set_exception,
-            TimeoutError(f"Timeout while waiting for response to command {task.cmd}."),
-          )
-          del self._waiting_tasks[idx]
+    assert self._tasks_available is not None
+    last_unparsable: Optional[str] = None
+    while True:
+      timeout = self._expire_tasks()
+      if timeout is None:
+        self._tasks_available.clear()
+        await self._tasks_available.wait()
+        continue
 
       try:
-        resp = self.io.read().decode("utf-8")
+        resp = (await self.io.read_async(timeout=timeout)).decode("utf-8")
       except TimeoutError:
         continue
+      except Exception as e:
+        logger.error("Error while reading from the device: %s", e)
+        self._fail_all_tasks(e)
+        return
 
       if resp == "":
         continue
 
-      # Parse response.
+      # Parse response. Responses to commands without an id are matched on the command.
+      parse_error: Optional[ValueError] = None
       try:
         response_id = self.get_id_from_fw_response(resp)
       except ValueError as e:
-        logger.warning("Could not parse response: %s (%s)", resp, e)
+        response_id, parse_error = None, e
+
+      task = self._find_task(resp, response_id)
+      if task is None:
+        if parse_error is not None and resp != last_unparsable:
+          logger.warning("Could not parse response: %s (%s)", resp, parse_error)
+          last_unparsable = resp
+        else:
+          logger.debug("Received response that no command is waiting for: %s", resp)
+        # a device repeating a frame must not starve the other tasks on the loop
+        await asyncio.sleep(0)
         continue
 
-      module_and_command = resp[: self.module_id_length + 2]
-      for idx in range(len(self._waiting_tasks)):
-        task = self._waiting_tasks[idx]
-        # if the command has no id, we have to check the command itself
-        if response_id == task.id_ or (
-          task.id_ is None and task.cmd.startswith(module_and_command)
-        ):
-          try:
-            self.check_fw_string_error(resp)
-          except Exception as e:
-            task.loop.call_soon_threadsafe(task.fut.set_exception, e)
-          else:
-            task.loop.call_soon_threadsafe(task.fut.set_result, resp)
-          del self._waiting_tasks[idx]
-          break
-
-    self._reading_thread = None
+      self._remove_task(task)
+      if task.fut.done():  # cancelled by the caller
+        continue
+      latencies = self.round_trip_latencies.setdefault(
+        task.module_and_command, deque(maxlen=self.num_latencies_kept)
+      )
+      latencies.append(time.monotonic() - task.sent_time)
+      try:
+        self.check_fw_string_error(resp)
+      except Exception as e:
+        task.fut.set_exception(e)
+      else:
+        task.fut.set_result(resp)
 
   def _ops_to_fw_positions(
     self, ops: Sequence[PipettingOp], use_channels: List[int]
@@ -377,6 +498,9 @@ class HamiltonLiquidHandler(LiquidHandlerBackend, metaclass=ABCMeta):
     x_positions: List[int] = []
     y_positions: List[int] = []
     channels_involved: List[bool] = []
+    locations = [
+      op.resource.get_absolute_location(x="c", y="c", z="b") for op in ops[: len(use_channels)]
+    ]
     for i, channel in enumerate(use_channels):
       while channel > len(channels_involved):
         channels_involved.append(False)
@@ -384,10 +508,10 @@ class HamiltonLiquidHandler(LiquidHandlerBackend, metaclass=ABCMeta):
         y_positions.append(0)
       channels_involved.append(True)
 
-      x_pos = ops[i].resource.get_absolute_location(x="c", y="c", z="b").x + ops[i].offset.x
+      x_pos = locations[i].x + ops[i].offset.x
       x_positions.append(round(x_pos * 10))
 
-      y_pos = ops[i].resource.get_absolute_location(x="c", y="c", z="b").y + ops[i].offset.y
+      y_pos = locations[i].y + ops[i].offset.y
       y_positions.append(round(y_pos * 10))
 
     # check that the minimum d between any two y positions is >9mm
@@ -481,7 +605,7 @@ class HamiltonLiquidHandler(LiquidHandlerBackend, metaclass=ABCMeta):
     self,
     command: str,
     write_timeout: Optional[int] = None,
-    read_timeout: Optional[int] = None,
+    read_timeout: Optional[float] = None,
     wait: bool = True,
   ) -> Optional[str]:
     """Send a raw command to the machine."""
@@ -0,0 +1,150 @@
+"""Pipelining of firmware commands to independent modules of a Hamilton machine.
+
+By default, commands are sent one at a time: each `send_command` call waits for its response
+before the caller sends the next one. With a :class:`CommandPipeline`, commands for independent
+parts of the machine (for example the autoload and the pipetting channels) can be in flight at the
+same time when they are sent from concurrent tasks, while commands for the same part are still
+sent and completed in order.
+
+Parts that share an arm conflict. By default, the pipetting channels, the 96 head and the iSWAP
+are all treated as sharing the X arm, so pipelining only overlaps them with the autoload, the
+pumps, status requests and other modules. Instruments where the iSWAP has its own arm can opt in to
+overlapping it with pipetting, see :meth:`CommandPipeline.for_star`.
+"""
+
+import asyncio
+import contextlib
+from typing import AsyncIterator, Dict, FrozenSet, Iterable, Optional
+
+# Lanes of the STAR firmware. Keys are either a module ("R0") or a module and command ("C0AS").
+# Commands to the master module (C0) are routed to the part of the machine they act on.
+STAR_COMMAND_LANES: Dict[str, str] = {
+  **{f"C0{c}": "pip" for c in ["TP", "TR", "AS", "DS", "JM", "JE", "JP", "ZA", "KY", "KZ", "XL"]},
+  **{f"C0{c}": "pip" for c in ["JY", "JZ", "RY", "RZ", "RB", "RD", "RL", "RT"]},
+  # the CoRe gripper is held by the pipetting channels
+  **{f"C0{c}": "pip" for c in ["ZT", "ZS", "ZO", "ZP", "ZR", "ZM"]},
+  **{f"C0{c}": "core96" for c in ["EP", "ER", "EA", "ED", "EM", "EV", "QH", "QI", "VB", "VC"]},
+  **{f"C0{c}": "iswap" for c in ["PP", "PR", "PG", "PM", "PN", "PI", "PO", "PT", "PC"]},
+  **{f"C0{c}": "iswap" for c in ["FY", "GX", "GY", "GZ", "GI", "GF", "GC", "RG", "QP", "QG"]},
+  **{f"C0{c}": "autoload" for c in ["CI", "CR", "CT", "CP", "CB", "CU", "QA", "IV"]},
+  **{f"C0{c}": "pump" for c in ["ET", "EJ", "EH", "EL"]},
+  # status requests that do not move anything
+  **{f"C0{c}": "status" for c in ["RQ", "RF", "RE", "RA", "QB", "MU", "QW", "VP", "SR", "QV"]},
+  **{f"C0{c}": "status" for c in ["QM", "RM", "RK", "VD", "RI", "RO", "RS", "RJ", "UJ", "QT"]},
+  **{f"C0{c}": "status" for c in ["RX", "QX", "RU", "UA", "XX", "XR", "QC"]},
+  "H0": "core96",
+  "R0": "iswap",
+  "I0": "autoload",
+  # the modules of the individual channels move the same channels as the C0 pipetting commands
+  **{f"P{c}": "pip" for c in "X123456789ABCDEFG"},
+}
+
+# Groups of lanes that must not have commands in flight at the same time. The pipetting channels,
+# the 96 head and the iSWAP share the X arm.
+STAR_LANE_CONFLICTS: FrozenSet[FrozenSet[str]] = frozenset([frozenset(["pip", "core96", "iswap"])])
+
+# Commands that must not be in flight together with any other command: initialization, arm and
+# cover control, and single step mode.
+STAR_EXCLUSIVE_COMMANDS: FrozenSet[str] = frozenset(
+  f"C0{c}"
+  for c in ["VI", "DI", "EI", "FI", "II", "HD", "AM", "NS", "AB", "BA", "BB", "BC"]
+  + ["JX", "JS", "KX", "KR", "CO", "HO", "CD", "CE", "OS", "DD"]
+)
+
+
+class CommandPipeline:
+  """Decides which firmware commands may be in flight at the same time.
+
+  Each command is assigned to a lane: the lane of its module and command in `lanes`, else the lane
+  of its module, else the module itself. Commands on a master module (`master_module`) that are
+  not in `lanes` are exclusive. Commands in the same lane are sent and completed in the order in
+  which they were submitted. Commands in different lanes can be in flight together, unless their
+  lanes conflict: conflicting lanes share a single queue (conflicts are transitive). Exclusive
+  commands wait until no other command is in flight, and block all later commands until they
+  complete.
+  """
+
+  def __init__(
+    self,
+    lanes: Dict[str, str],
+    conflicts: Iterable[Iterable[str]] = (),
+    exclusive_commands: Iterable[str] = (),
+    master_module: Optional[str] = None,
+  ):
+    self.lanes = dict(lanes)
+    self.exclusive_commands = frozenset(exclusive_commands)
+    self.master_module = master_module
+
+    # lanes that conflict share a queue, named after the smallest lane in their group.
+    self._queue_of: Dict[str, str] = {}
+    for group in conflicts:
+      queues = {self._queue_of.get(lane, lane) for lane in group}
+      target = min(queues)
+      for lane, queue in list(self._queue_of.items()):
+        if queue in queues:
+          self._queue_of[lane] = target
+      for lane in group:
+        self._queue_of[lane] = target
+
+    self._locks: Dict[str, asyncio.Lock] = {}
+    self._gate = asyncio.Lock()
+    self._idle = asyncio.Condition()
+    self._num_in_flight = 0
+
+  def get_lane(self, module: str, command: str) -> Optional[str]:
+    """The lane of a command, or `None` if the command is exclusive."""
+
+    key = module + command
+    if key in self.exclusive_commands:
+      return None
+    if key in self.lanes:
+      return self.lanes[key]
+    if module in self.lanes:
+      return self.lanes[module]
+    if module == self.master_module:
+      return None
+    return module
+
+  @contextlib.asynccontextmanager
+  async def slot(self, module: str, command: str) -> AsyncIterator[None]:
+    """Wait until the command may be sent, and hold its place until the response is received."""
+
+    lane = self.get_lane(module, command)
+    if lane is None:
+      async with self._gate:
+        async with self._idle:
+          await self._idle.wait_for(lambda: self._num_in_flight == 0)
+        yield
+      return
+
+    async with self._gate:
+      self._num_in_flight += 1
+    try:
+      queue = self._queue_of.get(lane, lane)
+      lock = self._locks.setdefault(queue, asyncio.Lock())
+      async with lock:
+        yield
+    finally:
+      async with self._idle:
+        self._num_in_flight -= 1
+        self._idle.notify_all()
+
+  @classmethod
+  def for_star(
+    cls,
+    conflicts: Optional[Iterable[Iterable[str]]] = None,
+  ) -> "CommandPipeline":
+    """A pipeline with the lanes of the STAR firmware.
+
+    Args:
+      conflicts: groups of lanes that must serialize, replacing `STAR_LANE_CONFLICTS`. For
+        instruments where the iSWAP moves independently of the pipetting channels, use
+        `[("pip", "core96")]` to let iSWAP commands overlap with pipetting.
+    """
+
+    return cls(
+      lanes=STAR_COMMAND_LANES,
+      conflicts=STAR_LANE_CONFLICTS if conflicts is None else conflicts,
+      exclusive_commands=STAR_EXCLUSIVE_COMMANDS,
+      master_module="C0",
+    )
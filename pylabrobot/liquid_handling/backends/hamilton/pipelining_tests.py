@@ -0,0 +1,57 @@
+import asyncio
+import unittest
+
+from pylabrobot.liquid_handling.backends.hamilton.pipelining import CommandPipeline
+
+
+class TestCommandPipeline(unittest.IsolatedAsyncioTestCase):
+  async def asyncSetUp(self):
+    self.pipeline = CommandPipeline.for_star()
+    self.events: list = []
+
+  async def send(self, module: str, command: str, duration: float = 0.01):
+    async with self.pipeline.slot(module, command):
+      self.events.append(("start", module + command))
+      await asyncio.sleep(duration)
+      self.events.append(("end", module + command))
+
+  def test_lanes(self):
+    self.assertEqual(self.pipeline.get_lane("C0", "AS"), "pip")
+    self.assertEqual(self.pipeline.get_lane("C0", "PP"), "iswap")
+    self.assertEqual(self.pipeline.get_lane("R0", "PD"), "iswap")
+    self.assertEqual(self.pipeline.get_lane("P1", "RF"), "pip")
+    self.assertEqual(self.pipeline.get_lane("PG", "ZL"), "pip")
+    self.assertIsNone(self.pipeline.get_lane("C0", "VI"))
+    self.assertIsNone(self.pipeline.get_lane("C0", "XY"))  # unknown master command
+
+  async def test_independent_lanes(self):
+    await asyncio.gather(self.send("C0", "AS"), self.send("C0", "CI"), self.send("T1", "RT"))
+    self.assertEqual([e[0] for e in self.events], ["start"] * 3 + ["end"] * 3)
+
+  async def test_same_lane_in_order(self):
+    await asyncio.gather(self.send("C0", "AS", 0.02), self.send("C0", "DS", 0.001))
+    self.assertEqual(
+      self.events, [("start", "C0AS"), ("end", "C0AS"), ("start", "C0DS"), ("end", "C0DS")]
+    )
+
+  async def test_channel_module_waits_for_pipetting(self):
+    await asyncio.gather(self.send("C0", "AS"), self.send("P1", "ZL"))
+    self.assertEqual(
+      self.events, [("start", "C0AS"), ("end", "C0AS"), ("start", "P1ZL"), ("end", "P1ZL")]
+    )
+
+  async def test_conflict(self):
+    await asyncio.gather(self.send("C0", "EA"), self.send("C0", "AS"), self.send("C0", "PP"))
+    self.assertEqual([e[0] for e in self.events], ["start", "end"] * 3)
+
+    pipeline = CommandPipeline.for_star(conflicts=[("pip", "core96")])
+    self.assertNotIn("iswap", pipeline._queue_of)
+
+  async def test_exclusive(self):
+    await asyncio.gather(
+      self.send("C0", "AS"), self.send("C0", "VI"), self.send("C0", "PP"), self.send("C0", "RQ")
+    )
+    self.assertEqual(
+      self.events[:4], [("start", "C0AS"), ("end", "C0AS"), ("start", "C0VI"), ("end", "C0VI")]
+    )
+    self.assertEqual([e[0] for e in self.events[4:]], ["start", "start", "end", "end"])
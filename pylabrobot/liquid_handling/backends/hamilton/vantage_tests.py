@@ -223,7 +223,7 @@ class VantageCommandCatcher(Vantage):
     auto_id: bool = True,
     tip_pattern: Optional[List[bool]] = None,
     write_timeout: Optional[int] = None,
-    read_timeout: Optional[int] = None,
+    read_timeout: Optional[float] = None,
     wait=True,
     fmt: Optional[Any] = None,
     **kwargs,
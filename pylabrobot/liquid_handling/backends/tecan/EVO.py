@@ -150,11 +150,11 @@ class TecanLiquidHandler(LiquidHandlerBackend, metaclass=ABCMeta):
 
     cmd = self._assemble_command(module, command, [] if params is None else params)
 
-    self.io.write(cmd.encode(), timeout=write_timeout)
+    await self.io.write_async(cmd.encode(), timeout=write_timeout)
     if not wait:
       return None
 
-    resp = self.io.read(timeout=read_timeout)
+    resp = await self.io.read_async(timeout=read_timeout)
     return self.parse_response(resp)
 
   async def setup(self):
@@ -621,8 +621,9 @@ class EVO(TecanLiquidHandler):
     def get_z_position(z, z_off, tip_length):
       return int(self._z_range - z + z_off * 10 + tip_length)  # TODO: verify z formula
 
+    locations = [op.resource.get_absolute_location() for op in ops[: len(use_channels)]]
     for i, channel in enumerate(use_channels):
-      location = ops[i].resource.get_absolute_location() + ops[i].resource.center()
+      location = locations[i] + ops[i].resource.center()
       x_positions[channel] = int((location.x - 100) * 10)
       y_positions[channel] = int((346.5 - location.y) * 10)  # TODO: verify
 
@@ -631,18 +632,11 @@ class EVO(TecanLiquidHandler):
         raise ValueError(f"Operation is not supported by resource {par}.")
       # TODO: calculate defaults when z-attribs are not specified
       tip_length = int(ops[i].tip.total_tip_length * 10)
-      z_positions["travel"][channel] = get_z_position(
-        par.z_travel, par.get_absolute_location().z, tip_length
-      )
-      z_positions["start"][channel] = get_z_position(
-        par.z_start, par.get_absolute_location().z, tip_length
-      )
-      z_positions["dispense"][channel] = get_z_position(
-        par.z_dispense, par.get_absolute_location().z, tip_length
-      )
-      z_positions["max"][channel] = get_z_position(
-        par.z_max, par.get_absolute_location().z, tip_length
-      )
+      par_z = par.get_absolute_location().z
+      z_positions["travel"][channel] = get_z_position(par.z_travel, par_z, tip_length)
+      z_positions["start"][channel] = get_z_position(par.z_start, par_z, tip_length)
+      z_positions["dispense"][channel] = get_z_position(par.z_dispense, par_z, tip_length)
+      z_positions["max"][channel] = get_z_position(par.z_max, par_z, tip_length)
 
     return x_positions, y_positions, z_positions
 
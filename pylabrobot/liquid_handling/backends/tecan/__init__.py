@@ -1,5 +1,5 @@
 """Tecan liquid handling backends."""
 
-from ..fluent import Fluent
+from .fluent import Fluent
 
 __all__ = ["Fluent"]
@@ -6,12 +6,33 @@ This backend assumes:
 3. The server is accessible at the specified host and port
 """
 
+import functools
+import json
 import logging
 import sys
-from typing import Any, Dict, List, Optional, Union, cast
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 import asyncio
 import warnings
 
+if TYPE_CHECKING:
+    from pylabrobot.liquid_handling.backends.tecan.fluent_compiler import FluentWorklist
+
 # Import SiLA2 connector with detailed error handling
 HAS_TECAN_SILA = False
 try:
@@ -45,9 +66,97 @@ from pylabrobot.liquid_handling.standard import (
 )
 from pylabrobot.resources import Resource, Coordinate, Liquid
 
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+@dataclass
+class WorklistBatchStats:
+    """Latency and throughput statistics of batched worklist submissions.
+
+    Attributes:
+        batches: Number of batches submitted to FluentControl.
+        operations: Total number of operations submitted in those batches.
+        total_latency: Total time in seconds spent submitting batches.
+        history: `(batch_size, latency)` of the most recent batches.
+    """
+
+    batches: int = 0
+    operations: int = 0
+    total_latency: float = 0.0
+    history: Deque[Tuple[int, float]] = field(default_factory=lambda: deque(maxlen=100))
+
+    def record(self, batch_size: int, latency: float) -> None:
+        """Record a submitted batch."""
+        self.batches += 1
+        self.operations += batch_size
+        self.total_latency += latency
+        self.history.append((batch_size, latency))
+
+    @property
+    def last_latency(self) -> float:
+        """Latency of the most recent batch in seconds, 0 if no batch was submitted."""
+        return self.history[-1][1] if self.history else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """Mean latency per batch in seconds."""
+        return self.total_latency / self.batches if self.batches else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Submitted operations per second of submission time."""
+        return self.operations / self.total_latency if self.total_latency > 0 else 0.0
+
+    def reset(self) -> None:
+        """Reset all statistics."""
+        self.batches = 0
+        self.operations = 0
+        self.total_latency = 0.0
+        self.history.clear()
+
+
+class MetadataCache:
+    """Cache for FluentControl metadata, like the available methods and labware, whose entries
+    expire after `ttl` seconds. A `ttl` of 0 disables caching."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, ...], Tuple[float, Any]] = {}
+
+    def get(self, key: Tuple[str, ...]) -> Any:
+        """Get a cached value, or `_MISSING` if it is not cached or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        stored_at, value = entry
+        if time.monotonic() - stored_at >= self.ttl:
+            self._entries.pop(key, None)
+            return _MISSING
+        return value
+
+    def set(self, key: Tuple[str, ...], value: Any) -> None:
+        if self.ttl > 0:
+            self._entries[key] = (time.monotonic(), value)
+
+    def invalidate(self, *prefix: str) -> None:
+        """Remove the entries whose key starts with `prefix`, or all entries if no prefix is given."""
+        for key in list(self._entries):
+            if key[: len(prefix)] == prefix:
+                self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class Fluent(LiquidHandlerBackend):
     """Backend for controlling Tecan Fluent liquid handlers using the SiLA2 connector."""
 
+    # States FluentControl passes through in normal operation. Any other state change, like a
+    # restart or an error, invalidates the local mirror of variable values and cached metadata.
+    steady_states = frozenset({"Idle", "Running", "Paused"})
+
     def __init__(
         self,
         num_channels: int,
@@ -56,9 +165,20 @@ class Fluent(LiquidHandlerBackend):
         insecure: bool = True,
         discovery_time: int = 10,
         method_name: str = "pylabrobot",
-        operation_timeout: int = 30,
+        operation_timeout: float = 30,
+        run_timeout: Optional[float] = None,
         connection_timeout: int = 10,
-        simulation_mode: bool = False
+        simulation_mode: bool = False,
+        batch_mode: bool = False,
+        batch_size: int = 96,
+        batch_timeout: Optional[float] = None,
+        batch_variable: str = "worklist",
+        max_workers: int = 1,
+        connector: Optional[Any] = None,
+        pipelined: bool = False,
+        pipeline_depth: int = 2,
+        pipeline_buffer_variable: str = "pipeline_buffer",
+        metadata_ttl: float = 60,
     ) -> None:
         """Create a new Tecan Fluent backend.
 
@@ -69,11 +189,43 @@ class Fluent(LiquidHandlerBackend):
             insecure: Whether to use insecure connection (no SSL).
             discovery_time: Time in seconds to wait for server discovery (optional).
             method_name: Name of the Fluent method to use (must be loaded in FluentControl).
-            operation_timeout: Timeout for operation in seconds (optional).
+            operation_timeout: Timeout in seconds for a single call to the connector (optional).
+            run_timeout: Timeout in seconds for running a method or worklist, which can take much
+                longer than other calls. If `None`, runs are not timed out.
             connection_timeout: Timeout for connection in seconds (optional).
             simulation_mode: Whether to run in simulation mode (optional).
+            batch_mode: Whether to buffer operations and submit them to FluentControl as a single
+                worklist payload instead of one method per operation. Buffered operations are
+                submitted on :meth:`flush`, when `batch_size` operations are buffered, after
+                `batch_timeout` seconds, or before any call that reads back the worklist.
+            batch_size: Maximum number of operations buffered before they are submitted.
+            batch_timeout: Maximum time in seconds an operation stays buffered (optional). If
+                `None`, only the size threshold and explicit flushes submit a batch.
+            batch_variable: Name of the variable of the `method_name` method that receives the
+                JSON encoded worklist payload in batch mode.
+            max_workers: Number of threads that run the blocking connector calls. Calls are run
+                off the event loop so the backend does not stall other tasks on it. The default of
+                1 keeps calls to the connector ordered.
+            connector: Connector to use instead of connecting to a FluentControl SiLA server, for
+                example a stand-in from :mod:`~pylabrobot.liquid_handling.backends.tecan.fluent_simulator`
+                (optional).
+            pipelined: Whether to run worklist segments as soon as they are added to the worklist.
+                Segments run in the background, so adding to the worklist does not wait for the
+                robot. The variables of segments are double-buffered: while a segment runs, the
+                variables of the next one are written to the other of two variable sets, named
+                like the variable with a `_0` or `_1` suffix (`volume_0`, `volume_1`). Before a
+                segment runs, the index of its set is written to `pipeline_buffer_variable`, so
+                the methods must read their variables from the set it selects. See
+                :meth:`drain_pipeline`.
+            pipeline_depth: Maximum number of segments waiting to be prepared in pipelined mode.
+                Adding to a full pipeline waits until a segment was taken from it.
+            pipeline_buffer_variable: Name of the variable that selects the variable set of the
+                running segment in pipelined mode.
+            metadata_ttl: Time in seconds that available methods, labware, variable names and
+                method parameters are cached. 0 disables caching. The cache is also cleared on
+                unexpected FluentControl state changes and by :meth:`invalidate_metadata_cache`.
         """
-        if not HAS_TECAN_SILA:
+        if connector is None and not HAS_TECAN_SILA:
             raise RuntimeError(
                 "The Tecan Fluent backend requires the Tecan Fluent SiLA2 connector. "
                 "Please install it from: https://gitlab.com/tecan/fluent-sila2-connector"
@@ -89,6 +241,17 @@ class Fluent(LiquidHandlerBackend):
         if not isinstance(port, int) or port <= 0 or port > 65535:
             raise ValueError("port must be a valid port number (1-65535)")
 
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer")
+        if batch_timeout is not None and batch_timeout <= 0:
+            raise ValueError("batch_timeout must be positive")
+        if not isinstance(max_workers, int) or max_workers <= 0:
+            raise ValueError("max_workers must be a positive integer")
+        if not isinstance(pipeline_depth, int) or pipeline_depth <= 0:
+            raise ValueError("pipeline_depth must be a positive integer")
+        if metadata_ttl < 0:
+            raise ValueError("metadata_ttl must not be negative")
+
         super().__init__()
         self._num_channels = num_channels
         self.host = host
@@ -97,9 +260,45 @@ class Fluent(LiquidHandlerBackend):
         self.discovery_time = discovery_time
         self.method_name = method_name
         self.operation_timeout = operation_timeout
+        self.run_timeout = run_timeout
         self.connection_timeout = connection_timeout
         self.simulation_mode = simulation_mode
         self.fluent: Optional[TecanFluent] = None
+        self._connector = connector
+
+        self.batch_mode = batch_mode
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.batch_variable = batch_variable
+        self.batch_stats = WorklistBatchStats()
+        self._batch: List[Dict[str, Any]] = []
+        # operations written to `batch_variable` that have not been run yet
+        self._submitted: List[Dict[str, Any]] = []
+        self._batch_timer: Optional[asyncio.TimerHandle] = None
+        self._batch_flush_task: Optional[asyncio.Task] = None
+
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.pipelined = pipelined
+        self.pipeline_depth = pipeline_depth
+        self.pipeline_buffer_variable = pipeline_buffer_variable
+        # the variable set the next segment is staged in, the running segment reads the other one
+        self._pipeline_buffer = 0
+        self._pipeline_queue: Optional[asyncio.Queue] = None
+        self._pipeline_task: Optional[asyncio.Task] = None
+        self._pipeline_running: Optional[asyncio.Future] = None
+        self._pipeline_error: Optional[Exception] = None
+        # runs get their own thread, so other connector calls are not queued behind a run
+        self._run_executor: Optional[ThreadPoolExecutor] = None
+
+        # last values written to FluentControl by method and variable name, so unchanged variables
+        # are not sent again
+        self._variable_mirror: Dict[Tuple[str, str], Any] = {}
+        self._variable_mirror_generation = 0
+
+        self.metadata_cache = MetadataCache(ttl=metadata_ttl)
+        self._metadata_warmup: Optional[asyncio.Task] = None
 
         # Set up logging
         logging.basicConfig(level=logging.INFO)
@@ -111,6 +310,97 @@ class Fluent(LiquidHandlerBackend):
         """Get the number of channels on the liquid handler."""
         return self._num_channels
 
+    def _get_fluent(self) -> "TecanFluent":
+        """The connector, raising if the backend is not set up."""
+        if self.fluent is None:
+            raise RuntimeError("Fluent backend not initialized. Call setup() first.")
+        return self.fluent
+
+    async def _run(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        executor: Optional[ThreadPoolExecutor] = None,
+        timeout: Any = _MISSING,
+    ) -> T:
+        """Run a blocking connector call on the backend's executor, or on `executor` if given.
+
+        If the calling task is cancelled or the call times out, calls that have not started yet are
+        dropped. A call that is already running cannot be interrupted and finishes in the
+        background.
+
+        Raises:
+            TimeoutError: If the call did not finish within `timeout` seconds, `operation_timeout`
+                by default. A `timeout` of `None` waits indefinitely.
+        """
+        if timeout is _MISSING:
+            timeout = self.operation_timeout
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="FluentBackend"
+            )
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor or self._executor, functools.partial(func, *args))
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError as e:
+            name = getattr(func, "__name__", repr(func))
+            raise TimeoutError(f"{name} did not finish within {timeout} s") from e
+
+    def invalidate_variable_mirror(self) -> None:
+        """Forget the last written variable values, so that all variables are sent on next use."""
+        self._variable_mirror = {}
+        self._variable_mirror_generation += 1
+
+    async def _sync_variables(self, method_name: str, variables: Dict[str, Any]) -> int:
+        """Write the variables of the prepared method `method_name` whose values differ from the
+        last values written to that method.
+
+        Changed variables are written in a single `set_variable_values` call if the connector has
+        it, and one `set_variable_value` call each otherwise.
+
+        Returns:
+            int: The number of variables that were written.
+        """
+        generation = self._variable_mirror_generation
+        changed = {
+            name: value
+            for name, value in variables.items()
+            if (method_name, name) not in self._variable_mirror
+            or self._variable_mirror[(method_name, name)] != value
+        }
+        if not changed:
+            return 0
+
+        fluent = self._get_fluent()
+        if hasattr(fluent, "set_variable_values"):
+            await self._run(fluent.set_variable_values, changed)
+        elif hasattr(fluent, "set_variable_value"):
+            for name, value in changed.items():
+                await self._run(fluent.set_variable_value, name, value)
+        else:
+            return 0
+
+        # the mirror may have been invalidated while writing, in which case the values are stale
+        if generation == self._variable_mirror_generation:
+            self._variable_mirror.update(
+                {(method_name, name): value for name, value in changed.items()}
+            )
+        # cached method parameters may hold the old values
+        self.metadata_cache.invalidate("parameters")
+        return len(changed)
+
+    def invalidate_metadata_cache(self) -> None:
+        """Clear cached methods, labware, variable names and method parameters."""
+        self.metadata_cache.invalidate()
+
+    async def _warm_metadata_cache(self) -> None:
+        """Fill the metadata cache, in the background of setup."""
+        try:
+            await self.get_available_labware()
+        except Exception as e:
+            self.logger.warning(f"Could not warm metadata cache: {e}")
+
     async def setup(self) -> None:
         """Set up the connection to the Fluent server.
 
@@ -123,7 +413,7 @@ class Fluent(LiquidHandlerBackend):
             ConnectionError: If the server is not running or not accessible
             RuntimeError: If FluentControl is not properly initialized
         """
-        if TecanFluent is None:
+        if self._connector is None and not HAS_TECAN_SILA:
             raise RuntimeError(
                 "Tecan Fluent SiLA2 connector not found. "
                 "Please contact Tecan support for access to their SiLA2 connector package."
@@ -131,17 +421,24 @@ class Fluent(LiquidHandlerBackend):
         try:
             self.logger.info(f"Connecting to Fluent server at {self.host}:{self.port}")
 
+            self.invalidate_variable_mirror()
+            self.invalidate_metadata_cache()
+
             # Create the SiLA client (does not start a server)
-            self.fluent = TecanFluent(
-                self.host,
-                self.port,
-                insecure=self.insecure
-            )
+            if self._connector is not None:
+                fluent = self._connector
+            else:
+                fluent = await self._run(
+                    functools.partial(TecanFluent, insecure=self.insecure),
+                    self.host,
+                    self.port,
+                )
+            self.fluent = fluent
 
             # Start FluentControl if needed
             self.logger.info("Starting FluentControl...")
             try:
-                self.fluent.start_fluent()
+                await self._run(fluent.start_fluent)
                 self.logger.info("FluentControl start command sent")
             except Exception as e:
                 self.logger.warning(f"Could not start FluentControl (it may already be running): {e}")
@@ -149,19 +446,23 @@ class Fluent(LiquidHandlerBackend):
             # Subscribe to state changes
             def state_changed_callback(state):
                 self.logger.info(f"FluentControl state changed to: {state}")
-            self.fluent.subscribe_state(state_changed_callback)
+                if state not in self.steady_states:
+                    self.invalidate_variable_mirror()
+                    self.metadata_cache.invalidate()
+            await self._run(fluent.subscribe_state, state_changed_callback)
 
             # Check current state
-            current_state = self.fluent.state
+            current_state = await self._run(lambda: fluent.state)
             self.logger.info(f"Current FluentControl state: {current_state}")
 
             # Try to get available methods to verify connection
             try:
                 self.logger.info("Getting available methods...")
-                methods = self.fluent.get_all_runnable_methods()
+                methods = await self._run(fluent.get_all_runnable_methods)
                 self.logger.info(f"Available methods: {methods}")
                 if not methods:
                     self.logger.warning("No methods available in FluentControl")
+                self.metadata_cache.set(("methods",), list(methods))
             except Exception as e:
                 self.logger.error(
                     "Could not get available methods. "
@@ -174,13 +475,22 @@ class Fluent(LiquidHandlerBackend):
 
             self.logger.info("Successfully connected to Fluent server")
 
+            self._metadata_warmup = asyncio.ensure_future(self._warm_metadata_cache())
+
         except Exception as e:
             self.logger.error(f"Failed to connect to Fluent server: {e}")
             raise
 
     async def stop(self) -> None:
-        """Stop the connection to the Fluent server."""
+        """Stop the connection to the Fluent server.
+
+        Operations that are still buffered or were submitted but not run in batch mode, and queued
+        segments in pipelined mode, are run first.
+        """
         if self.fluent:
+            if self.pipelined or self._batch or self._submitted:
+                if not await self.run_worklist():
+                    self.logger.warning("Stopping with operations of the worklist that were not run")
             try:
                 # Don't stop the server, just clean up our connection
                 self.fluent = None
@@ -189,44 +499,106 @@ class Fluent(LiquidHandlerBackend):
                 self.logger.error(f"Error disconnecting from Fluent server: {e}")
                 raise
 
+        self._abort_pipeline()
+        if self._metadata_warmup is not None:
+            self._metadata_warmup.cancel()
+            self._metadata_warmup = None
+        for executor in (self._executor, self._run_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._run_executor = None
+
     # SiLA Worklist and Method Management Methods
 
     def get_available_methods(self) -> List[str]:
-        """Get a list of available methods from the Fluent server.
+        """Get a list of available methods from the Fluent server. Results are cached for
+        `metadata_ttl` seconds.
+
+        This is synchronous for backwards compatibility, so a cache miss blocks the event loop for
+        one round trip. Use :meth:`get_available_methods_async` from async code.
 
         Returns:
             List[str]: List of available method names.
         """
-        if not self.fluent:
-            raise RuntimeError("Fluent backend not initialized. Call setup() first.")
-
-        if self.simulation_mode:
-            return ["simulation_method"]
+        cached = self._get_cached_methods()
+        if cached is not None:
+            return cached
 
         try:
             # get_all_runnable_methods is synchronous
-            methods = self.fluent.get_all_runnable_methods()
-            self.logger.info(f"Retrieved {len(methods)} available methods")
-            return methods
+            methods = self._get_fluent().get_all_runnable_methods()
+        except Exception as e:
+            self.logger.error(f"Failed to get available methods: {e}")
+            raise
+        return self._cache_methods(methods)
+
+    async def get_available_methods_async(self) -> List[str]:
+        """Get a list of available methods from the Fluent server, without blocking the event
+        loop. Results are cached for `metadata_ttl` seconds.
+
+        Returns:
+            List[str]: List of available method names.
+        """
+        cached = self._get_cached_methods()
+        if cached is not None:
+            return cached
+
+        try:
+            methods = await self._run(self._get_fluent().get_all_runnable_methods)
         except Exception as e:
             self.logger.error(f"Failed to get available methods: {e}")
             raise
+        return self._cache_methods(methods)
+
+    def _get_cached_methods(self) -> Optional[List[str]]:
+        self._get_fluent()
+        if self.simulation_mode:
+            return ["simulation_method"]
+
+        cached = self.metadata_cache.get(("methods",))
+        if cached is not _MISSING:
+            return list(cached)
+        return None
+
+    def _cache_methods(self, methods: List[str]) -> List[str]:
+        self.logger.info(f"Retrieved {len(methods)} available methods")
+        self.metadata_cache.set(("methods",), list(methods))
+        return methods
 
     async def get_available_labware(self) -> List[str]:
-        """Get a list of available labware from FluentControl.
+        """Get a list of available labware from FluentControl. Results are cached for
+        `metadata_ttl` seconds.
 
         Returns:
             List[str]: List of labware names that are configured in FluentControl.
         """
+        cached = self.metadata_cache.get(("labware",))
+        if cached is not _MISSING:
+            return list(cached)
+
+        labware = await self._get_available_labware()
+        self.metadata_cache.set(("labware",), list(labware))
+        return labware
+
+    async def _get_variable_names(self) -> List[str]:
+        cached = self.metadata_cache.get(("variable_names",))
+        if cached is not _MISSING:
+            return list(cached)
+        variables = cast(List[str], await self._run(self._get_fluent().get_variable_names))
+        self.metadata_cache.set(("variable_names",), list(variables))
+        return variables
+
+    async def _get_available_labware(self) -> List[str]:
         try:
             # Try to get labware through variables first
-            variables = self.fluent.get_variable_names()
+            variables = await self._get_variable_names()
             labware = [v for v in variables if v.startswith("labware_")]
             if labware:
                 return labware
 
             # If no labware variables, try to get through method parameters
-            methods = await self.get_available_methods()
+            methods = await self.get_available_methods_async()
             if methods:
                 try:
                     params = await self.get_method_parameters(methods[0])
@@ -243,7 +615,8 @@ class Fluent(LiquidHandlerBackend):
             raise
 
     async def get_method_parameters(self, method_name: str) -> Dict[str, Any]:
-        """Get parameters for a specific method.
+        """Get parameters for a specific method. Results are cached for `metadata_ttl` seconds, or
+        until a variable is written.
 
         Args:
             method_name: Name of the method to get parameters for.
@@ -251,18 +624,28 @@ class Fluent(LiquidHandlerBackend):
         Returns:
             Dict[str, Any]: Dictionary of parameter names and their values.
         """
+        cached = self.metadata_cache.get(("parameters", method_name))
+        if cached is not _MISSING:
+            return dict(cached)
+
+        params = await self._get_method_parameters(method_name)
+        self.metadata_cache.set(("parameters", method_name), dict(params))
+        return params
+
+    async def _get_method_parameters(self, method_name: str) -> Dict[str, Any]:
         try:
             # Try to get method parameters through SiLA2 connector
             if hasattr(self.fluent, 'get_method_parameters'):
-                params = self.fluent.get_method_parameters(method_name)
+                params = await self._run(self._get_fluent().get_method_parameters, method_name)
                 self.logger.info(f"Got parameters for method {method_name}")
-                return params
+                return cast(Dict[str, Any], params)
 
             # If method doesn't exist, try to get through variables
-            variables = self.fluent.get_variable_names()
+            variables = await self._get_variable_names()
             method_vars = [v for v in variables if v.startswith(f"{method_name}_")]
             if method_vars:
-                return {v: self.fluent.get_variable_value(v) for v in method_vars}
+                fluent = self._get_fluent()
+                return {v: await self._run(fluent.get_variable_value, v) for v in method_vars}
 
             self.logger.warning(f"No parameters found for method {method_name}")
             return {}
@@ -277,36 +660,304 @@ class Fluent(LiquidHandlerBackend):
             method_name: Name of the method to add.
             parameters: Dictionary of parameters for the method.
 
+        In batch mode, the method is buffered and submitted later as part of a single worklist
+        payload, see :meth:`flush`. In pipelined mode, the method is queued to be prepared and run,
+        and this waits if the pipeline is full.
+
         Returns:
             bool: True if successful.
         """
+        if self.batch_mode:
+            self._batch.append({"method": method_name, "parameters": dict(parameters)})
+            if len(self._batch) >= self.batch_size:
+                return await self.flush()
+            self._schedule_batch_timeout()
+            return True
+
+        if self.pipelined:
+            return await self._enqueue_segment(method_name, parameters)
+
         try:
             # Prepare the method first
-            self.fluent.prepare_method(method_name)
+            await self._run(self._get_fluent().prepare_method, method_name)
             self.logger.info(f"Prepared method {method_name}")
 
-            # Set any parameters
-            for name, value in parameters.items():
-                if hasattr(self.fluent, 'set_variable_value'):
-                    self.fluent.set_variable_value(name, value)
+            # Set the parameters that changed since they were last set
+            await self._sync_variables(method_name, parameters)
 
             return True
         except Exception as e:
             self.logger.error(f"Error adding method to worklist: {e}")
             return False
 
+    # Batched worklist submission
+
+    @property
+    def pending_operations(self) -> int:
+        """Number of operations buffered in batch mode that have not been submitted yet."""
+        return len(self._batch)
+
+    async def flush(self) -> bool:
+        """Submit all buffered operations to FluentControl as a single worklist payload.
+
+        The payload is written to the `batch_variable` variable of the `method_name` method, so
+        the whole batch costs one `prepare_method` and one `set_variable_value` round trip. The
+        latency of the submission is recorded in :attr:`batch_stats`. In pipelined mode, the batch
+        is queued as a single segment.
+
+        Otherwise, the payload is only run by :meth:`run_worklist`. Operations that were submitted
+        but not run yet are kept in the payload, so a batch submitted because of the size or time
+        threshold is not overwritten by the next one. If the submission fails, the operations stay
+        buffered.
+
+        Returns:
+            bool: True if successful or if there was nothing to submit.
+        """
+        self._cancel_batch_timeout()
+        if not self._batch:
+            return True
+
+        steps, self._batch = self._batch, []
+
+        start = time.monotonic()
+        if self.pipelined:
+            payload = self._merge_batch(steps)
+            parameters = {self.batch_variable: json.dumps(payload, default=str)}
+            if not await self._enqueue_segment(self.method_name, parameters):
+                self._batch = steps + self._batch
+                return False
+            self.batch_stats.record(len(steps), time.monotonic() - start)
+            return True
+
+        payload = self._merge_batch(self._submitted + steps)
+        try:
+            await self._run(self._get_fluent().prepare_method, self.method_name)
+            await self._sync_variables(
+                self.method_name, {self.batch_variable: json.dumps(payload, default=str)}
+            )
+        except Exception as e:
+            self.logger.error(f"Error submitting batch of {len(steps)} operations: {e}")
+            self._batch = steps + self._batch
+            return False
+        self._submitted.extend(steps)
+        latency = time.monotonic() - start
+
+        self.batch_stats.record(len(steps), latency)
+        self.logger.info(
+            f"Submitted batch of {len(steps)} operations in {latency * 1000:.1f} ms "
+            f"({self.batch_stats.throughput:.1f} operations/s overall)"
+        )
+        return True
+
+    @staticmethod
+    def _merge_batch(steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge buffered operations into a single worklist payload.
+
+        Parameters that have the same value in every operation (like `num_channels`) are hoisted
+        into `"shared"`, and adjacent operations of the same method are merged into one step with
+        a list of parameter sets.
+        """
+        shared = dict(steps[0]["parameters"])
+        for step in steps[1:]:
+            params = step["parameters"]
+            shared = {k: v for k, v in shared.items() if k in params and params[k] == v}
+
+        merged: List[Dict[str, Any]] = []
+        for step in steps:
+            params = {k: v for k, v in step["parameters"].items() if k not in shared}
+            if merged and merged[-1]["method"] == step["method"]:
+                merged[-1]["parameters"].append(params)
+            else:
+                merged.append({"method": step["method"], "parameters": [params]})
+
+        return {"shared": shared, "steps": merged}
+
+    async def load_worklist(self, worklist: "FluentWorklist") -> bool:
+        """Load a worklist compiled offline by `FluentWorklistRecorder`.
+
+        The worklist is submitted like a batch: its payload is written to the `batch_variable`
+        variable of the `method_name` method, so that it runs as a single job on the next
+        :meth:`run_worklist`. Buffered operations are flushed first.
+
+        Returns:
+            bool: True if successful.
+        """
+        if not await self.flush():
+            return False
+
+        parameters = {self.batch_variable: worklist.to_json()}
+        if self.pipelined:
+            return await self._enqueue_segment(self.method_name, parameters)
+
+        if self._submitted:
+            self.logger.error(
+                f"Not loading worklist, {len(self._submitted)} submitted operations have not been "
+                "run yet. Call run_worklist() first."
+            )
+            return False
+
+        try:
+            await self._run(self._get_fluent().prepare_method, self.method_name)
+            await self._sync_variables(self.method_name, parameters)
+        except Exception as e:
+            self.logger.error(f"Error loading worklist of {len(worklist.steps)} steps: {e}")
+            return False
+        self.logger.info(
+            f"Loaded worklist of {len(worklist.steps)} steps "
+            f"({worklist.recorded_commands} recorded commands)"
+        )
+        return True
+
+    def _schedule_batch_timeout(self) -> None:
+        """Start the timer that flushes the batch after `batch_timeout` seconds, if not running."""
+        if self.batch_timeout is None or self._batch_timer is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._batch_timer = loop.call_later(self.batch_timeout, self._on_batch_timeout)
+
+    def _cancel_batch_timeout(self) -> None:
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+
+    def _on_batch_timeout(self) -> None:
+        self._batch_timer = None
+        self._batch_flush_task = asyncio.ensure_future(self.flush())
+        self._batch_flush_task.add_done_callback(self._on_batch_timeout_flushed)
+
+    def _on_batch_timeout_flushed(self, task: "asyncio.Future[bool]") -> None:
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.logger.error(f"Error flushing batch after timeout: {error}")
+        elif not task.result():
+            self.logger.error(
+                f"Could not flush batch after timeout, {self.pending_operations} operations are "
+                "still buffered"
+            )
+
+    # Pipelined worklist execution
+
+    async def _enqueue_segment(self, method_name: str, parameters: Dict[str, Any]) -> bool:
+        """Queue a segment to be prepared and run by the pipeline, starting it if needed."""
+        if self._pipeline_error is not None:
+            self.logger.error(
+                f"Not adding {method_name} to worklist, pipeline failed: {self._pipeline_error}"
+            )
+            return False
+
+        if self._pipeline_task is None:
+            self._pipeline_queue = asyncio.Queue(maxsize=self.pipeline_depth)
+            self._pipeline_task = asyncio.ensure_future(self._pipeline_worker())
+        queue = self._pipeline_queue
+        assert queue is not None
+        await queue.put((method_name, dict(parameters)))
+        if queue is not self._pipeline_queue:
+            # the pipeline was aborted while waiting for room in the queue
+            queue.get_nowait()
+            queue.task_done()
+            self.logger.error(f"Not adding {method_name} to worklist, pipeline was aborted")
+            return False
+        return True
+
+    async def _pipeline_worker(self) -> None:
+        """Stage the variables of segment N+1 in the variable set N does not read while N runs,
+        then prepare and run N+1 once N is done."""
+        assert self._pipeline_queue is not None
+        queue = self._pipeline_queue
+        if self._run_executor is None:
+            self._run_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="FluentRun")
+
+        while True:
+            method_name, parameters = await queue.get()
+            try:
+                if self._pipeline_error is not None:
+                    continue  # discard segments queued after a failure
+
+                # N reads the other set, and N-1, which read this one, is done
+                buffer = self._pipeline_buffer
+                await self._sync_variables(
+                    method_name,
+                    {f"{name}_{buffer}": value for name, value in parameters.items()},
+                )
+
+                if self._pipeline_running is not None:
+                    await self._pipeline_running
+                fluent = self._get_fluent()
+                await self._run(fluent.prepare_method, method_name)
+                await self._run(fluent.set_variable_value, self.pipeline_buffer_variable, buffer)
+                self._pipeline_buffer = 1 - buffer
+
+                self._pipeline_running = asyncio.ensure_future(
+                    self._run(
+                        fluent.run_method, executor=self._run_executor, timeout=self.run_timeout
+                    )
+                )
+                self.logger.info(f"Started worklist segment {method_name}")
+            except Exception as e:
+                self.logger.error(f"Error in worklist pipeline at {method_name}: {e}")
+                self._pipeline_error = e
+            finally:
+                queue.task_done()
+
+    async def drain_pipeline(self) -> bool:
+        """Wait until all queued worklist segments have been run.
+
+        Returns:
+            bool: True if all segments ran successfully. If a segment failed, the segments after it
+            are not run, False is returned and the pipeline accepts new segments again.
+        """
+        if self._pipeline_queue is None:
+            return True
+
+        await self._pipeline_queue.join()
+        if self._pipeline_running is not None:
+            try:
+                await self._pipeline_running
+            except Exception as e:
+                self.logger.error(f"Error running worklist segment: {e}")
+                self._pipeline_error = self._pipeline_error or e
+            self._pipeline_running = None
+
+        error, self._pipeline_error = self._pipeline_error, None
+        return error is None
+
+    def _abort_pipeline(self) -> None:
+        """Cancel the pipeline and drop all queued segments. A segment that is already running on
+        the robot is not interrupted by this, use :meth:`stop_worklist` for that.
+
+        Callers waiting to add a segment to the full queue are woken up and fail, and callers of
+        :meth:`drain_pipeline` return."""
+        if self._pipeline_task is not None:
+            self._pipeline_task.cancel()
+        if self._pipeline_running is not None:
+            self._pipeline_running.cancel()
+        if self._pipeline_queue is not None:
+            while not self._pipeline_queue.empty():
+                self._pipeline_queue.get_nowait()
+                self._pipeline_queue.task_done()
+        self._pipeline_task = None
+        self._pipeline_queue = None
+        self._pipeline_running = None
+        self._pipeline_error = None
+
     async def clear_worklist(self) -> bool:
         """Clear the current worklist.
 
         Returns:
             bool: True if successful, False otherwise.
         """
+        self._cancel_batch_timeout()
+        self._batch = []
+        self._submitted = []
+
         if self.simulation_mode:
             self.logger.info("Simulation: Cleared worklist")
             return True
 
         try:
-            await self.fluent.clear_worklist()
+            await self._run(self._get_fluent().clear_worklist)
             self.logger.info("Cleared worklist")
             return True
         except Exception as e:
@@ -319,11 +970,12 @@ class Fluent(LiquidHandlerBackend):
         Returns:
             List[Dict[str, Any]]: List of methods in the worklist.
         """
+        await self.flush()
         try:
             if hasattr(self.fluent, 'get_worklist'):
-                worklist = self.fluent.get_worklist()
+                worklist = await self._run(self._get_fluent().get_worklist)
                 self.logger.info("Got current worklist")
-                return worklist
+                return cast(List[Dict[str, Any]], worklist)
             return []
         except Exception as e:
             self.logger.error(f"Error getting worklist: {e}")
@@ -332,12 +984,20 @@ class Fluent(LiquidHandlerBackend):
     async def run_worklist(self) -> bool:
         """Run the current worklist.
 
+        In pipelined mode, segments are already run as they are added, so this waits for the
+        pipeline to finish, see :meth:`drain_pipeline`.
+
         Returns:
             bool: True if successful.
         """
+        if not await self.flush():
+            return False
+        if self.pipelined:
+            return await self.drain_pipeline()
         try:
             if hasattr(self.fluent, 'run_method'):
-                self.fluent.run_method()
+                await self._run(self._get_fluent().run_method, timeout=self.run_timeout)
+                self._submitted = []
                 self.logger.info("Started worklist execution")
                 return True
             return False
@@ -351,8 +1011,9 @@ class Fluent(LiquidHandlerBackend):
         Returns:
             str: Current status.
         """
+        await self.flush()
         try:
-            return self.fluent.state
+            return cast(str, await self._run(lambda: self._get_fluent().state))
         except Exception as e:
             self.logger.error(f"Error getting worklist status: {e}")
             raise
@@ -368,7 +1029,7 @@ class Fluent(LiquidHandlerBackend):
             return True
 
         try:
-            await self.fluent.pause_worklist()
+            await self._run(self._get_fluent().pause_worklist)
             self.logger.info("Paused worklist execution")
             return True
         except Exception as e:
@@ -386,7 +1047,7 @@ class Fluent(LiquidHandlerBackend):
             return True
 
         try:
-            await self.fluent.resume_worklist()
+            await self._run(self._get_fluent().resume_worklist)
             self.logger.info("Resumed worklist execution")
             return True
         except Exception as e:
@@ -396,15 +1057,22 @@ class Fluent(LiquidHandlerBackend):
     async def stop_worklist(self) -> bool:
         """Stop the current worklist execution.
 
+        Queued segments of the pipeline and buffered operations are dropped.
+
         Returns:
             bool: True if successful, False otherwise.
         """
+        self._abort_pipeline()
+        self._cancel_batch_timeout()
+        self._batch = []
+        self._submitted = []
+
         if self.simulation_mode:
             self.logger.info("Simulation: Stopped worklist")
             return True
 
         try:
-            await self.fluent.stop_worklist()
+            await self._run(self._get_fluent().stop_worklist)
             self.logger.info("Stopped worklist execution")
             return True
         except Exception as e:
@@ -0,0 +1,217 @@
+"""Offline compilation of a `LiquidHandler` session into a single Tecan Fluent worklist.
+
+Instead of driving the Fluent step by step over SiLA, a protocol can be run against
+:class:`FluentWorklistRecorder`, compiled into a :class:`FluentWorklist` and run on the Fluent as
+one job:
+
+    recorder = FluentWorklistRecorder(num_channels=8)
+    lh = LiquidHandler(backend=recorder, deck=deck)
+    await lh.setup()
+    ...  # run the protocol
+    worklist = recorder.compile()
+    print(f"{worklist.round_trips_saved} round trips saved")
+
+    await fluent.load_worklist(worklist)
+    await fluent.run_worklist()
+
+The worklist payload has the same format as the batches submitted by `Fluent` in batch mode:
+`{"shared": {...}, "steps": [{"method": ..., "parameters": [...]}, ...]}`. Every parameter set of
+a compiled step has a `"channel"`, and the parameter sets of one step are executed together. The
+worklist can also be exported as a Tecan GWL worklist with :meth:`FluentWorklist.to_gwl`.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from pylabrobot.liquid_handling.backends.serializing_backend import SerializingBackend
+from pylabrobot.resources import ItemizedResource, Resource
+
+# commands that are not protocol steps
+_IGNORED_COMMANDS = {"setup", "stop", "resource_assigned", "resource_unassigned"}
+
+# commands that are merged with adjacent commands of the same kind on other channels
+_CHANNEL_COMMANDS = {"pick_up_tips", "drop_tips", "aspirate", "dispense"}
+
+# round trips to run a compiled worklist: prepare the method, write the payload, run it
+_COMPILED_ROUND_TRIPS = 3
+
+
+@dataclass
+class FluentWorklist:
+  """A compiled Fluent worklist.
+
+  Attributes:
+      steps: The steps of the worklist, as `{"method": ..., "parameters": [...]}`.
+      num_channels: The number of channels of the robot the worklist was recorded for.
+      recorded_commands: The number of liquid handling commands that were recorded.
+      step_by_step_round_trips: The estimated number of round trips to FluentControl to run the
+          recorded commands one by one.
+      gwl_lines: The steps as GWL records, `None` if a step cannot be expressed in GWL.
+  """
+
+  steps: List[Dict[str, Any]]
+  num_channels: int
+  recorded_commands: int
+  step_by_step_round_trips: int
+  gwl_lines: Optional[List[str]] = field(default=None, repr=False)
+
+  @property
+  def round_trips(self) -> int:
+    """The number of round trips to FluentControl to run the compiled worklist."""
+    return _COMPILED_ROUND_TRIPS
+
+  @property
+  def round_trips_saved(self) -> int:
+    """The estimated number of round trips saved by running the compiled worklist."""
+    return max(self.step_by_step_round_trips - self.round_trips, 0)
+
+  def to_payload(self) -> Dict[str, Any]:
+    """The worklist payload, as written to the worklist variable by `Fluent.load_worklist`."""
+    return {"shared": {"num_channels": self.num_channels}, "steps": self.steps}
+
+  def to_json(self) -> str:
+    return json.dumps(self.to_payload(), default=str)
+
+  def to_gwl(self) -> str:
+    """The worklist in the Tecan GWL format, which FluentControl can import.
+
+    Tip pickups are implicit in GWL and are left out, tip drops become a `W;` record.
+
+    Raises:
+        ValueError: If the worklist contains steps that cannot be expressed in GWL.
+    """
+    if self.gwl_lines is None:
+      raise ValueError("Worklist contains steps that cannot be expressed in GWL.")
+    return "\n".join(self.gwl_lines) + "\n"
+
+  def save(self, path: str) -> None:
+    """Save the worklist: as GWL if `path` ends with `.gwl`, else as JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+      if path.endswith(".gwl"):
+        f.write(self.to_gwl())
+      else:
+        json.dump(self.to_payload(), f, indent=2, default=str)
+
+
+class FluentWorklistRecorder(SerializingBackend):
+  """A backend that records a `LiquidHandler` session so it can be compiled into a single
+  :class:`FluentWorklist`. Nothing is sent to a robot."""
+
+  def __init__(self, num_channels: int, liquid_class: str = ""):
+    """Create a new recorder.
+
+    Args:
+        num_channels: The number of channels of the Fluent the worklist is compiled for.
+        liquid_class: The liquid class written to GWL records (optional).
+    """
+    super().__init__(num_channels=num_channels)
+    self.liquid_class = liquid_class
+    self.recorded: List[Dict[str, Any]] = []
+
+  async def setup(self):
+    self.recorded = []
+    await super().setup()
+
+  async def send_command(self, command: str, data: Optional[Dict[str, Any]] = None):
+    if command not in _IGNORED_COMMANDS:
+      self.recorded.append({"command": command, "data": data})
+
+  def clear(self):
+    self.recorded = []
+
+  def serialize(self) -> dict:
+    return {**super().serialize(), "liquid_class": self.liquid_class}
+
+  def compile(self) -> FluentWorklist:
+    """Compile the recorded session into a single worklist.
+
+    Adjacent pickups, drops, aspirations and dispenses on disjoint channels are merged into
+    one multi-channel step.
+    """
+    steps: List[Dict[str, Any]] = []
+    step_by_step_round_trips = 0
+    for recorded in self.recorded:
+      command, data = recorded["command"], recorded["data"] or {}
+      if command in _CHANNEL_COMMANDS:
+        parameters = [
+          {"channel": channel, **self._channel_parameters(command, op)}
+          for channel, op in zip(data["use_channels"], data["channels"])
+        ]
+      else:
+        parameters = [data]
+      # one run per command, and a prepare and variable writes per channel
+      step_by_step_round_trips += 1 + sum(1 + len(p) for p in parameters)
+
+      previous = steps[-1] if steps else None
+      if (
+        previous is not None
+        and command in _CHANNEL_COMMANDS
+        and previous["method"] == command
+        and not {p["channel"] for p in previous["parameters"]} & {p["channel"] for p in parameters}
+      ):
+        previous["parameters"].extend(parameters)
+      else:
+        steps.append({"method": command, "parameters": parameters})
+
+    return FluentWorklist(
+      steps=steps,
+      num_channels=self.num_channels,
+      recorded_commands=len(self.recorded),
+      step_by_step_round_trips=step_by_step_round_trips,
+      gwl_lines=self._gwl_lines(steps),
+    )
+
+  @staticmethod
+  def _channel_parameters(command: str, op: Dict[str, Any]) -> Dict[str, Any]:
+    if command in {"pick_up_tips", "drop_tips"}:
+      return {"tip_spot": op["resource_name"]}
+    return {
+      "resource": op["resource_name"],
+      "volume": op["volume"],
+      "flow_rate": op["flow_rate"],
+      "liquid_height": op["liquid_height"],
+      "blow_out_air_volume": op["blow_out_air_volume"],
+    }
+
+  def _gwl_lines(self, steps: List[Dict[str, Any]]) -> Optional[List[str]]:
+    lines: List[str] = []
+    for step in steps:
+      method = step["method"]
+      if method == "pick_up_tips":
+        continue
+      if method == "drop_tips":
+        lines.append("W;")
+        continue
+      if method not in {"aspirate", "dispense"}:
+        return None
+      for p in step["parameters"]:
+        resource = self.deck.get_resource(p["resource"])
+        label, rack_type, position = self._gwl_location(resource)
+        lines.append(
+          ";".join(
+            [
+              "A" if method == "aspirate" else "D",
+              label,
+              "",
+              rack_type,
+              str(position),
+              "",
+              f"{p['volume']:g}",
+              self.liquid_class,
+              "",
+              str(1 << p["channel"]),
+            ]
+          )
+        )
+    return lines
+
+  @staticmethod
+  def _gwl_location(resource: Resource):
+    """Rack label, rack type and 1-based position of a container in its parent."""
+    parent = resource.parent
+    if isinstance(parent, ItemizedResource):
+      index = parent.index_of_item(resource)
+      if index is not None:
+        return parent.name, parent.model or "", index + 1
+    return resource.name, resource.model or "", 1
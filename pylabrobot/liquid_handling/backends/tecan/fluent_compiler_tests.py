@@ -0,0 +1,113 @@
+"""Tests for compiling a LiquidHandler session into a single Fluent worklist."""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from pylabrobot.liquid_handling import LiquidHandler
+from pylabrobot.liquid_handling.backends.tecan.fluent import Fluent
+from pylabrobot.liquid_handling.backends.tecan.fluent_compiler import FluentWorklistRecorder
+from pylabrobot.liquid_handling.backends.tecan.fluent_simulator import FluentControlSimulator
+from pylabrobot.resources import HTF, Coordinate, Cor_96_wellplate_360ul_Fb, Deck
+
+
+class FluentWorklistRecorderTests(unittest.IsolatedAsyncioTestCase):
+  async def asyncSetUp(self) -> None:
+    await super().asyncSetUp()
+    self.recorder = FluentWorklistRecorder(num_channels=8, liquid_class="Water")
+    self.deck = Deck()
+    self.lh = LiquidHandler(backend=self.recorder, deck=self.deck)
+    self.tip_rack = HTF(name="tip_rack")
+    self.plate = Cor_96_wellplate_360ul_Fb(name="plate")
+    self.deck.assign_child_resource(self.tip_rack, location=Coordinate(0, 0, 0))
+    self.deck.assign_child_resource(self.plate, location=Coordinate(200, 0, 0))
+    await self.lh.setup()
+
+  async def asyncTearDown(self) -> None:
+    await self.lh.stop()
+    await super().asyncTearDown()
+
+  async def run_protocol(self):
+    await self.lh.pick_up_tips(self.tip_rack["A1:B1"])
+    await self.lh.aspirate(self.plate["A1:B1"], vols=[10, 20])
+    await self.lh.dispense(self.plate["A2:B2"], vols=[10, 20])
+    await self.lh.drop_tips(self.tip_rack["A1:B1"])
+
+  async def test_compile(self):
+    await self.run_protocol()
+    worklist = self.recorder.compile()
+
+    self.assertEqual(worklist.recorded_commands, 4)
+    self.assertEqual(
+      [step["method"] for step in worklist.steps],
+      ["pick_up_tips", "aspirate", "dispense", "drop_tips"],
+    )
+    aspiration = worklist.steps[1]["parameters"]
+    self.assertEqual([p["channel"] for p in aspiration], [0, 1])
+    self.assertEqual([p["resource"] for p in aspiration], ["plate_well_0_0", "plate_well_0_1"])
+    self.assertEqual([p["volume"] for p in aspiration], [10, 20])
+    self.assertEqual(worklist.round_trips, 3)
+    self.assertGreater(worklist.round_trips_saved, 20)
+
+  async def test_merge_adjacent_channels(self):
+    await self.lh.pick_up_tips(self.tip_rack["A1"], use_channels=[0])
+    await self.lh.pick_up_tips(self.tip_rack["B1"], use_channels=[1])
+    await self.lh.aspirate(self.plate["A1"], vols=[10], use_channels=[0])
+    await self.lh.aspirate(self.plate["A1"], vols=[10], use_channels=[0])
+    worklist = self.recorder.compile()
+    self.assertEqual(
+      [step["method"] for step in worklist.steps], ["pick_up_tips", "aspirate", "aspirate"]
+    )
+    self.assertEqual(len(worklist.steps[0]["parameters"]), 2)
+
+  async def test_gwl(self):
+    await self.run_protocol()
+    lines = self.recorder.compile().to_gwl().splitlines()
+    self.assertEqual(
+      lines,
+      [
+        "A;plate;;Cor_96_wellplate_360ul_Fb;1;;10;Water;;1",
+        "A;plate;;Cor_96_wellplate_360ul_Fb;2;;20;Water;;2",
+        "D;plate;;Cor_96_wellplate_360ul_Fb;9;;10;Water;;1",
+        "D;plate;;Cor_96_wellplate_360ul_Fb;10;;20;Water;;2",
+        "W;",
+      ],
+    )
+
+  async def test_gwl_unsupported_step(self):
+    await self.lh.move_plate(self.plate, to=Coordinate(400, 0, 0))
+    worklist = self.recorder.compile()
+    with self.assertRaises(ValueError):
+      worklist.to_gwl()
+
+  async def test_save(self):
+    await self.run_protocol()
+    worklist = self.recorder.compile()
+    with tempfile.TemporaryDirectory() as d:
+      worklist.save(os.path.join(d, "worklist.json"))
+      with open(os.path.join(d, "worklist.json"), encoding="utf-8") as f:
+        self.assertEqual(json.load(f), json.loads(worklist.to_json()))
+      worklist.save(os.path.join(d, "worklist.gwl"))
+      with open(os.path.join(d, "worklist.gwl"), encoding="utf-8") as f:
+        self.assertEqual(f.read(), worklist.to_gwl())
+
+  async def test_load_worklist(self):
+    await self.run_protocol()
+    worklist = self.recorder.compile()
+
+    simulator = FluentControlSimulator()
+    fluent = Fluent(num_channels=8, connector=simulator.tecan_fluent())
+    await fluent.setup()
+    await asyncio.sleep(0.05)  # let the metadata cache warm up
+    simulator.reset_calls()
+    self.assertTrue(await fluent.load_worklist(worklist))
+    self.assertTrue(await fluent.run_worklist())
+    self.assertEqual(simulator.total_calls, worklist.round_trips)
+    self.assertEqual(json.loads(simulator.variables["worklist"]), worklist.to_payload())
+    await fluent.stop()
+
+
+if __name__ == "__main__":
+  unittest.main()
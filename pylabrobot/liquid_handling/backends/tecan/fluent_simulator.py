@@ -0,0 +1,318 @@
+"""In-process stand-in for the FluentControl SiLA2 server.
+
+The stand-in implements the parts of the FluentControl feature set that are used by the `Fluent`,
+`TecanSiLABackend` and `UnitelabsSilasBackend` backends, so that the backends can be exercised
+end-to-end (including the connector path) without an instrument. Every call can be given a
+latency, methods take a configurable time to run, and calls can be made to fail.
+
+Example:
+    simulator = FluentControlSimulator(call_latency=0.002, method_run_time=0.01)
+    backend = Fluent(num_channels=8, connector=simulator.tecan_fluent())
+    await backend.setup()
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+
+class SimulatedSiLAError(RuntimeError):
+  """Raised by the stand-in when a failure is injected."""
+
+
+@dataclass
+class MethodStatus:
+  """Status of a method, as returned by `SimulatedFluentControl.get_method_status`."""
+
+  state: str
+
+
+@dataclass
+class _MethodRun:
+  started: float
+  fails: bool
+
+
+@dataclass
+class FluentControlSimulator:
+  """State of a simulated FluentControl instance, shared by the connector stand-ins.
+
+  Attributes:
+      call_latency: Time in seconds every call takes before it is handled.
+      method_run_time: Time in seconds it takes to run a method.
+      failure_rate: Probability that a call raises :class:`SimulatedSiLAError`.
+      method_failure_rate: Probability that a method run ends in the `"Error"` state.
+      fail_calls: Names of calls that always raise :class:`SimulatedSiLAError`.
+      seed: Seed for the failure injection.
+      methods: Names of the methods that can be run.
+      variables: Current values of all variables.
+      calls: Number of calls that were made, by name.
+      method_runs: Number of methods that were run.
+  """
+
+  call_latency: float = 0.0
+  method_run_time: float = 0.0
+  failure_rate: float = 0.0
+  method_failure_rate: float = 0.0
+  fail_calls: Set[str] = field(default_factory=set)
+  seed: Optional[int] = None
+  methods: List[str] = field(default_factory=lambda: ["pylabrobot"])
+  variables: Dict[str, Any] = field(default_factory=dict)
+  calls: Counter = field(default_factory=Counter)
+  method_runs: int = 0
+
+  def __post_init__(self):
+    self._random = random.Random(self.seed)
+    self.state = "Idle"
+    self.prepared_method: Optional[str] = None
+    self._state_callbacks: List[Callable[[str], None]] = []
+    self._runs: Dict[str, _MethodRun] = {}
+
+  @property
+  def total_calls(self) -> int:
+    """Total number of calls that were made."""
+    return sum(self.calls.values())
+
+  def reset_calls(self) -> None:
+    """Reset the call and method run counters."""
+    self.calls.clear()
+    self.method_runs = 0
+
+  def tecan_fluent(self) -> "SimulatedTecanFluent":
+    """A synchronous connector, like `tecan.Fluent`, used by the `Fluent` backend."""
+    return SimulatedTecanFluent(self)
+
+  def fluent_control(self) -> "SimulatedFluentControl":
+    """An asynchronous connector, like `tecan.fluent.sila2.FluentControl`, used by the
+    `TecanSiLABackend` backend."""
+    return SimulatedFluentControl(self)
+
+  def unitelabs_client(self) -> "SimulatedUnitelabsClient":
+    """An asynchronous client, like `unitelabs.silas.TecanFluentClient`, used by the
+    `UnitelabsSilasBackend` backend."""
+    return SimulatedUnitelabsClient(self)
+
+  def _handle(self, name: str) -> None:
+    """Count a call and inject a failure if configured."""
+    self.calls[name] += 1
+    if name in self.fail_calls or (
+      self.failure_rate > 0 and self._random.random() < self.failure_rate
+    ):
+      raise SimulatedSiLAError(f"Injected failure in {name}")
+
+  def _set_state(self, state: str) -> None:
+    self.state = state
+    for callback in self._state_callbacks:
+      callback(state)
+
+  def _start_run(self, method_name: str) -> None:
+    self.method_runs += 1
+    fails = self.method_failure_rate > 0 and self._random.random() < self.method_failure_rate
+    self._runs[method_name] = _MethodRun(started=time.monotonic(), fails=fails)
+
+  def _run_state(self, method_name: str) -> str:
+    run = self._runs.get(method_name)
+    if run is None:
+      return "Idle"
+    if time.monotonic() - run.started < self.method_run_time:
+      return "Running"
+    return "Error" if run.fails else "Completed"
+
+
+class SimulatedTecanFluent:
+  """Blocking stand-in for `tecan.Fluent`."""
+
+  def __init__(self, simulator: FluentControlSimulator):
+    self.simulator = simulator
+
+  def _call(self, name: str) -> None:
+    if self.simulator.call_latency > 0:
+      time.sleep(self.simulator.call_latency)
+    self.simulator._handle(name)
+
+  @property
+  def state(self) -> str:
+    return self.simulator.state
+
+  def start_fluent(self) -> None:
+    self._call("start_fluent")
+
+  def subscribe_state(self, callback: Callable[[str], None]) -> None:
+    self._call("subscribe_state")
+    self.simulator._state_callbacks.append(callback)
+
+  def get_all_runnable_methods(self) -> List[str]:
+    self._call("get_all_runnable_methods")
+    return list(self.simulator.methods)
+
+  def get_variable_names(self) -> List[str]:
+    self._call("get_variable_names")
+    return list(self.simulator.variables)
+
+  def get_variable_value(self, name: str) -> Any:
+    self._call("get_variable_value")
+    return self.simulator.variables[name]
+
+  def set_variable_value(self, name: str, value: Any) -> None:
+    self._call("set_variable_value")
+    self.simulator.variables[name] = value
+
+  def prepare_method(self, method_name: str) -> None:
+    self._call("prepare_method")
+    self.simulator.prepared_method = method_name
+
+  def run_method(self) -> None:
+    """Run the prepared method, blocking until it is done."""
+    self._call("run_method")
+    method_name = self.simulator.prepared_method or ""
+    self.simulator._start_run(method_name)
+    self.simulator._set_state("Running")
+    if self.simulator.method_run_time > 0:
+      time.sleep(self.simulator.method_run_time)
+    state = self.simulator._run_state(method_name)
+    self.simulator._set_state("Idle")
+    if state == "Error":
+      raise SimulatedSiLAError(f"Method {method_name} failed")
+
+
+class SimulatedFluentControl:
+  """Asynchronous stand-in for `tecan.fluent.sila2.FluentControl`."""
+
+  def __init__(self, simulator: FluentControlSimulator):
+    self.simulator = simulator
+    self.current_method: Optional[str] = None
+
+  async def _call(self, name: str) -> None:
+    if self.simulator.call_latency > 0:
+      await asyncio.sleep(self.simulator.call_latency)
+    self.simulator._handle(name)
+
+  async def connect(self) -> None:
+    await self._call("connect")
+
+  async def disconnect(self) -> None:
+    await self._call("disconnect")
+
+  async def _create_method(self, method_name: str, positions: List[Dict[str, Any]]) -> None:
+    if method_name not in self.simulator.methods:
+      self.simulator.methods.append(method_name)
+    for i, position in enumerate(positions):
+      for key, value in position.items():
+        self.simulator.variables[f"{key}_{i}"] = value
+
+  async def create_tip_pickup_method(self, method_name: str, positions: List[Dict[str, Any]]):
+    await self._call("create_tip_pickup_method")
+    await self._create_method(method_name, positions)
+
+  async def create_tip_drop_method(self, method_name: str, positions: List[Dict[str, Any]]):
+    await self._call("create_tip_drop_method")
+    await self._create_method(method_name, positions)
+
+  async def create_aspiration_method(self, method_name: str, positions: List[Dict[str, Any]]):
+    await self._call("create_aspiration_method")
+    await self._create_method(method_name, positions)
+
+  async def create_dispense_method(self, method_name: str, positions: List[Dict[str, Any]]):
+    await self._call("create_dispense_method")
+    await self._create_method(method_name, positions)
+
+  async def create_resource_pickup_method(self, method_name: str, positions: List[Dict[str, Any]]):
+    await self._call("create_resource_pickup_method")
+    await self._create_method(method_name, positions)
+
+  async def create_resource_move_method(self, method_name: str, positions: List[Dict[str, Any]]):
+    await self._call("create_resource_move_method")
+    await self._create_method(method_name, positions)
+
+  async def create_resource_drop_method(self, method_name: str, positions: List[Dict[str, Any]]):
+    await self._call("create_resource_drop_method")
+    await self._create_method(method_name, positions)
+
+  async def delete_method(self, method_name: str) -> None:
+    await self._call("delete_method")
+    if method_name in self.simulator.methods:
+      self.simulator.methods.remove(method_name)
+
+  async def load_method(self, method_name: str) -> None:
+    await self._call("load_method")
+    if method_name not in self.simulator.methods:
+      raise SimulatedSiLAError(f"Unknown method {method_name}")
+    self.current_method = method_name
+
+  async def get_current_method_id(self) -> Optional[str]:
+    await self._call("get_current_method_id")
+    return self.current_method
+
+  async def set_variable_value(self, name: str, value: Any) -> None:
+    await self._call("set_variable_value")
+    self.simulator.variables[name] = value
+
+  async def execute_method(self, method_id: str) -> None:
+    await self._call("execute_method")
+    self.simulator._start_run(method_id)
+
+  async def get_method_status(self, method_id: str) -> MethodStatus:
+    await self._call("get_method_status")
+    return MethodStatus(state=self.simulator._run_state(method_id))
+
+  async def subscribe_method_status(self, method_id: str) -> AsyncIterator[MethodStatus]:
+    """Stream the method status: the current status, and the final status when it is done."""
+    await self._call("subscribe_method_status")
+    state = self.simulator._run_state(method_id)
+    yield MethodStatus(state=state)
+    if state == "Running":
+      run = self.simulator._runs[method_id]
+      remaining = self.simulator.method_run_time - (time.monotonic() - run.started)
+      await asyncio.sleep(max(remaining, 0))
+      yield MethodStatus(state=self.simulator._run_state(method_id))
+
+
+class SimulatedUnitelabsClient:
+  """Asynchronous stand-in for `unitelabs.silas.TecanFluentClient`."""
+
+  def __init__(self, simulator: FluentControlSimulator):
+    self.simulator = simulator
+
+  async def _call(self, name: str) -> None:
+    if self.simulator.call_latency > 0:
+      await asyncio.sleep(self.simulator.call_latency)
+    self.simulator._handle(name)
+
+  async def _run(self, name: str) -> None:
+    """Handle a call that moves the robot, and wait until the move is done."""
+    await self._call(name)
+    self.simulator._start_run(name)
+    if self.simulator.method_run_time > 0:
+      await asyncio.sleep(self.simulator.method_run_time)
+    if self.simulator._run_state(name) == "Error":
+      raise SimulatedSiLAError(f"{name} failed")
+
+  async def connect(self) -> None:
+    await self._call("connect")
+
+  async def disconnect(self) -> None:
+    await self._call("disconnect")
+
+  async def pick_up_tips(self, positions) -> None:
+    await self._run("pick_up_tips")
+
+  async def drop_tips(self, positions) -> None:
+    await self._run("drop_tips")
+
+  async def aspirate(self, position, volume, flow_rate, liquid_height, **kwargs) -> None:
+    await self._run("aspirate")
+
+  async def dispense(self, position, volume, flow_rate, liquid_height, **kwargs) -> None:
+    await self._run("dispense")
+
+  async def pick_up_resource(self, position) -> None:
+    await self._run("pick_up_resource")
+
+  async def move_resource(self, position) -> None:
+    await self._run("move_resource")
+
+  async def drop_resource(self, position) -> None:
+    await self._run("drop_resource")
@@ -0,0 +1,120 @@
+"""Tests that the SiLA backends run end-to-end against the FluentControl stand-in."""
+
+import asyncio
+import unittest
+
+from pylabrobot.liquid_handling.backends.tecan.fluent import Fluent
+from pylabrobot.liquid_handling.backends.tecan.fluent_simulator import (
+  FluentControlSimulator,
+  SimulatedSiLAError,
+)
+from pylabrobot.liquid_handling.backends.tecan_silas_backend import TecanSiLABackend
+from pylabrobot.liquid_handling.backends.unitelabs_silas import UnitelabsSilasBackend
+from pylabrobot.liquid_handling.standard import SingleChannelAspiration
+from pylabrobot.resources import Coordinate, Cor_96_wellplate_360ul_Fb, Deck
+
+
+class FluentSimulatorTests(unittest.IsolatedAsyncioTestCase):
+  def setUp(self) -> None:
+    super().setUp()
+    self.simulator = FluentControlSimulator()
+    self.plate = Cor_96_wellplate_360ul_Fb(name="plate")
+    self.plate.location = Coordinate.zero()
+    self.aspiration = SingleChannelAspiration(
+      resource=self.plate.get_item("A1"),
+      offset=Coordinate.zero(),
+      tip=None,  # type: ignore[arg-type]
+      volume=10,
+      flow_rate=None,
+      liquid_height=None,
+      blow_out_air_volume=None,
+      liquids=[],
+    )
+
+  async def test_fluent(self):
+    backend = Fluent(num_channels=8, connector=self.simulator.tecan_fluent())
+    await backend.setup()
+    await backend.aspirate(self.plate.get_item("A1"), volume=10)
+    self.assertEqual(self.simulator.calls["prepare_method"], 1)
+    self.assertEqual(self.simulator.variables["volume"], 10)
+    self.assertTrue(await backend.run_worklist())
+    await backend.stop()
+
+  async def test_fluent_state_change_invalidates_variables(self):
+    backend = Fluent(num_channels=8, connector=self.simulator.tecan_fluent())
+    await backend.setup()
+    await backend.aspirate(self.plate.get_item("A1"), volume=10)
+    await backend.aspirate(self.plate.get_item("A1"), volume=10)
+    self.assertEqual(self.simulator.calls["set_variable_value"], 6)
+
+    self.simulator._set_state("Error")
+    await backend.aspirate(self.plate.get_item("A1"), volume=10)
+    self.assertEqual(self.simulator.calls["set_variable_value"], 12)
+    await backend.stop()
+
+  async def test_fluent_metadata_cache(self):
+    self.simulator.variables["labware_plate"] = "plate"
+    backend = Fluent(num_channels=8, connector=self.simulator.tecan_fluent())
+    await backend.setup()
+    await asyncio.sleep(0.05)  # let the cache warm up
+    self.simulator.reset_calls()
+
+    self.assertEqual(await backend.get_available_labware(), ["labware_plate"])
+    self.assertEqual(backend.get_available_methods(), ["pylabrobot"])
+    self.assertEqual(self.simulator.total_calls, 0)
+
+    backend.invalidate_metadata_cache()
+    await backend.get_available_labware()
+    self.assertEqual(self.simulator.calls["get_variable_names"], 1)
+
+    self.simulator._set_state("Error")
+    await backend.get_available_labware()
+    self.assertEqual(self.simulator.calls["get_variable_names"], 2)
+    await backend.stop()
+
+  async def test_fluent_metadata_ttl(self):
+    backend = Fluent(num_channels=8, connector=self.simulator.tecan_fluent(), metadata_ttl=0.01)
+    await backend.setup()
+    await asyncio.sleep(0.02)  # let the entries from setup expire
+    self.simulator.reset_calls()
+    backend.get_available_methods()
+    backend.get_available_methods()
+    self.assertEqual(self.simulator.calls["get_all_runnable_methods"], 1)
+    await asyncio.sleep(0.02)
+    backend.get_available_methods()
+    self.assertEqual(self.simulator.calls["get_all_runnable_methods"], 2)
+    await backend.stop()
+
+  async def test_tecan_sila_backend(self):
+    backend = TecanSiLABackend(num_channels=8, connector=self.simulator.fluent_control())
+    backend.set_deck(Deck())
+    await backend.setup()
+    await backend.aspirate([self.aspiration], use_channels=[0])
+    self.assertEqual(self.simulator.calls["create_aspiration_method"], 1)
+    self.assertEqual(self.simulator.calls["execute_method"], 1)
+    await backend.stop()
+
+  async def test_unitelabs_backend(self):
+    backend = UnitelabsSilasBackend(num_channels=8, connector=self.simulator.unitelabs_client())
+    backend.set_deck(Deck())
+    await backend.setup()
+    await backend.aspirate([self.aspiration])
+    self.assertEqual(self.simulator.calls["aspirate"], 1)
+    await backend.stop()
+
+  async def test_injected_call_failure(self):
+    self.simulator.fail_calls.add("execute_method")
+    backend = TecanSiLABackend(num_channels=8, connector=self.simulator.fluent_control())
+    backend.set_deck(Deck())
+    await backend.setup()
+    with self.assertRaises(SimulatedSiLAError):
+      await backend.aspirate([self.aspiration], use_channels=[0])
+
+  async def test_injected_method_failure(self):
+    self.simulator.method_failure_rate = 1
+    self.simulator.method_run_time = 0.01
+    backend = TecanSiLABackend(num_channels=8, connector=self.simulator.fluent_control())
+    backend.set_deck(Deck())
+    await backend.setup()
+    with self.assertRaises(RuntimeError):
+      await backend.aspirate([self.aspiration], use_channels=[0])
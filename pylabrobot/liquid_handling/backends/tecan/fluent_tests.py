@@ -1,7 +1,16 @@
 """Tests for the Tecan Fluent backend."""
 
+import asyncio
+import json
+import threading
+import time
+import unittest
+import unittest.mock
+from typing import Any
+
 import pytest
 from pylabrobot.liquid_handling.backends.tecan.fluent import Fluent
+from pylabrobot.resources import Resource
 
 # Configuration
 FLUENT_IP = "216.96.181.199"
@@ -144,4 +153,379 @@ async def test_liquid_handling_operations() -> None:
             print(f"Error during liquid handling: {e}")
 
     finally:
-        await backend.stop()
\ No newline at end of file
+        await backend.stop()
+
+
+class FakeFluentConnector:
+    """Records the calls the backend makes to the Tecan Fluent connector."""
+
+    def __init__(self):
+        self.calls = []
+        self.variables = {}
+        self.state = "Idle"
+
+    def prepare_method(self, method_name):
+        self.calls.append(("prepare_method", method_name))
+
+    def set_variable_value(self, name, value):
+        self.calls.append(("set_variable_value", name))
+        self.variables[name] = value
+
+    def run_method(self):
+        self.calls.append(("run_method",))
+
+    def get_all_runnable_methods(self):
+        self.calls.append(("get_all_runnable_methods",))
+        return ["pylabrobot"]
+
+    def clear_worklist(self):
+        self.calls.append(("clear_worklist",))
+
+    def pause_worklist(self):
+        self.calls.append(("pause_worklist",))
+
+    def resume_worklist(self):
+        self.calls.append(("resume_worklist",))
+
+    def stop_worklist(self):
+        self.calls.append(("stop_worklist",))
+
+
+def make_offline_backend(**kwargs) -> Fluent:
+    with unittest.mock.patch("pylabrobot.liquid_handling.backends.tecan.fluent.HAS_TECAN_SILA", True):
+        backend = Fluent(num_channels=8, **kwargs)
+    backend.fluent = FakeFluentConnector()
+    return backend
+
+
+def fake_connector(backend: Fluent) -> Any:
+    """The connector of a backend made by `make_offline_backend`."""
+    assert isinstance(backend.fluent, FakeFluentConnector)
+    return backend.fluent
+
+
+class FluentBatchTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for batched worklist submission, without a Fluent."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.well = Resource(name="well", size_x=1, size_y=1, size_z=1)
+
+    async def test_unbatched_round_trips(self):
+        backend = make_offline_backend()
+        await backend.aspirate(self.well, volume=10)
+        self.assertEqual(fake_connector(backend).calls[0], ("prepare_method", "aspirate"))
+        self.assertEqual(len(fake_connector(backend).calls), 7)
+
+    async def test_batch_flush(self):
+        backend = make_offline_backend(batch_mode=True)
+        await backend.pick_up_tips(self.well)
+        await backend.aspirate(self.well, volume=10)
+        await backend.dispense(self.well, volume=10)
+        await backend.dispense(self.well, volume=20)
+        self.assertEqual(fake_connector(backend).calls, [])
+        self.assertEqual(backend.pending_operations, 4)
+
+        self.assertTrue(await backend.flush())
+        self.assertEqual(
+            fake_connector(backend).calls,
+            [("prepare_method", "pylabrobot"), ("set_variable_value", "worklist")],
+        )
+        self.assertEqual(backend.pending_operations, 0)
+
+        payload = json.loads(fake_connector(backend).variables["worklist"])
+        self.assertEqual(payload["shared"], {"num_channels": 8})
+        self.assertEqual([step["method"] for step in payload["steps"]], ["pick_up_tips", "aspirate", "dispense"])
+        self.assertEqual([p["volume"] for p in payload["steps"][2]["parameters"]], [10, 20])
+
+        self.assertEqual(backend.batch_stats.batches, 1)
+        self.assertEqual(backend.batch_stats.operations, 4)
+
+    async def test_batch_size_threshold(self):
+        backend = make_offline_backend(batch_mode=True, batch_size=2)
+        await backend.aspirate(self.well, volume=10)
+        self.assertEqual(backend.pending_operations, 1)
+        await backend.dispense(self.well, volume=10)
+        self.assertEqual(backend.pending_operations, 0)
+        self.assertEqual(backend.batch_stats.batches, 1)
+
+    async def test_batch_timeout(self):
+        backend = make_offline_backend(batch_mode=True, batch_timeout=0.01)
+        await backend.aspirate(self.well, volume=10)
+        await asyncio.sleep(0.05)
+        self.assertEqual(backend.pending_operations, 0)
+        self.assertEqual(backend.batch_stats.batches, 1)
+
+    async def test_unrun_batches_are_kept(self):
+        backend = make_offline_backend(batch_mode=True, batch_size=2)
+        for volume in [10, 20, 30, 40]:
+            await backend.aspirate(self.well, volume=volume)
+        self.assertEqual(backend.batch_stats.batches, 2)
+        payload = json.loads(fake_connector(backend).variables["worklist"])
+        self.assertEqual([p["volume"] for p in payload["steps"][0]["parameters"]], [10, 20, 30, 40])
+
+        self.assertTrue(await backend.run_worklist())
+        await backend.aspirate(self.well, volume=50)
+        self.assertTrue(await backend.flush())
+        payload = json.loads(fake_connector(backend).variables["worklist"])
+        self.assertEqual(payload["shared"]["volume"], 50)
+        self.assertEqual(len(payload["steps"][0]["parameters"]), 1)
+
+    async def test_failed_flush_keeps_operations(self):
+        backend = make_offline_backend(batch_mode=True)
+
+        def prepare_method(method_name):
+            raise RuntimeError("prepare failed")
+
+        fake_connector(backend).prepare_method = prepare_method
+        await backend.aspirate(self.well, volume=10)
+        await backend.dispense(self.well, volume=10)
+        self.assertFalse(await backend.flush())
+        self.assertEqual(backend.pending_operations, 2)
+
+    async def test_batch_timeout_failure_is_logged(self):
+        backend = make_offline_backend(batch_mode=True, batch_timeout=0.01)
+
+        def prepare_method(method_name):
+            raise RuntimeError("prepare failed")
+
+        fake_connector(backend).prepare_method = prepare_method
+        with self.assertLogs("FluentBackend", level="ERROR") as logs:
+            await backend.aspirate(self.well, volume=10)
+            await asyncio.sleep(0.05)
+        self.assertIn("still buffered", logs.output[-1])
+        self.assertEqual(backend.pending_operations, 1)
+
+    async def test_stop_runs_batch(self):
+        backend = make_offline_backend(batch_mode=True, batch_size=2)
+        for volume in [10, 20, 30]:
+            await backend.aspirate(self.well, volume=volume)
+        connector = fake_connector(backend)
+        await backend.stop()
+        self.assertEqual(connector.calls[-1], ("run_method",))
+        payload = json.loads(connector.variables["worklist"])
+        self.assertEqual([p["volume"] for p in payload["steps"][0]["parameters"]], [10, 20, 30])
+
+    async def test_stop_warns_about_unrun_operations(self):
+        backend = make_offline_backend(batch_mode=True)
+        run_method = unittest.mock.Mock(side_effect=RuntimeError("run failed"))
+        fake_connector(backend).run_method = run_method
+        await backend.aspirate(self.well, volume=10)
+        with self.assertLogs("FluentBackend", level="WARNING") as logs:
+            await backend.stop()
+        self.assertIn("not run", logs.output[-1])
+
+    async def test_run_worklist_flushes(self):
+        backend = make_offline_backend(batch_mode=True)
+        await backend.aspirate(self.well, volume=10)
+        self.assertTrue(await backend.run_worklist())
+        self.assertEqual(fake_connector(backend).calls[-1], ("run_method",))
+        self.assertEqual(backend.pending_operations, 0)
+
+
+class FluentExecutorTests(unittest.IsolatedAsyncioTestCase):
+    """Tests that blocking connector calls do not block the event loop."""
+
+    async def test_event_loop_not_blocked(self):
+        backend = make_offline_backend()
+        blocking_prepare = fake_connector(backend).prepare_method
+
+        def prepare_method(method_name):
+            time.sleep(0.1)
+            blocking_prepare(method_name)
+
+        fake_connector(backend).prepare_method = prepare_method
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        self.assertTrue(await backend.add_to_worklist("aspirate", {}))
+        task.cancel()
+        self.assertGreater(ticks, 3)
+        await backend.stop()
+
+    async def test_timeout(self):
+        backend = make_offline_backend(operation_timeout=0.01)
+        fake_connector(backend).prepare_method = lambda method_name: time.sleep(0.1)
+        with self.assertRaises(TimeoutError):
+            await backend._run(fake_connector(backend).prepare_method, "aspirate")
+        self.assertFalse(await backend.add_to_worklist("aspirate", {}))
+        await backend.stop()
+
+    async def test_worklist_control_off_event_loop(self):
+        backend = make_offline_backend()
+        connector = fake_connector(backend)
+        threads = []
+        for name in ["clear_worklist", "pause_worklist", "resume_worklist", "stop_worklist"]:
+            setattr(connector, name, lambda: threads.append(threading.current_thread()))
+        self.assertTrue(await backend.clear_worklist())
+        self.assertTrue(await backend.pause_worklist())
+        self.assertTrue(await backend.resume_worklist())
+        self.assertTrue(await backend.stop_worklist())
+        self.assertEqual(len(threads), 4)
+        self.assertNotIn(threading.main_thread(), threads)
+
+        backend.operation_timeout = 0.01
+        fake_connector(backend).pause_worklist = lambda: time.sleep(0.1)
+        self.assertFalse(await backend.pause_worklist())
+        await backend.stop()
+
+    async def test_get_available_methods_async(self):
+        backend = make_offline_backend()
+        threads = []
+
+        def get_all_runnable_methods():
+            threads.append(threading.current_thread())
+            return ["pylabrobot"]
+
+        fake_connector(backend).get_all_runnable_methods = get_all_runnable_methods
+        self.assertEqual(await backend.get_available_methods_async(), ["pylabrobot"])
+        self.assertEqual(await backend.get_available_methods_async(), ["pylabrobot"])
+        self.assertEqual(len(threads), 1)  # cached
+        self.assertNotEqual(threads[0], threading.main_thread())
+        await backend.stop()
+
+    async def test_run_timeout(self):
+        backend = make_offline_backend(operation_timeout=0.01)
+        fake_connector(backend).run_method = lambda: time.sleep(0.05)
+        self.assertTrue(await backend.run_worklist())
+
+        backend.run_timeout = 0.01
+        self.assertFalse(await backend.run_worklist())
+        await backend.stop()
+
+
+class FluentPipelineTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for pipelined worklist execution."""
+
+    def _slow_runs(self, backend: Fluent, run_time: float):
+        connector = fake_connector(backend)
+
+        def run_method():
+            connector.calls.append(("run_method",))
+            time.sleep(run_time)
+            connector.calls.append(("run_done",))
+
+        connector.run_method = run_method
+
+    async def test_run_in_background(self):
+        backend = make_offline_backend(pipelined=True)
+        self._slow_runs(backend, 0.05)
+        start = time.monotonic()
+        await backend.add_to_worklist("a", {"volume": 1})
+        await backend.add_to_worklist("b", {"volume": 2})
+        self.assertLess(time.monotonic() - start, 0.04)
+        self.assertTrue(await backend.run_worklist())
+
+        calls = fake_connector(backend).calls
+        self.assertEqual(calls.count(("run_method",)), 2)
+        # the variables of b are staged in the second set while a runs, b is prepared once a is done
+        self.assertLess(calls.index(("set_variable_value", "volume_1")), calls.index(("run_done",)))
+        self.assertGreater(calls.index(("prepare_method", "b")), calls.index(("run_done",)))
+        self.assertEqual(fake_connector(backend).variables["volume_0"], 1)
+        self.assertEqual(fake_connector(backend).variables["pipeline_buffer"], 1)
+        await backend.stop()
+
+    async def test_backpressure(self):
+        backend = make_offline_backend(pipelined=True, pipeline_depth=1)
+        self._slow_runs(backend, 0.05)
+        start = time.monotonic()
+        for i in range(4):
+            await backend.add_to_worklist(f"m{i}", {})
+        # the last segment can only be queued once the first run finished
+        self.assertGreater(time.monotonic() - start, 0.04)
+        self.assertTrue(await backend.drain_pipeline())
+        await backend.stop()
+
+    async def test_failure_stops_pipeline(self):
+        backend = make_offline_backend(pipelined=True)
+
+        def prepare_method(method_name):
+            if method_name == "b":
+                raise RuntimeError("prepare failed")
+            fake_connector(backend).calls.append(("prepare_method", method_name))
+
+        fake_connector(backend).prepare_method = prepare_method
+        for name in ["a", "b", "c"]:
+            await backend.add_to_worklist(name, {})
+        self.assertFalse(await backend.drain_pipeline())
+        self.assertNotIn(("prepare_method", "c"), fake_connector(backend).calls)
+        self.assertTrue(await backend.add_to_worklist("d", {}))
+        self.assertTrue(await backend.drain_pipeline())
+        await backend.stop()
+
+    async def test_stop_worklist_aborts(self):
+        backend = make_offline_backend(pipelined=True, pipeline_depth=4)
+        self._slow_runs(backend, 0.05)
+        for i in range(4):
+            await backend.add_to_worklist(f"m{i}", {})
+        await asyncio.sleep(0.01)
+        self.assertTrue(await backend.stop_worklist())
+        self.assertTrue(await backend.drain_pipeline())
+        await asyncio.sleep(0.1)
+        self.assertLess(fake_connector(backend).calls.count(("run_method",)), 4)
+        self.assertEqual(fake_connector(backend).calls[-1], ("run_done",))
+        await backend.stop()
+
+    async def test_abort_wakes_blocked_producers(self):
+        backend = make_offline_backend(pipelined=True, pipeline_depth=1)
+        self._slow_runs(backend, 0.05)
+        producers = [
+            asyncio.create_task(backend.add_to_worklist(f"m{i}", {})) for i in range(4)
+        ]
+        await asyncio.sleep(0.01)
+        self.assertTrue(await backend.stop_worklist())
+        results = await asyncio.wait_for(asyncio.gather(*producers), timeout=1)
+        self.assertFalse(results[-1])
+        await backend.stop()
+
+
+class FluentVariableSyncTests(unittest.IsolatedAsyncioTestCase):
+    """Tests that only changed variables are sent to FluentControl."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.well = Resource(name="well", size_x=1, size_y=1, size_z=1)
+
+    async def test_only_changed_variables_are_sent(self):
+        backend = make_offline_backend()
+        connector = fake_connector(backend)
+        await backend.aspirate(self.well, volume=10)
+        connector.calls.clear()
+        await backend.aspirate(self.well, volume=20)
+        self.assertEqual(
+            connector.calls, [("prepare_method", "aspirate"), ("set_variable_value", "volume")]
+        )
+
+    async def test_variables_are_mirrored_per_method(self):
+        backend = make_offline_backend()
+        await backend.aspirate(self.well, volume=10)
+        fake_connector(backend).calls.clear()
+        await backend.dispense(self.well, volume=10)
+        self.assertEqual(fake_connector(backend).calls[0], ("prepare_method", "dispense"))
+        self.assertIn(("set_variable_value", "volume"), fake_connector(backend).calls)
+        self.assertEqual(len(fake_connector(backend).calls), 7)
+
+    async def test_bulk_update(self):
+        backend = make_offline_backend()
+        set_variable_values = unittest.mock.Mock()
+        fake_connector(backend).set_variable_values = set_variable_values
+        await backend.aspirate(self.well, volume=10)
+        await backend.aspirate(self.well, volume=20)
+        self.assertEqual(set_variable_values.call_count, 2)
+        self.assertEqual(set_variable_values.call_args.args[0], {"volume": 20})
+
+    async def test_invalidate_mirror(self):
+        backend = make_offline_backend()
+        await backend.aspirate(self.well, volume=10)
+        fake_connector(backend).calls.clear()
+
+        backend.invalidate_variable_mirror()
+        await backend.aspirate(self.well, volume=10)
+        self.assertEqual(len(fake_connector(backend).calls), 7)
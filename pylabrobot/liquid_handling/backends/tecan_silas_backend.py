@@ -1,4 +1,7 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, cast
 from pylabrobot.liquid_handling.backends.backend import LiquidHandlerBackend
 from pylabrobot.resources import Resource
 
@@ -8,6 +11,20 @@ try:
 except ImportError:
     HAS_TECAN_SILA = False
 
+# operation kind -> FluentControl call that creates a parameterized method for it
+_CREATE_METHODS = {
+    "TipPickup": "create_tip_pickup_method",
+    "TipDrop": "create_tip_drop_method",
+    "Aspiration": "create_aspiration_method",
+    "Dispense": "create_dispense_method",
+    "ResourcePickup": "create_resource_pickup_method",
+    "ResourceMove": "create_resource_move_method",
+    "ResourceDrop": "create_resource_drop_method",
+}
+
+_TERMINAL_METHOD_STATES = ("Completed", "Error", "Aborted")
+
+
 class TecanSiLABackend(LiquidHandlerBackend):
     """A backend that uses Tecan's SiLA 2 connector to control a Tecan Fluent liquid handler."""
 
@@ -17,6 +34,10 @@ class TecanSiLABackend(LiquidHandlerBackend):
         host: str = "localhost",
         port: int = 50051,
         method_name: str = None,  # Name of the FluentControl method to execute
+        method_cache_size: int = 32,
+        poll_interval_min: float = 0.005,
+        poll_interval_max: float = 0.5,
+        connector: Optional[Any] = None,
     ):
         """Create a new TecanSiLA backend.
 
@@ -25,9 +46,18 @@ class TecanSiLABackend(LiquidHandlerBackend):
             host: The hostname where the Tecan SiLA server is running.
             port: The port where the Tecan SiLA server is running.
             method_name: Name of the FluentControl method to execute (optional).
+            method_cache_size: Maximum number of parameterized methods kept in FluentControl for
+                reuse. Methods are created once per operation kind and channel pattern, and
+                evicted least recently used first.
+            poll_interval_min: First interval in seconds between method status polls, used when
+                the connector cannot stream method status. The interval doubles after every poll.
+            poll_interval_max: Maximum interval in seconds between method status polls.
+            connector: FluentControl client to use instead of connecting to the SiLA server, for
+                example a stand-in from :mod:`~pylabrobot.liquid_handling.backends.tecan.fluent_simulator`
+                (optional).
         """
 
-        if not HAS_TECAN_SILA:
+        if connector is None and not HAS_TECAN_SILA:
             raise RuntimeError(
                 "The TecanSiLA backend requires the tecan-fluent-sila2-connector package. "
                 "Please install it from the Tecan Fluent SiLA2 connector distribution."
@@ -38,21 +68,51 @@ class TecanSiLABackend(LiquidHandlerBackend):
         self.host = host
         self.port = port
         self.method_name = method_name
-        self.fluent_control = None
+        self.fluent_control: Optional[Any] = None
+        self._connector = connector
+
+        if method_cache_size <= 0:
+            raise ValueError("method_cache_size must be positive")
+        self.method_cache_size = method_cache_size
+        # (operation kind, channel pattern) -> (method name, last pushed variable values)
+        self._method_cache: "OrderedDict[Tuple[str, Tuple[int, ...]], Tuple[str, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._method_cache_hits = 0
+        self._method_cache_misses = 0
+        self._loaded_method: Optional[str] = None
+
+        if not 0 < poll_interval_min <= poll_interval_max:
+            raise ValueError("poll intervals must be positive and poll_interval_min <= poll_interval_max")
+        self.poll_interval_min = poll_interval_min
+        self.poll_interval_max = poll_interval_max
+        # time in seconds from starting a method until its completion was observed
+        self.completion_latencies: Deque[float] = deque(maxlen=100)
 
     @property
     def num_channels(self) -> int:
         return self._num_channels
 
+    def _get_fluent_control(self) -> Any:
+        """The FluentControl client, raising if the backend is not set up."""
+        if self.fluent_control is None:
+            raise RuntimeError("TecanSiLA backend not initialized. Call setup() first.")
+        return self.fluent_control
+
     async def setup(self):
         """Set up the connection to the Tecan SiLA server and initialize FluentControl."""
         await super().setup()
+        self.clear_method_cache()
         # Connect to the Tecan SiLA server
-        self.fluent_control = FluentControl(
-            host=self.host,
-            port=self.port
-        )
-        await self.fluent_control.connect()
+        if self._connector is not None:
+            fluent_control = self._connector
+        else:
+            fluent_control = FluentControl(
+                host=self.host,
+                port=self.port
+            )
+        self.fluent_control = fluent_control
+        await fluent_control.connect()
 
         # Initialize FluentControl if a method is specified
         if self.method_name:
@@ -63,28 +123,142 @@ class TecanSiLABackend(LiquidHandlerBackend):
         if self.fluent_control:
             await self.fluent_control.disconnect()
             self.fluent_control = None
+        self.clear_method_cache()
 
     async def load_method(self, method_name: str):
         """Load a FluentControl method."""
-        await self.fluent_control.load_method(method_name)
+        await self._get_fluent_control().load_method(method_name)
+        self._loaded_method = method_name
+
+    def clear_method_cache(self):
+        """Forget all cached methods. They will be recreated on next use."""
+        self._method_cache.clear()
+        self._method_cache_hits = 0
+        self._method_cache_misses = 0
+        self._loaded_method = None
+
+    def method_cache_info(self) -> Dict[str, int]:
+        """Hits, misses and current size of the method cache."""
+        return {
+            "hits": self._method_cache_hits,
+            "misses": self._method_cache_misses,
+            "size": len(self._method_cache),
+            "max_size": self.method_cache_size,
+        }
+
+    @staticmethod
+    def _method_variables(positions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Flatten positions into the variables of a parameterized method: `<field>_<index>`."""
+        return {
+            f"{field}_{i}": value
+            for i, position in enumerate(positions)
+            for field, value in position.items()
+        }
+
+    async def _run_cached_method(
+        self,
+        kind: str,
+        positions: List[Dict[str, Any]],
+        use_channels: Optional[Sequence[int]] = None,
+    ):
+        """Run a parameterized method for an operation, creating it only if it is not cached.
+
+        On a cache hit, only the variables whose values changed since the method last ran are
+        pushed to FluentControl, and the method is only loaded if another method was loaded since.
+
+        Args:
+            kind: Operation kind, e.g. `"Aspiration"`. The method is created with
+                `fluent_control.create_<kind>_method`.
+            positions: One dictionary of method parameters per position.
+            use_channels: The channels used for the operation. Defaults to the first
+                `len(positions)` channels.
+        """
+        fluent_control = self._get_fluent_control()
+        channels = tuple(use_channels) if use_channels is not None else tuple(range(len(positions)))
+        key = (kind, channels)
+        variables = self._method_variables(positions)
+
+        if key in self._method_cache:
+            self._method_cache_hits += 1
+            self._method_cache.move_to_end(key)
+            method_name, pushed = self._method_cache[key]
+            if self._loaded_method != method_name:
+                await self.load_method(method_name)
+            for name, value in variables.items():
+                if pushed.get(name) != value:
+                    await fluent_control.set_variable_value(name, value)
+                    pushed[name] = value
+        else:
+            self._method_cache_misses += 1
+            method_name = f"{kind}_" + "_".join(str(c) for c in channels)
+            create_method = getattr(fluent_control, _CREATE_METHODS[kind])
+            await create_method(method_name=method_name, positions=positions)
+            self._method_cache[key] = (method_name, variables)
+            if len(self._method_cache) > self.method_cache_size:
+                _, (evicted, _) = self._method_cache.popitem(last=False)
+                if hasattr(fluent_control, "delete_method"):
+                    await fluent_control.delete_method(evicted)
+            await self.load_method(method_name)
+
+        await self.execute_method()
 
     async def execute_method(self, method_id: str = None):
         """Execute a loaded FluentControl method."""
+        fluent_control = self._get_fluent_control()
         if method_id is None:
-            method_id = await self.fluent_control.get_current_method_id()
+            method_id = await fluent_control.get_current_method_id()
         if method_id is None:
             raise RuntimeError("No method loaded. Call load_method first.")
 
-        await self.fluent_control.execute_method(method_id)
+        start = time.monotonic()
+        await fluent_control.execute_method(method_id)
+        state = await self._wait_for_method(method_id)
+        self.completion_latencies.append(time.monotonic() - start)
+
+        if state != "Completed":
+            raise RuntimeError(f"Method execution failed: {state}")
+
+    async def _wait_for_method(self, method_id: str) -> str:
+        """Wait until a method reaches a terminal state and return that state.
+
+        If the connector supports it, the method status is streamed with
+        `subscribe_method_status` (an observable SiLA property). Otherwise, or if the stream ends
+        before the method does, the status is polled with an exponentially increasing interval
+        from `poll_interval_min` up to `poll_interval_max`.
+        """
+        fluent_control = self._get_fluent_control()
+        if hasattr(fluent_control, "subscribe_method_status"):
+            async for status in fluent_control.subscribe_method_status(method_id):
+                if status.state in _TERMINAL_METHOD_STATES:
+                    return cast(str, status.state)
 
-        # Wait for method completion
+        interval = self.poll_interval_min
         while True:
-            status = await self.fluent_control.get_method_status(method_id)
-            if status.state in ["Completed", "Error", "Aborted"]:
-                if status.state != "Completed":
-                    raise RuntimeError(f"Method execution failed: {status.state}")
-                break
-            await asyncio.sleep(1)
+            status = await fluent_control.get_method_status(method_id)
+            if status.state in _TERMINAL_METHOD_STATES:
+                return cast(str, status.state)
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, self.poll_interval_max)
+
+    @property
+    def mean_completion_latency(self) -> float:
+        """Mean time in seconds from starting a method until its completion was observed, over
+        the last 100 methods."""
+        if not self.completion_latencies:
+            return 0.0
+        return sum(self.completion_latencies) / len(self.completion_latencies)
+
+    async def pick_up_tips96(self, pickup, **backend_kwargs):
+        raise NotImplementedError("The 96 head is not supported by the TecanSiLA backend.")
+
+    async def drop_tips96(self, drop, **backend_kwargs):
+        raise NotImplementedError("The 96 head is not supported by the TecanSiLA backend.")
+
+    async def aspirate96(self, aspiration, **backend_kwargs):
+        raise NotImplementedError("The 96 head is not supported by the TecanSiLA backend.")
+
+    async def dispense96(self, dispense, **backend_kwargs):
+        raise NotImplementedError("The 96 head is not supported by the TecanSiLA backend.")
 
     def serialize(self) -> dict:
         return {
@@ -103,22 +277,16 @@ class TecanSiLABackend(LiquidHandlerBackend):
         # Convert PyLabRobot operations to FluentControl commands
         tip_positions = []
         for op in ops:
-            for tip in op.tips:
-                pos = tip.get_absolute_location()
-                tip_positions.append({
-                    "carrier": tip.parent.name,  # Assuming this matches FluentControl carrier name
-                    "position": f"{pos.x:.1f},{pos.y:.1f},{pos.z:.1f}",
-                    "site": tip.get_name()  # e.g., "A1"
-                })
-
-        # Create and execute a tip pickup method
-        method_name = "TipPickup"
-        await self.fluent_control.create_tip_pickup_method(
-            method_name=method_name,
-            positions=tip_positions
+            pos = op.resource.get_absolute_location()
+            tip_positions.append({
+                "carrier": op.resource.parent.name,  # Assuming this matches FluentControl carrier name
+                "position": f"{pos.x:.1f},{pos.y:.1f},{pos.z:.1f}",
+                "site": op.resource.name
+            })
+
+        await self._run_cached_method(
+            "TipPickup", tip_positions, use_channels=backend_kwargs.get("use_channels")
         )
-        await self.load_method(method_name)
-        await self.execute_method()
 
     async def drop_tips(self, ops: List["Drop"], **backend_kwargs):
         """Drop tips using FluentControl."""
@@ -128,22 +296,16 @@ class TecanSiLABackend(LiquidHandlerBackend):
         # Convert PyLabRobot operations to FluentControl commands
         tip_positions = []
         for op in ops:
-            for tip in op.tips:
-                pos = tip.get_absolute_location()
-                tip_positions.append({
-                    "carrier": tip.parent.name,
-                    "position": f"{pos.x:.1f},{pos.y:.1f},{pos.z:.1f}",
-                    "site": tip.get_name()
-                })
-
-        # Create and execute a tip drop method
-        method_name = "TipDrop"
-        await self.fluent_control.create_tip_drop_method(
-            method_name=method_name,
-            positions=tip_positions
+            pos = op.resource.get_absolute_location()
+            tip_positions.append({
+                "carrier": op.resource.parent.name,
+                "position": f"{pos.x:.1f},{pos.y:.1f},{pos.z:.1f}",
+                "site": op.resource.name
+            })
+
+        await self._run_cached_method(
+            "TipDrop", tip_positions, use_channels=backend_kwargs.get("use_channels")
         )
-        await self.load_method(method_name)
-        await self.execute_method()
 
     async def aspirate(self, ops: List["SingleChannelAspiration"], **backend_kwargs):
         """Aspirate liquid using FluentControl."""
@@ -157,21 +319,16 @@ class TecanSiLABackend(LiquidHandlerBackend):
             aspirate_positions.append({
                 "carrier": op.resource.parent.name,
                 "position": f"{pos.x:.1f},{pos.y:.1f},{pos.z:.1f}",
-                "site": op.resource.get_name(),
+                "site": op.resource.name,
                 "volume": op.volume,
                 "liquid_class": backend_kwargs.get("liquid_class", "Water"),  # Default to water
                 "liquid_height": op.liquid_height,
                 "flow_rate": op.flow_rate
             })
 
-        # Create and execute an aspiration method
-        method_name = "Aspiration"
-        await self.fluent_control.create_aspiration_method(
-            method_name=method_name,
-            positions=aspirate_positions
+        await self._run_cached_method(
+            "Aspiration", aspirate_positions, use_channels=backend_kwargs.get("use_channels")
         )
-        await self.load_method(method_name)
-        await self.execute_method()
 
     async def dispense(self, ops: List["SingleChannelDispense"], **backend_kwargs):
         """Dispense liquid using FluentControl."""
@@ -185,21 +342,16 @@ class TecanSiLABackend(LiquidHandlerBackend):
             dispense_positions.append({
                 "carrier": op.resource.parent.name,
                 "position": f"{pos.x:.1f},{pos.y:.1f},{pos.z:.1f}",
-                "site": op.resource.get_name(),
+                "site": op.resource.name,
                 "volume": op.volume,
                 "liquid_class": backend_kwargs.get("liquid_class", "Water"),
                 "liquid_height": op.liquid_height,
                 "flow_rate": op.flow_rate
             })
 
-        # Create and execute a dispense method
-        method_name = "Dispense"
-        await self.fluent_control.create_dispense_method(
-            method_name=method_name,
-            positions=dispense_positions
+        await self._run_cached_method(
+            "Dispense", dispense_positions, use_channels=backend_kwargs.get("use_channels")
         )
-        await self.load_method(method_name)
-        await self.execute_method()
 
     async def pick_up_resource(self, ops: List["ResourcePickup"], **backend_kwargs):
         """Pick up a resource using FluentControl."""
@@ -213,17 +365,10 @@ class TecanSiLABackend(LiquidHandlerBackend):
             resource_positions.append({
                 "carrier": op.resource.parent.name,
                 "position": f"{pos.x:.1f},{pos.y:.1f},{pos.z:.1f}",
-                "site": op.resource.get_name()
+                "site": op.resource.name
             })
 
-        # Create and execute a resource pickup method
-        method_name = "ResourcePickup"
-        await self.fluent_control.create_resource_pickup_method(
-            method_name=method_name,
-            positions=resource_positions
-        )
-        await self.load_method(method_name)
-        await self.execute_method()
+        await self._run_cached_method("ResourcePickup", resource_positions)
 
     async def move_picked_up_resource(self, ops: List["ResourceMove"], **backend_kwargs):
         """Move a picked up resource using FluentControl."""
@@ -237,17 +382,10 @@ class TecanSiLABackend(LiquidHandlerBackend):
             resource_positions.append({
                 "carrier": op.resource.parent.name,
                 "position": f"{pos.x:.1f},{pos.y:.1f},{pos.z:.1f}",
-                "site": op.resource.get_name()
+                "site": op.resource.name
             })
 
-        # Create and execute a resource move method
-        method_name = "ResourceMove"
-        await self.fluent_control.create_resource_move_method(
-            method_name=method_name,
-            positions=resource_positions
-        )
-        await self.load_method(method_name)
-        await self.execute_method()
+        await self._run_cached_method("ResourceMove", resource_positions)
 
     async def drop_resource(self, ops: List["ResourceDrop"], **backend_kwargs):
         """Drop a resource using FluentControl."""
@@ -261,14 +399,7 @@ class TecanSiLABackend(LiquidHandlerBackend):
             resource_positions.append({
                 "carrier": op.resource.parent.name,
                 "position": f"{pos.x:.1f},{pos.y:.1f},{pos.z:.1f}",
-                "site": op.resource.get_name()
+                "site": op.resource.name
             })
 
-        # Create and execute a resource drop method
-        method_name = "ResourceDrop"
-        await self.fluent_control.create_resource_drop_method(
-            method_name=method_name,
-            positions=resource_positions
-        )
-        await self.load_method(method_name)
-        await self.execute_method()
\ No newline at end of file
+        await self._run_cached_method("ResourceDrop", resource_positions)
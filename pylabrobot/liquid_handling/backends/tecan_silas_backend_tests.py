@@ -0,0 +1,97 @@
+import unittest
+import unittest.mock
+
+from pylabrobot.liquid_handling.backends.tecan_silas_backend import TecanSiLABackend
+from pylabrobot.liquid_handling.standard import SingleChannelAspiration
+from pylabrobot.resources import Coordinate, Cor_96_wellplate_360ul_Fb
+
+
+class TecanSiLABackendMethodCacheTests(unittest.IsolatedAsyncioTestCase):
+  """Test that parameterized FluentControl methods are created once and reused."""
+
+  def setUp(self) -> None:
+    super().setUp()
+    with unittest.mock.patch(
+      "pylabrobot.liquid_handling.backends.tecan_silas_backend.HAS_TECAN_SILA", True
+    ):
+      self.backend = TecanSiLABackend(num_channels=8, method_cache_size=2)
+    self.fluent_control = unittest.mock.AsyncMock()
+    del self.fluent_control.subscribe_method_status  # poll instead
+    self.fluent_control.get_method_status.return_value = unittest.mock.Mock(state="Completed")
+    self.backend.fluent_control = self.fluent_control
+    self.plate = Cor_96_wellplate_360ul_Fb(name="plate")
+    self.plate.location = Coordinate.zero()
+
+  def _aspiration(self, well: str, volume: float) -> SingleChannelAspiration:
+    return SingleChannelAspiration(
+      resource=self.plate.get_item(well),
+      offset=Coordinate.zero(),
+      tip=unittest.mock.Mock(),
+      volume=volume,
+      flow_rate=None,
+      liquid_height=None,
+      blow_out_air_volume=None,
+      liquids=[],
+    )
+
+  async def test_method_created_once(self):
+    await self.backend.aspirate([self._aspiration("A1", 10)], use_channels=[0])
+    await self.backend.aspirate([self._aspiration("A1", 20)], use_channels=[0])
+
+    fluent_control = self.fluent_control
+    fluent_control.create_aspiration_method.assert_called_once()
+    fluent_control.load_method.assert_called_once_with("Aspiration_0")
+    fluent_control.set_variable_value.assert_called_once_with("volume_0", 20)
+    self.assertEqual(fluent_control.execute_method.call_count, 2)
+    self.assertEqual(self.backend.method_cache_info()["hits"], 1)
+
+  async def test_channel_pattern_is_part_of_key(self):
+    await self.backend.aspirate([self._aspiration("A1", 10)], use_channels=[0])
+    await self.backend.aspirate([self._aspiration("A1", 10)], use_channels=[1])
+    self.assertEqual(self.fluent_control.create_aspiration_method.call_count, 2)
+    self.assertEqual(self.backend.method_cache_info()["misses"], 2)
+
+  async def test_lru_eviction(self):
+    for channel in [0, 1, 0, 2, 1]:
+      await self.backend.aspirate([self._aspiration("A1", 10)], use_channels=[channel])
+    # 0 and 1 are created, 0 is reused, 2 evicts 1, so 1 is created again.
+    self.assertEqual(self.fluent_control.create_aspiration_method.call_count, 4)
+    self.assertEqual(self.backend.method_cache_info()["size"], 2)
+
+
+class TecanSiLABackendMethodCompletionTests(unittest.IsolatedAsyncioTestCase):
+  """Test waiting for FluentControl methods to complete."""
+
+  def setUp(self) -> None:
+    super().setUp()
+    with unittest.mock.patch(
+      "pylabrobot.liquid_handling.backends.tecan_silas_backend.HAS_TECAN_SILA", True
+    ):
+      self.backend = TecanSiLABackend(num_channels=8, poll_interval_min=0.001)
+    self.fluent_control = unittest.mock.AsyncMock()
+    self.backend.fluent_control = self.fluent_control
+
+  async def test_subscription(self):
+    async def subscribe_method_status(method_id):
+      for state in ["Running", "Running", "Completed"]:
+        yield unittest.mock.Mock(state=state)
+
+    self.fluent_control.subscribe_method_status = subscribe_method_status
+    await self.backend.execute_method("method")
+    self.fluent_control.get_method_status.assert_not_called()
+    self.assertEqual(len(self.backend.completion_latencies), 1)
+
+  async def test_polling_backoff(self):
+    del self.fluent_control.subscribe_method_status
+    self.fluent_control.get_method_status.side_effect = [
+      unittest.mock.Mock(state=state) for state in ["Running", "Running", "Running", "Completed"]
+    ]
+    with unittest.mock.patch("asyncio.sleep") as sleep:
+      await self.backend.execute_method("method")
+    self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.001, 0.002, 0.004])
+
+  async def test_failure(self):
+    del self.fluent_control.subscribe_method_status
+    self.fluent_control.get_method_status.return_value = unittest.mock.Mock(state="Error")
+    with self.assertRaises(RuntimeError):
+      await self.backend.execute_method("method")
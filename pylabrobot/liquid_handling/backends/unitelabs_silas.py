@@ -1,6 +1,8 @@
-from typing import Any, Dict, List, Optional, cast
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, cast
 from pylabrobot.liquid_handling.backends.backend import LiquidHandlerBackend
-from pylabrobot.resources import Resource
+from pylabrobot.liquid_handling.errors import ChannelizedError
+from pylabrobot.resources import Coordinate, Resource
 
 try:
     import unitelabs.silas  # type: ignore
@@ -16,6 +18,9 @@ class UnitelabsSilasBackend(LiquidHandlerBackend):
         num_channels: int,
         host: str = "localhost",
         port: int = 50051,
+        connector: Optional[Any] = None,
+        multi_channel_requests: bool = True,
+        max_in_flight: int = 8,
     ):
         """Create a new UnitelabsSilas backend.
 
@@ -23,16 +28,28 @@ class UnitelabsSilasBackend(LiquidHandlerBackend):
             num_channels: The number of channels on the liquid handler.
             host: The hostname where the SiLA server is running.
             port: The port where the SiLA server is running.
+            connector: Client to use instead of connecting to the SiLA server, for example a
+                stand-in from :mod:`~pylabrobot.liquid_handling.backends.tecan.fluent_simulator`
+                (optional).
+            multi_channel_requests: Whether the server accepts the positions of all channels in a
+                single tip pickup or drop request. If not, one request is sent per channel.
+            max_in_flight: Maximum number of per-channel requests that are sent concurrently when
+                `multi_channel_requests` is `False`.
         """
 
-        if not HAS_SILAS:
+        if connector is None and not HAS_SILAS:
             raise RuntimeError("The UnitelabsSilas backend requires the unitelabs.silas package.")
+        if max_in_flight <= 0:
+            raise ValueError("max_in_flight must be positive")
 
         super().__init__()
         self._num_channels = num_channels
         self.host = host
         self.port = port
-        self.client = None
+        self.client: Optional[Any] = None
+        self._connector = connector
+        self.multi_channel_requests = multi_channel_requests
+        self.max_in_flight = max_in_flight
 
     @property
     def num_channels(self) -> int:
@@ -41,7 +58,10 @@ class UnitelabsSilasBackend(LiquidHandlerBackend):
     async def setup(self):
         """Set up the connection to the SiLA server."""
         await super().setup()
-        self.client = unitelabs.silas.TecanFluentClient(self.host, self.port)
+        if self._connector is not None:
+            self.client = self._connector
+        else:
+            self.client = unitelabs.silas.TecanFluentClient(self.host, self.port)
         await self.client.connect()
 
     async def stop(self):
@@ -50,6 +70,18 @@ class UnitelabsSilasBackend(LiquidHandlerBackend):
             await self.client.disconnect()
             self.client = None
 
+    async def pick_up_tips96(self, pickup, **backend_kwargs):
+        raise NotImplementedError("The 96 head is not supported by the UnitelabsSilas backend.")
+
+    async def drop_tips96(self, drop, **backend_kwargs):
+        raise NotImplementedError("The 96 head is not supported by the UnitelabsSilas backend.")
+
+    async def aspirate96(self, aspiration, **backend_kwargs):
+        raise NotImplementedError("The 96 head is not supported by the UnitelabsSilas backend.")
+
+    async def dispense96(self, dispense, **backend_kwargs):
+        raise NotImplementedError("The 96 head is not supported by the UnitelabsSilas backend.")
+
     def serialize(self) -> dict:
         return {
             **super().serialize(),
@@ -58,25 +90,68 @@ class UnitelabsSilasBackend(LiquidHandlerBackend):
             "port": self.port
         }
 
+    async def _dispatch_channels(
+        self,
+        command: Callable[[List[Coordinate]], Awaitable[Any]],
+        positions: List[Coordinate],
+        use_channels: Optional[Sequence[int]] = None,
+    ):
+        """Send a command for the positions of multiple channels.
+
+        If `multi_channel_requests` is set, all positions are sent in one request. The server may
+        answer with one result per position, in which case results that are exceptions are failures
+        of the respective channel. If the request itself fails, it failed for all channels.
+        Otherwise, one request per channel is sent, at most `max_in_flight` at a time.
+
+        Raises:
+            ChannelizedError: If the command failed for some channels, keyed by channel.
+        """
+        channels = list(use_channels) if use_channels is not None else list(range(len(positions)))
+
+        results: List[Any]
+        if self.multi_channel_requests:
+            try:
+                response = await command(positions)
+            except Exception as e:
+                raise ChannelizedError(errors={channel: e for channel in channels}) from e
+            per_position = isinstance(response, list) and len(response) == len(positions)
+            results = response if per_position else []
+        else:
+            semaphore = asyncio.Semaphore(self.max_in_flight)
+
+            async def send(position: Coordinate):
+                async with semaphore:
+                    return await command([position])
+
+            results = await asyncio.gather(*(send(p) for p in positions), return_exceptions=True)
+
+        errors = {
+            channel: result
+            for channel, result in zip(channels, results)
+            if isinstance(result, Exception)
+        }
+        if errors:
+            raise ChannelizedError(errors=errors)
+
     async def pick_up_tips(self, ops: List["Pickup"], **backend_kwargs):
         """Pick up tips using the SiLA server."""
         if not self.client:
             raise RuntimeError("Backend not set up. Did you call setup()?")
 
-        # Convert PyLabRobot operations to SiLA commands
-        for op in ops:
-            tip_positions = [tip.get_absolute_location() for tip in op.tips]
-            await self.client.pick_up_tips(tip_positions)
+        tip_positions = [op.resource.get_absolute_location() for op in ops]
+        await self._dispatch_channels(
+            self.client.pick_up_tips, tip_positions, use_channels=backend_kwargs.get("use_channels")
+        )
 
     async def drop_tips(self, ops: List["Drop"], **backend_kwargs):
         """Drop tips using the SiLA server."""
         if not self.client:
             raise RuntimeError("Backend not set up. Did you call setup()?")
 
-        # Convert PyLabRobot operations to SiLA commands
-        for op in ops:
-            tip_positions = [tip.get_absolute_location() for tip in op.tips]
-            await self.client.drop_tips(tip_positions)
+        tip_positions = [op.resource.get_absolute_location() for op in ops]
+        await self._dispatch_channels(
+            self.client.drop_tips, tip_positions, use_channels=backend_kwargs.get("use_channels")
+        )
 
     async def aspirate(self, ops: List["SingleChannelAspiration"], **backend_kwargs):
         """Aspirate liquid using the SiLA server."""
@@ -91,7 +166,7 @@ class UnitelabsSilasBackend(LiquidHandlerBackend):
                 volume=op.volume,
                 flow_rate=op.flow_rate,
                 liquid_height=op.liquid_height,
-                blow_out=op.blow_out
+                blow_out_air_volume=op.blow_out_air_volume
             )
 
     async def dispense(self, ops: List["SingleChannelDispense"], **backend_kwargs):
@@ -107,7 +182,7 @@ class UnitelabsSilasBackend(LiquidHandlerBackend):
                 volume=op.volume,
                 flow_rate=op.flow_rate,
                 liquid_height=op.liquid_height,
-                blow_out=op.blow_out
+                blow_out_air_volume=op.blow_out_air_volume
             )
 
     async def pick_up_resource(self, ops: List["ResourcePickup"], **backend_kwargs):
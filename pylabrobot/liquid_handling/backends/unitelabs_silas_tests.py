@@ -0,0 +1,71 @@
+import asyncio
+import unittest
+import unittest.mock
+
+from pylabrobot.liquid_handling.backends.unitelabs_silas import UnitelabsSilasBackend
+from pylabrobot.liquid_handling.errors import ChannelizedError
+from pylabrobot.liquid_handling.standard import Pickup
+from pylabrobot.resources import HTF, Coordinate
+
+
+class UnitelabsSilasBackendTipTests(unittest.IsolatedAsyncioTestCase):
+  """Test dispatching tip pickups for multiple channels."""
+
+  def setUp(self) -> None:
+    super().setUp()
+    self.tip_rack = HTF(name="tip_rack")
+    self.tip_rack.location = Coordinate.zero()
+    self.ops = [
+      Pickup(resource=spot, offset=Coordinate.zero(), tip=spot.get_tip())
+      for spot in self.tip_rack.get_items(["A1", "B1", "C1", "D1"])
+    ]
+
+  def _backend(self, **kwargs) -> UnitelabsSilasBackend:
+    self.client = unittest.mock.AsyncMock()
+    backend = UnitelabsSilasBackend(num_channels=8, connector=self.client, **kwargs)
+    backend.client = self.client
+    return backend
+
+  async def test_multi_channel_request(self):
+    backend = self._backend()
+    await backend.pick_up_tips(self.ops, use_channels=[0, 1, 2, 3])
+    self.client.pick_up_tips.assert_called_once()
+    self.assertEqual(len(self.client.pick_up_tips.call_args.args[0]), 4)
+
+  async def test_multi_channel_request_per_position_errors(self):
+    backend = self._backend()
+    error = RuntimeError("no tip")
+    self.client.pick_up_tips.return_value = [None, error, None, None]
+    with self.assertRaises(ChannelizedError) as ctx:
+      await backend.pick_up_tips(self.ops, use_channels=[4, 5, 6, 7])
+    self.assertEqual(ctx.exception.errors, {5: error})
+
+  async def test_multi_channel_request_failure(self):
+    backend = self._backend()
+    error = RuntimeError("connection lost")
+    self.client.pick_up_tips.side_effect = error
+    with self.assertRaises(ChannelizedError) as ctx:
+      await backend.pick_up_tips(self.ops, use_channels=[4, 5, 6, 7])
+    self.assertEqual(ctx.exception.errors, {4: error, 5: error, 6: error, 7: error})
+
+  async def test_concurrent_requests(self):
+    backend = self._backend(multi_channel_requests=False, max_in_flight=2)
+    in_flight = 0
+    max_seen = 0
+    error = RuntimeError("no tip")
+
+    async def pick_up_tips(positions):
+      nonlocal in_flight, max_seen
+      in_flight += 1
+      max_seen = max(max_seen, in_flight)
+      await asyncio.sleep(0.01)
+      in_flight -= 1
+      if positions[0] == self.ops[2].resource.get_absolute_location():
+        raise error
+
+    self.client.pick_up_tips.side_effect = pick_up_tips
+    with self.assertRaises(ChannelizedError) as ctx:
+      await backend.pick_up_tips(self.ops, use_channels=[0, 1, 2, 3])
+    self.assertEqual(self.client.pick_up_tips.call_count, 4)
+    self.assertEqual(max_seen, 2)
+    self.assertEqual(ctx.exception.errors, {2: error})
@@ -13,8 +13,10 @@ from typing import (
   Any,
   Callable,
   Dict,
+  FrozenSet,
   List,
   Literal,
+  NamedTuple,
   Optional,
   Protocol,
   Sequence,
@@ -25,10 +27,12 @@ from typing import (
 )
 
 from pylabrobot.liquid_handling.errors import ChannelizedError
+from pylabrobot.liquid_handling.operation_graph import OperationGraph
 from pylabrobot.liquid_handling.strictness import (
   Strictness,
   get_strictness,
 )
+from pylabrobot.liquid_handling.transfer_planner import TransferPlan, plan_transfer
 from pylabrobot.liquid_handling.utils import (
   get_tight_single_resource_liquid_op_offsets,
   get_wide_single_resource_liquid_op_offsets,
@@ -59,6 +63,7 @@ from pylabrobot.resources import (
 )
 from pylabrobot.resources.errors import CrossContaminationError, HasTipError
 from pylabrobot.resources.liquid import Liquid
+from pylabrobot.resources.liquid_history import LiquidHistory
 from pylabrobot.resources.rotation import Rotation
 from pylabrobot.tilting.tilter import Tilter
 
@@ -86,6 +91,10 @@ logger = logging.getLogger("pylabrobot")
 def check_contaminated(liquid_history_tip, liquid_history_well):
   """Helper function used to check if adding a liquid to the container
   would result in cross contamination"""
+  if isinstance(liquid_history_tip, LiquidHistory) and isinstance(
+    liquid_history_well, LiquidHistory
+  ):
+    return liquid_history_tip.bits & ~liquid_history_well.bits != 0
   return not liquid_history_tip.issubset(liquid_history_well) and len(liquid_history_tip) > 0
 
 
@@ -102,6 +111,14 @@ class BlowOutVolumeError(Exception):
   pass
 
 
+class _BackendSignature(NamedTuple):
+  """The arguments of a backend method, as analysed by `LiquidHandler._check_args`."""
+
+  args: FrozenSet[str]  # named arguments, excluding the default arguments
+  non_default: FrozenSet[str]  # named arguments without a default value
+  accepts_kwargs: bool  # whether the method accepts **kwargs
+
+
 class LiquidHandler(Resource, Machine):
   """
   Front end for liquid handlers.
@@ -144,6 +161,10 @@ class LiquidHandler(Resource, Machine):
     self.backend: LiquidHandlerBackend = backend  # fix type
     self._callbacks: Dict[str, OperationCallback] = {}
 
+    # backend method signatures analysed by `_check_args`, valid for `_signature_cache_backend`
+    self._signature_cache: Dict[Tuple[Any, FrozenSet[str]], _BackendSignature] = {}
+    self._signature_cache_backend: Optional[LiquidHandlerBackend] = None
+
     self.deck = deck
     # register callbacks for sending resource assignment/unassignment to backend
     self.deck.register_did_assign_resource_callback(self._send_assigned_resource_to_backend)
@@ -152,6 +173,7 @@ class LiquidHandler(Resource, Machine):
     self.head: Dict[int, TipTracker] = {}
     self.head96: Dict[int, TipTracker] = {}
     self._default_use_channels: Optional[List[int]] = None
+    self._operation_graph: Optional[OperationGraph] = None
 
     self._blow_out_air_volume: Optional[List[Optional[float]]] = None
 
@@ -301,37 +323,18 @@ class LiquidHandler(Resource, Machine):
       The set of arguments that need to be removed from `backend_kwargs` before passing to `method`.
     """
 
-    default_args = default.union({"self"})
-
-    sig = inspect.signature(method)
-    args = {arg: param for arg, param in sig.parameters.items() if arg not in default_args}
-    vars_keyword = {
-      arg
-      for arg, param in sig.parameters.items()  # **kwargs
-      if param.kind == inspect.Parameter.VAR_KEYWORD
-    }
-    args = {
-      arg: param
-      for arg, param in args.items()  # keep only *args and **kwargs
-      if param.kind
-      not in {
-        inspect.Parameter.VAR_POSITIONAL,
-        inspect.Parameter.VAR_KEYWORD,
-      }
-    }
-    non_default = {arg for arg, param in args.items() if param.default == inspect.Parameter.empty}
-
+    signature = self._get_backend_signature(method, default)
     backend_kws = set(backend_kwargs.keys())
 
-    missing = non_default - backend_kws
+    missing = signature.non_default - backend_kws
     if len(missing) > 0:
       raise TypeError(f"Missing arguments to backend.{method.__name__}: {missing}")
 
-    if len(vars_keyword) > 0:
+    if signature.accepts_kwargs:
       return set()  # no extra arguments if the method accepts **kwargs
 
-    extra = backend_kws - set(args.keys())
-    if len(extra) > 0 and len(vars_keyword) == 0:
+    extra = backend_kws - signature.args
+    if len(extra) > 0:
       if strictness == Strictness.STRICT:
         raise TypeError(f"Extra arguments to backend.{method.__name__}: {extra}")
       elif strictness == Strictness.WARN:
@@ -341,6 +344,45 @@ class LiquidHandler(Resource, Machine):
 
     return extra
 
+  def _get_backend_signature(self, method: Callable, default: Set[str]) -> _BackendSignature:
+    """Analyse the signature of a backend method, caching the result until the backend changes."""
+
+    if self._signature_cache_backend is not self.backend:
+      self._signature_cache.clear()
+      self._signature_cache_backend = self.backend
+
+    # key on the underlying function, so that a method patched on the backend is analysed again
+    key = (getattr(method, "__func__", method), frozenset(default))
+    signature = self._signature_cache.get(key)
+    if signature is not None:
+      return signature
+
+    default_args = default.union({"self"})
+    sig = inspect.signature(method)
+    args = {arg: param for arg, param in sig.parameters.items() if arg not in default_args}
+    accepts_kwargs = any(
+      param.kind == inspect.Parameter.VAR_KEYWORD  # **kwargs
+      for param in sig.parameters.values()
+    )
+    args = {
+      arg: param
+      for arg, param in args.items()  # keep only *args and **kwargs
+      if param.kind
+      not in {
+        inspect.Parameter.VAR_POSITIONAL,
+        inspect.Parameter.VAR_KEYWORD,
+      }
+    }
+    signature = _BackendSignature(
+      args=frozenset(args),
+      non_default=frozenset(
+        arg for arg, param in args.items() if param.default == inspect.Parameter.empty
+      ),
+      accepts_kwargs=accepts_kwargs,
+    )
+    self._signature_cache[key] = signature
+    return signature
+
   def _make_sure_channels_exist(self, channels: List[int]):
     """Checks that the channels exist."""
     invalid_channels = [c for c in channels if c not in self.head]
@@ -403,6 +445,16 @@ class LiquidHandler(Resource, Machine):
     if len(not_tip_spots) > 0:
       raise TypeError(f"Resources must be `TipSpot`s, got {not_tip_spots}")
 
+    if self._operation_graph is not None:
+      self._operation_graph.add(
+        "pick_up_tips",
+        tip_spots,
+        use_channels or self._default_use_channels,
+        offsets=offsets,
+        **backend_kwargs,
+      )
+      return
+
     # fix arguments
     if use_channels is None:
       if self._default_use_channels is None:
@@ -528,6 +580,17 @@ class LiquidHandler(Resource, Machine):
     if len(not_tip_spots) > 0:
       raise TypeError(f"Resources must be `TipSpot`s or Trash, got {not_tip_spots}")
 
+    if self._operation_graph is not None:
+      self._operation_graph.add(
+        "drop_tips",
+        tip_spots,
+        use_channels or self._default_use_channels,
+        offsets=offsets,
+        allow_nonzero_volume=allow_nonzero_volume,
+        **backend_kwargs,
+      )
+      return
+
     # fix arguments
     if use_channels is None:
       if self._default_use_channels is None:
@@ -633,6 +696,8 @@ class LiquidHandler(Resource, Machine):
       RuntimeError: If no tips have been picked up.
     """
 
+    self._check_not_planning("return_tips")
+
     tip_spots: List[TipSpot] = []
     channels: List[int] = []
 
@@ -681,6 +746,8 @@ class LiquidHandler(Resource, Machine):
       backend_kwargs: Additional keyword arguments for the backend, optional.
     """
 
+    self._check_not_planning("discard_tips")
+
     # Different default value from drop_tips: here we factor in the tip tracking.
     if use_channels is None:
       use_channels = [c for c, t in self.head.items() if t.has_tip]
@@ -784,6 +851,21 @@ class LiquidHandler(Resource, Machine):
 
     self._check_containers(resources)
 
+    if self._operation_graph is not None:
+      self._operation_graph.add(
+        "aspirate",
+        resources,
+        use_channels or self._default_use_channels,
+        vols=vols,
+        flow_rates=flow_rates,
+        offsets=offsets,
+        liquid_height=liquid_height,
+        blow_out_air_volume=blow_out_air_volume,
+        spread=spread,
+        **backend_kwargs,
+      )
+      return
+
     use_channels = use_channels or self._default_use_channels or list(range(len(resources)))
 
     # expand default arguments
@@ -988,6 +1070,21 @@ class LiquidHandler(Resource, Machine):
 
     self._check_containers(resources)
 
+    if self._operation_graph is not None:
+      self._operation_graph.add(
+        "dispense",
+        resources,
+        use_channels or self._default_use_channels,
+        vols=vols,
+        flow_rates=flow_rates,
+        offsets=offsets,
+        liquid_height=liquid_height,
+        blow_out_air_volume=blow_out_air_volume,
+        spread=spread,
+        **backend_kwargs,
+      )
+      return
+
     use_channels = use_channels or self._default_use_channels or list(range(len(resources)))
 
     # expand default arguments
@@ -1124,15 +1221,16 @@ class LiquidHandler(Resource, Machine):
 
   async def transfer(
     self,
-    source: Well,
+    source: Container,
     targets: List[Well],
     source_vol: Optional[float] = None,
     ratios: Optional[List[float]] = None,
     target_vols: Optional[List[float]] = None,
     aspiration_flow_rate: Optional[float] = None,
     dispense_flow_rates: Optional[List[Optional[float]]] = None,
+    use_channels: Optional[List[int]] = None,
     **backend_kwargs,
-  ):
+  ) -> Optional[TransferPlan]:
     """Transfer liquid from one well to another.
 
     Examples:
@@ -1153,8 +1251,14 @@ class LiquidHandler(Resource, Machine):
 
       >>> await lh.transfer(plate["A1"], plate["A1:H1"], target_vols=[3, 1, 4, 1, 5, 9, 6, 2])
 
+      Distribute 10 uL from a trough to a full plate, using 8 channels in parallel:
+
+      >>> await lh.transfer(
+      ...   trough, plate.get_all_items(), source_vol=960, use_channels=list(range(8))
+      ... )
+
     Args:
-      source: The source well.
+      source: The source well, or another container such as a trough.
       targets: The target wells.
       source_vol: The volume to transfer from the source well.
       ratios: The ratios to use when transferring liquid to the target wells. If not specified, then
@@ -1166,6 +1270,15 @@ class LiquidHandler(Resource, Machine):
       dispense_flow_rates: The flow rates to use when dispensing, in ul/s. If `None`, the backend
         default will be used. Either a single flow rate for all channels, or a list of flow rates,
         one for each target well.
+      use_channels: If specified, the transfer is planned over these channels with
+        :func:`~pylabrobot.liquid_handling.transfer_planner.plan_transfer`: targets in the same
+        column are dispensed into in parallel, and each channel aspirates as much as its tip can
+        hold. The channels must have tips. If `None`, a single channel dispenses into each target
+        serially.
+
+    Returns:
+      The executed :class:`~pylabrobot.liquid_handling.transfer_planner.TransferPlan` if
+      `use_channels` was specified, otherwise `None`.
 
     Raises:
       RuntimeError: If the setup has not been run. See :meth:`~LiquidHandler.setup`.
@@ -1185,6 +1298,34 @@ class LiquidHandler(Resource, Machine):
 
       target_vols = [source_vol * r / sum(ratios) for r in ratios]
 
+    if use_channels is not None:
+      plan = plan_transfer(
+        source=source,
+        targets=targets,
+        target_vols=target_vols,
+        use_channels=use_channels,
+        tip_volumes=[self.head[channel].get_tip().maximal_volume for channel in use_channels],
+        aspiration_flow_rate=aspiration_flow_rate,
+        dispense_flow_rates=dispense_flow_rates,
+      )
+      logger.info(
+        "Transfer to %d targets planned in %d steps (%d aspirations, %d dispenses).",
+        len(targets),
+        plan.num_steps,
+        plan.num_aspirations,
+        plan.num_dispenses,
+      )
+      for step in plan.steps:
+        op = self.aspirate if step.operation == "aspirate" else self.dispense
+        await op(
+          resources=step.resources,
+          vols=step.vols,
+          use_channels=step.use_channels,
+          flow_rates=step.flow_rates,
+          **backend_kwargs,
+        )
+      return plan
+
     await self.aspirate(
       resources=[source],
       vols=[sum(target_vols)],
@@ -1200,6 +1341,7 @@ class LiquidHandler(Resource, Machine):
         use_channels=[0],
         **backend_kwargs,
       )
+    return None
 
   @contextlib.contextmanager
   def use_channels(self, channels: List[int]):
@@ -1230,6 +1372,75 @@ class LiquidHandler(Resource, Machine):
     finally:
       self._default_use_channels = None
 
+  @contextlib.asynccontextmanager
+  async def plan(self, optimize: bool = True):
+    """Record `pick_up_tips`, `drop_tips`, `aspirate` and `dispense` calls, and execute them
+    together when the context exits.
+
+    Because the whole sequence is known before anything is executed, it is optimised first:
+
+    - tips that are put back into a spot and picked up again by the same channel stay on the
+      channel;
+    - operations that do not depend on each other (they use neither a common channel nor a common
+      resource) are reordered to reduce arm travel;
+    - operations of the same kind on different channels in the same column are merged into a single
+      multi-channel operation.
+
+    The operations are executed through the regular methods, so tip and volume tracking and
+    errors work the same way as outside the context. Errors are raised when the context exits, not
+    at the time of the call. If an exception is raised inside the context, nothing is executed.
+    Other operations, such as `move_plate` or the 96 head methods, raise a `RuntimeError` inside
+    the context, because they would run before the recorded operations.
+
+    Examples:
+      Single channel calls are merged into one multi-channel call per step:
+
+      >>> async with lh.plan():
+      ...   for i, well in enumerate(plate["A1:H1"]):
+      ...     await lh.pick_up_tips(tip_rack[i], use_channels=[i])
+      ...     await lh.aspirate([well], vols=[10], use_channels=[i])
+
+    Args:
+      optimize: If `False`, the operations are executed in the order in which they were recorded.
+
+    Yields:
+      The :class:`~pylabrobot.liquid_handling.operation_graph.OperationGraph` being recorded.
+    """
+
+    if self._operation_graph is not None:
+      raise RuntimeError("Already planning operations.")
+
+    graph = OperationGraph()
+    self._operation_graph = graph
+    try:
+      yield graph
+    finally:
+      self._operation_graph = None
+
+    if optimize:
+      tip_volumes = {
+        channel: tracker.get_tip().tracker.get_used_volume()
+        for channel, tracker in self.head.items()
+        if tracker.has_tip
+      }
+      operations = graph.optimize(tip_volumes=tip_volumes)
+    else:
+      operations = graph.operations
+    logger.debug(
+      "Executing %d planned operations as %d operations.", len(graph.operations), len(operations)
+    )
+    for op in operations:
+      await getattr(self, op.kind)(**op.get_call_kwargs())
+
+  def _check_not_planning(self, method: str):
+    """Raise if a plan is being recorded. Only the operations that :meth:`plan` records may be
+    called inside it, other operations would be executed before the recorded ones."""
+
+    if self._operation_graph is not None:
+      raise RuntimeError(
+        f"{method} cannot be called while planning operations, call it outside `lh.plan()`."
+      )
+
   async def pick_up_tips96(
     self,
     tip_rack: TipRack,
@@ -1249,6 +1460,8 @@ class LiquidHandler(Resource, Machine):
       backend_kwargs: Additional keyword arguments for the backend, optional.
     """
 
+    self._check_not_planning("pick_up_tips96")
+
     if not isinstance(tip_rack, TipRack):
       raise TypeError(f"Resource must be a TipRack, got {tip_rack}")
     if not tip_rack.num_items == 96:
@@ -1323,6 +1536,8 @@ class LiquidHandler(Resource, Machine):
       backend_kwargs: Additional keyword arguments for the backend, optional.
     """
 
+    self._check_not_planning("drop_tips96")
+
     if not isinstance(resource, (TipRack, Trash)):
       raise TypeError(f"Resource must be a TipRack or Trash, got {resource}")
     if isinstance(resource, TipRack) and not resource.num_items == 96:
@@ -1412,6 +1627,8 @@ class LiquidHandler(Resource, Machine):
       RuntimeError: If no tips have been picked up.
     """
 
+    self._check_not_planning("return_tips96")
+
     tip_rack = self._get_96_head_origin_tip_rack()
     if tip_rack is None:
       raise RuntimeError("No tips have been picked up with the 96 head")
@@ -1441,6 +1658,8 @@ class LiquidHandler(Resource, Machine):
       ImplementationError: If the deck does not implement the `get_trash_area96` method.
     """
 
+    self._check_not_planning("discard_tips96")
+
     return await self.drop_tips96(
       self.deck.get_trash_area96(),
       allow_nonzero_volume=allow_nonzero_volume,
@@ -1476,6 +1695,8 @@ class LiquidHandler(Resource, Machine):
       backend_kwargs: Additional keyword arguments for the backend, optional.
     """
 
+    self._check_not_planning("aspirate96")
+
     if not (
       isinstance(resource, (Plate, Container))
       or (isinstance(resource, list) and all(isinstance(w, Well) for w in resource))
@@ -1627,6 +1848,8 @@ class LiquidHandler(Resource, Machine):
       backend_kwargs: Additional keyword arguments for the backend, optional.
     """
 
+    self._check_not_planning("dispense96")
+
     if not (
       isinstance(resource, (Plate, Container))
       or (isinstance(resource, list) and all(isinstance(w, Well) for w in resource))
@@ -1768,6 +1991,8 @@ class LiquidHandler(Resource, Machine):
         will be used.
     """
 
+    self._check_not_planning("stamp")
+
     assert (source.num_items_x, source.num_items_y) == (
       target.num_items_x,
       target.num_items_y,
@@ -1784,6 +2009,8 @@ class LiquidHandler(Resource, Machine):
     direction: GripDirection = GripDirection.FRONT,
     **backend_kwargs,
   ):
+    self._check_not_planning("pick_up_resource")
+
     if self._resource_pickup is not None:
       raise RuntimeError(f"Resource {self._resource_pickup.resource.name} already picked up")
 
@@ -1813,6 +2040,8 @@ class LiquidHandler(Resource, Machine):
     self,
     to: Coordinate,
   ):
+    self._check_not_planning("move_picked_up_resource")
+
     if self._resource_pickup is None:
       raise RuntimeError("No resource picked up")
     await self.backend.move_picked_up_resource(
@@ -1830,6 +2059,8 @@ class LiquidHandler(Resource, Machine):
     direction: GripDirection = GripDirection.FRONT,
     **backend_kwargs,
   ):
+    self._check_not_planning("drop_resource")
+
     if self._resource_pickup is None:
       raise RuntimeError("No resource picked up")
     resource = self._resource_pickup.resource
@@ -2006,6 +2237,8 @@ class LiquidHandler(Resource, Machine):
       drop_direction: The direction from which to put down the resource.
     """
 
+    self._check_not_planning("move_resource")
+
     # TODO: move conditional statements from move_plate into move_resource to enable
     # movement to other types besides Coordinate
 
@@ -2090,6 +2323,8 @@ class LiquidHandler(Resource, Machine):
       ValueError: If the lid is not assigned to a resource.
     """
 
+    self._check_not_planning("move_lid")
+
     # https://github.com/PyLabRobot/pylabrobot/issues/329
     if resource_offset is not None:
       raise NotImplementedError("resource_offset is deprecated, use pickup_offset instead")
@@ -2157,6 +2392,8 @@ class LiquidHandler(Resource, Machine):
       destination_offset: The offset from the location's origin, optional (rarely necessary).
     """
 
+    self._check_not_planning("move_plate")
+
     # https://github.com/PyLabRobot/pylabrobot/issues/329
     if resource_offset is not None:
       raise NotImplementedError("resource_offset is deprecated, use pickup_offset instead")
@@ -2235,21 +2472,25 @@ class LiquidHandler(Resource, Machine):
       return cls.deserialize(json.load(f))
 
   async def prepare_for_manual_channel_operation(self, channel: int):
+    self._check_not_planning("prepare_for_manual_channel_operation")
     assert 0 <= channel < self.backend.num_channels, f"Invalid channel: {channel}"
     await self.backend.prepare_for_manual_channel_operation(channel=channel)
 
   async def move_channel_x(self, channel: int, x: float):
     """Move channel to absolute x position"""
+    self._check_not_planning("move_channel_x")
     assert 0 <= channel < self.backend.num_channels, f"Invalid channel: {channel}"
     await self.backend.move_channel_x(channel=channel, x=x)
 
   async def move_channel_y(self, channel: int, y: float):
     """Move channel to absolute y position"""
+    self._check_not_planning("move_channel_y")
     assert 0 <= channel < self.backend.num_channels, f"Invalid channel: {channel}"
     await self.backend.move_channel_y(channel=channel, y=y)
 
   async def move_channel_z(self, channel: int, z: float):
     """Move channel to absolute z position"""
+    self._check_not_planning("move_channel_z")
     assert 0 <= channel < self.backend.num_channels, f"Invalid channel: {channel}"
     await self.backend.move_channel_z(channel=channel, z=z)
 
@@ -1,5 +1,6 @@
 """Tests for LiquidHandler"""
 
+import inspect
 import itertools
 import tempfile
 import unittest
@@ -42,6 +43,7 @@ from pylabrobot.resources.volume_tracker import (
   set_cross_contamination_tracking,
   set_volume_tracking,
 )
+from pylabrobot.resources.vwr import VWRReagentReservoirs25mL
 from pylabrobot.resources.well import Well
 
 from . import backends
@@ -773,6 +775,29 @@ class TestLiquidHandlerCommands(unittest.IsolatedAsyncioTestCase):
         target_vols=vols,
       )
 
+  async def test_transfer_planned(self):
+    trough = VWRReagentReservoirs25mL(name="trough")
+    self.deck.assign_child_resource(trough, location=Coordinate(300, 100, 0))
+    trough.tracker.set_liquids([(None, 1000)])
+    tips = self.tip_rack.get_tips("A1:H1")
+    self.lh.update_head_state(dict(enumerate(tips)))
+
+    plan = await self.lh.transfer(
+      trough, self.plate.get_all_items(), source_vol=960, use_channels=list(range(8))
+    )
+    assert plan is not None
+    self.assertEqual(plan.num_steps, 13)
+
+    aspirations = [c for c in self.backend.commands_received if c["command"] == "aspirate"]
+    dispenses = [c for c in self.backend.commands_received if c["command"] == "dispense"]
+    self.assertEqual(len(aspirations), 1)
+    self.assertEqual(aspirations[0]["kwargs"]["use_channels"], list(range(8)))
+    self.assertEqual([op.volume for op in aspirations[0]["kwargs"]["ops"]], [120] * 8)
+    self.assertEqual(len(dispenses), 12)
+    self.assertEqual(
+      [op.resource for op in dispenses[0]["kwargs"]["ops"]], self.plate.get_items("A1:H1")
+    )
+
   async def test_stamp(self):
     # Simple transfer
     await self.lh.pick_up_tips96(self.tip_rack)  # pick up tips first.
@@ -987,6 +1012,71 @@ class TestLiquidHandlerCommands(unittest.IsolatedAsyncioTestCase):
 
       set_strictness(Strictness.WARN)
 
+  async def test_check_args_signature_cache(self):
+    class TestBackend(backends.SaverBackend):
+      async def pick_up_tips(self, ops, use_channels, non_default):  # type: ignore
+        pass
+
+    with unittest.mock.patch("inspect.signature", wraps=inspect.signature) as signature:
+      with no_tip_tracking():
+        await self.lh.pick_up_tips(self.tip_rack["A1"], use_channels=[0])
+        await self.lh.pick_up_tips(self.tip_rack["A1"], use_channels=[1])
+      self.assertEqual(signature.call_count, 1)
+
+      # swapping the backend invalidates the cache
+      self.lh.backend = TestBackend(num_channels=16)
+      with self.assertRaises(TypeError):  # missing non_default
+        await self.lh.pick_up_tips(self.tip_rack["A1"], use_channels=[2])
+      self.assertEqual(signature.call_count, 2)
+
+  async def test_plan(self):
+    self.backend.clear()
+    async with self.lh.plan():
+      for i in range(8):
+        await self.lh.pick_up_tips([self.tip_rack.get_item(i)], use_channels=[i])
+        await self.lh.aspirate([self.plate.get_item(i)], vols=[10], use_channels=[i])
+        await self.lh.dispense([self.plate.get_item(i + 8)], vols=[10], use_channels=[i])
+      self.assertEqual(self.backend.commands_received, [])
+
+    commands = self.backend.commands_received
+    self.assertEqual([c["command"] for c in commands], ["pick_up_tips", "aspirate", "dispense"])
+    for command in commands:
+      self.assertEqual(command["kwargs"]["use_channels"], list(range(8)))
+    self.assertEqual(
+      [op.resource for op in commands[1]["kwargs"]["ops"]], self.plate.get_items("A1:H1")
+    )
+    self.assertTrue(all(self.lh.head[i].has_tip for i in range(8)))
+
+  async def test_plan_tip_swap(self):
+    self.backend.clear()
+    async with self.lh.plan():
+      await self.lh.pick_up_tips(self.tip_rack["A1"])
+      await self.lh.drop_tips(self.tip_rack["A1"])
+      await self.lh.pick_up_tips(self.tip_rack["A1"])
+    self.assertEqual([c["command"] for c in self.backend.commands_received], ["pick_up_tips"])
+    self.assertTrue(self.lh.head[0].has_tip)
+
+  async def test_plan_error(self):
+    self.backend.clear()
+    with self.assertRaises(ValueError):
+      async with self.lh.plan():
+        await self.lh.pick_up_tips(self.tip_rack["A1"])
+        raise ValueError()
+    self.assertEqual(self.backend.commands_received, [])
+    self.assertFalse(self.lh.head[0].has_tip)
+
+  async def test_plan_unrecorded_operation(self):
+    self.backend.clear()
+    with self.assertRaises(RuntimeError):
+      async with self.lh.plan():
+        await self.lh.pick_up_tips(self.tip_rack["A1"])
+        await self.lh.aspirate(self.plate["A1"], vols=[10])
+        await self.lh.move_plate(self.plate, Coordinate(1000, 1000, 1000))
+        await self.lh.dispense(self.plate["A2"], vols=[10])
+    self.assertEqual(self.backend.commands_received, [])
+    self.assertIsNotNone(self.plate.parent)
+    self.assertFalse(self.lh.head[0].has_tip)
+
   async def test_save_state(self):
     set_volume_tracking(enabled=True)
 
@@ -0,0 +1,333 @@
+"""A graph of deferred liquid handling operations, and optimisation passes over it.
+
+Inside :meth:`LiquidHandler.plan <pylabrobot.liquid_handling.LiquidHandler.plan>`, calls to
+`pick_up_tips`, `drop_tips`, `aspirate` and `dispense` are recorded as
+:class:`DeferredOperation` s instead of being executed. Two operations depend on each other when
+they use a common channel or a common resource, and the passes in this module only ever change
+the order of independent operations.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Optional, Sequence, Set, Tuple
+
+from pylabrobot.resources import Coordinate, Resource, TipSpot
+from pylabrobot.resources.volume_tracker import does_volume_tracking
+
+OperationKind = Literal["pick_up_tips", "drop_tips", "aspirate", "dispense"]
+
+# Arguments that have one value per channel, and their default value.
+_PER_CHANNEL_ARGS: Dict[str, Dict[str, Any]] = {
+  "pick_up_tips": {"offsets": Coordinate.zero()},
+  "drop_tips": {"offsets": Coordinate.zero()},
+  "aspirate": {
+    "vols": None,
+    "flow_rates": None,
+    "offsets": Coordinate.zero(),
+    "liquid_height": None,
+    "blow_out_air_volume": None,
+  },
+  "dispense": {
+    "vols": None,
+    "flow_rates": None,
+    "offsets": Coordinate.zero(),
+    "liquid_height": None,
+    "blow_out_air_volume": None,
+  },
+}
+
+# The name of the argument holding the resources, for each kind of operation.
+_RESOURCE_ARG: Dict[str, str] = {
+  "pick_up_tips": "tip_spots",
+  "drop_tips": "tip_spots",
+  "aspirate": "resources",
+  "dispense": "resources",
+}
+
+MIN_CHANNEL_SPACING = 9  # mm, between the centers of two adjacent channels
+
+
+@dataclass(eq=False)
+class DeferredOperation:
+  """A recorded call to a :class:`~pylabrobot.liquid_handling.LiquidHandler` method.
+
+  Attributes:
+    kind: The name of the method.
+    resources: The resource for each channel.
+    use_channels: The channels, resolved at the time the call was recorded.
+    per_channel: Arguments with one value per channel, like `vols` and `offsets`.
+    kwargs: All other arguments, including backend kwargs.
+    index: The position of the (first) call in the order in which calls were recorded.
+  """
+
+  kind: OperationKind
+  resources: List[Resource]
+  use_channels: List[int]
+  per_channel: Dict[str, List[Any]] = field(default_factory=dict)
+  kwargs: Dict[str, Any] = field(default_factory=dict)
+  index: int = 0
+
+  @property
+  def spreads(self) -> bool:
+    """Whether multiple channels access a single resource, in which case the liquid handler
+    spreads them over the resource and the operation can not be merged with others."""
+    return len(self.resources) > 1 and len(set(id(r) for r in self.resources)) == 1
+
+  def get_call_kwargs(self) -> Dict[str, Any]:
+    """The keyword arguments to replay this operation on a liquid handler."""
+    return {
+      _RESOURCE_ARG[self.kind]: list(self.resources),
+      "use_channels": list(self.use_channels),
+      **{name: list(values) for name, values in self.per_channel.items()},
+      **self.kwargs,
+    }
+
+  def _select(self, keep: Sequence[int]) -> "DeferredOperation":
+    return DeferredOperation(
+      kind=self.kind,
+      resources=[self.resources[i] for i in keep],
+      use_channels=[self.use_channels[i] for i in keep],
+      per_channel={name: [values[i] for i in keep] for name, values in self.per_channel.items()},
+      kwargs=self.kwargs,
+      index=self.index,
+    )
+
+
+class OperationGraph:
+  """Operations recorded in a :meth:`~pylabrobot.liquid_handling.LiquidHandler.plan` context."""
+
+  def __init__(self):
+    self.operations: List[DeferredOperation] = []
+
+  def add(
+    self,
+    kind: OperationKind,
+    resources: Sequence[Resource],
+    use_channels: Optional[List[int]],
+    **kwargs,
+  ) -> DeferredOperation:
+    """Record an operation. Per channel arguments that are `None` are expanded to their default."""
+
+    resources = list(resources)
+    if use_channels is None:
+      use_channels = list(range(len(resources)))
+    if len(resources) == 1 and len(use_channels) > 1:
+      resources = resources * len(use_channels)
+    if len(resources) != len(use_channels):
+      raise ValueError("Number of resources and channels must be equal.")
+
+    per_channel: Dict[str, List[Any]] = {}
+    for name, default in _PER_CHANNEL_ARGS[kind].items():
+      value = kwargs.pop(name, None)
+      if value is None:
+        value = [default] * len(use_channels)
+      elif not isinstance(value, list):
+        value = [value] * len(use_channels)
+      if len(value) != len(use_channels):
+        raise ValueError(f"Number of {name} and channels must be equal.")
+      per_channel[name] = value
+
+    op = DeferredOperation(
+      kind=kind,
+      resources=resources,
+      use_channels=list(use_channels),
+      per_channel=per_channel,
+      kwargs=kwargs,
+      index=len(self.operations),
+    )
+    self.operations.append(op)
+    return op
+
+  def optimize(self, tip_volumes: Optional[Dict[int, float]] = None) -> List[DeferredOperation]:
+    """Run all optimisation passes and return the operations in the order to execute them.
+
+    Args:
+      tip_volumes: The volume in the tip on each channel before the operations, see
+        :func:`eliminate_redundant_tip_swaps`.
+    """
+    return schedule_operations(eliminate_redundant_tip_swaps(self.operations, tip_volumes))
+
+
+def eliminate_redundant_tip_swaps(
+  operations: Sequence[DeferredOperation],
+  tip_volumes: Optional[Dict[int, float]] = None,
+) -> List[DeferredOperation]:
+  """Remove tips that are dropped into a tip spot and then picked up again by the same channel.
+
+  A drop is redundant if the next operation on that channel picks the tip up from the same spot,
+  and no operation accessed the spot in between. Both channel entries are removed, and operations
+  that are left without channels are removed entirely.
+
+  When volume tracking is enabled, a drop is only removed if the tip is empty, or if the drop
+  allows a nonzero volume, so that `drop_tips` still raises for tips that hold liquid. The volume
+  in each tip is followed through the aspirations and dispenses.
+
+  Args:
+    operations: The operations, in the order in which they were recorded.
+    tip_volumes: The volume in the tip on each channel before the operations. Channels that are
+      not in it are assumed to have an empty tip, or no tip.
+  """
+
+  removed: Dict[int, Set[int]] = {}  # id(operation) -> indices into operation.use_channels
+  last_drop: Dict[int, Tuple[DeferredOperation, int]] = {}  # channel -> (drop operation, index)
+  last_access: Dict[int, DeferredOperation] = {}  # id(resource) -> last operation using it
+  # volume in the tip on each channel, and in tips dropped into spots. `None` if unknown.
+  volumes: Dict[int, Optional[float]] = dict(tip_volumes or {})
+  spot_volumes: Dict[int, Optional[float]] = {}  # id(tip spot) -> volume of the tip dropped there
+
+  for op in operations:
+    for i, (channel, resource) in enumerate(zip(op.use_channels, op.resources)):
+      if op.kind == "pick_up_tips" and channel in last_drop:
+        drop, drop_index = last_drop[channel]
+        if drop.resources[drop_index] is resource and last_access.get(id(resource)) is drop:
+          removed.setdefault(id(drop), set()).add(drop_index)
+          removed.setdefault(id(op), set()).add(i)
+
+      volume = volumes.get(channel, 0.0)
+      if op.kind == "pick_up_tips":
+        volumes[channel] = spot_volumes.get(id(resource), _get_tip_volume(resource))
+      elif op.kind in {"aspirate", "dispense"}:
+        vol = op.per_channel["vols"][i]
+        if volume is None or vol is None:
+          volumes[channel] = None
+        else:
+          volumes[channel] = volume + vol if op.kind == "aspirate" else volume - vol
+      elif op.kind == "drop_tips":
+        volumes[channel] = 0.0
+        spot_volumes[id(resource)] = volume
+
+      droppable = (
+        not does_volume_tracking()
+        or op.kwargs.get("allow_nonzero_volume", False)
+        or (volume is not None and volume <= 0)
+      )
+      if op.kind == "drop_tips" and isinstance(resource, TipSpot) and droppable:
+        last_drop[channel] = (op, i)
+      else:
+        last_drop.pop(channel, None)
+    for resource in op.resources:
+      last_access[id(resource)] = op
+
+  result: List[DeferredOperation] = []
+  for op in operations:
+    indices = removed.get(id(op), set())
+    keep = [i for i in range(len(op.use_channels)) if i not in indices]
+    if len(keep) == len(op.use_channels):
+      result.append(op)
+    elif len(keep) > 0:
+      result.append(op._select(keep))
+  return result
+
+
+def _get_tip_volume(tip_spot: Resource) -> float:
+  """The volume in the tip in a tip spot, or 0 if the spot has no tip yet."""
+  if isinstance(tip_spot, TipSpot) and tip_spot.has_tip():
+    return tip_spot.get_tip().tracker.get_used_volume()
+  return 0.0
+
+
+class _Node:
+  def __init__(self, op: DeferredOperation, locations: List[Coordinate]):
+    self.op = op
+    self.locations = locations
+    self.x = sum(loc.x for loc in locations) / len(locations)
+    xs = {round(loc.x, 1) for loc in locations}
+    self.column: Optional[float] = xs.pop() if len(xs) == 1 else None
+    self.successors: List["_Node"] = []
+    self.num_predecessors = 0
+
+
+def _can_merge(group: List[_Node], candidate: _Node, min_spacing: float) -> bool:
+  seed, op = group[0], candidate.op
+  if op.kind != seed.op.kind or op.spreads or seed.op.spreads or op.kwargs != seed.op.kwargs:
+    return False
+  if candidate.column is None or candidate.column != seed.column:
+    return False
+
+  channels = [c for node in group for c in node.op.use_channels]
+  if any(c in channels for c in op.use_channels):
+    return False
+  resources = {id(r) for node in group for r in node.op.resources}
+  if any(id(r) in resources for r in op.resources):
+    return False
+
+  # channels are ordered back to front, so the y positions must decrease with the channel index
+  # and leave room for the channels in between.
+  ys = sorted(
+    (c, loc.y)
+    for node in group + [candidate]
+    for c, loc in zip(node.op.use_channels, node.locations)
+  )
+  return all(y1 - y2 >= min_spacing * (c2 - c1) - 1e-6 for (c1, y1), (c2, y2) in zip(ys, ys[1:]))
+
+
+def _merge(group: List[_Node]) -> DeferredOperation:
+  if len(group) == 1:
+    return group[0].op
+  entries = sorted((c, node.op, i) for node in group for i, c in enumerate(node.op.use_channels))
+  seed = group[0].op
+  return DeferredOperation(
+    kind=seed.kind,
+    resources=[op.resources[i] for _, op, i in entries],
+    use_channels=[c for c, _, _ in entries],
+    per_channel={
+      name: [op.per_channel[name][i] for _, op, i in entries] for name in seed.per_channel
+    },
+    kwargs=seed.kwargs,
+    index=min(node.op.index for node in group),
+  )
+
+
+def schedule_operations(
+  operations: Sequence[DeferredOperation],
+  merge: bool = True,
+  min_spacing: float = MIN_CHANNEL_SPACING,
+) -> List[DeferredOperation]:
+  """Order operations to reduce arm travel, merging independent operations where possible.
+
+  Operations are scheduled greedily: of all operations whose dependencies have been executed, the
+  one closest in x to the previous operation is picked, earliest recorded first. If `merge` is
+  `True`, it is merged with other ready operations of the same kind and arguments on other
+  channels, in the same column, that the channels can reach at the same time.
+  """
+
+  nodes: List[_Node] = []
+  last_on_channel: Dict[int, _Node] = {}
+  last_on_resource: Dict[int, _Node] = {}
+  for op in operations:
+    node = _Node(op, [r.get_absolute_location(x="c", y="c", z="b") for r in op.resources])
+    predecessors = {id(p): p for p in (last_on_channel.get(c) for c in op.use_channels) if p}
+    for r in op.resources:
+      p = last_on_resource.get(id(r))
+      if p is not None:
+        predecessors[id(p)] = p
+    for p in predecessors.values():
+      p.successors.append(node)
+      node.num_predecessors += 1
+    for c in op.use_channels:
+      last_on_channel[c] = node
+    for r in op.resources:
+      last_on_resource[id(r)] = node
+    nodes.append(node)
+
+  ready = [node for node in nodes if node.num_predecessors == 0]
+  current_x: Optional[float] = None
+  result: List[DeferredOperation] = []
+  while len(ready) > 0:
+    ready.sort(key=lambda n: n.op.index)
+    seed = min(ready, key=lambda n: abs(n.x - current_x) if current_x is not None else 0)
+    group = [seed]
+    if merge and seed.column is not None:
+      for candidate in ready:
+        if candidate is not seed and _can_merge(group, candidate, min_spacing):
+          group.append(candidate)
+
+    result.append(_merge(group))
+    current_x = seed.x
+    for node in group:
+      ready.remove(node)
+      for successor in node.successors:
+        successor.num_predecessors -= 1
+        if successor.num_predecessors == 0:
+          ready.append(successor)
+
+  return result
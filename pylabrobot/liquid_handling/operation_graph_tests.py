@@ -0,0 +1,120 @@
+import unittest
+
+from pylabrobot.liquid_handling.operation_graph import (
+  OperationGraph,
+  eliminate_redundant_tip_swaps,
+  schedule_operations,
+)
+from pylabrobot.resources import Coordinate, Cor_96_wellplate_360ul_Fb, Deck
+from pylabrobot.resources.hamilton import STF
+from pylabrobot.resources.volume_tracker import does_volume_tracking, set_volume_tracking
+from pylabrobot.resources.vwr import VWRReagentReservoirs25mL
+
+
+class TestOperationGraph(unittest.TestCase):
+  def setUp(self):
+    self.deck = Deck()
+    self.tip_rack = STF(name="tip_rack")
+    self.plate = Cor_96_wellplate_360ul_Fb(name="plate")
+    self.trough = VWRReagentReservoirs25mL(name="trough")
+    self.deck.assign_child_resource(self.tip_rack, location=Coordinate(0, 0, 0))
+    self.deck.assign_child_resource(self.plate, location=Coordinate(200, 0, 0))
+    self.deck.assign_child_resource(self.trough, location=Coordinate(600, 0, 0))
+    self.graph = OperationGraph()
+
+  def test_add(self):
+    op = self.graph.add("aspirate", [self.trough], [0, 1], vols=10, spread="wide")
+    self.assertEqual(op.resources, [self.trough, self.trough])
+    self.assertEqual(op.per_channel["vols"], [10, 10])
+    self.assertEqual(op.per_channel["offsets"], [Coordinate.zero()] * 2)
+    self.assertTrue(op.spreads)
+    self.assertEqual(op.get_call_kwargs()["spread"], "wide")
+
+  def test_merge_column(self):
+    for i in range(8):
+      self.graph.add("aspirate", [self.plate.get_item(i)], [i], vols=[i])
+    ops = schedule_operations(self.graph.operations)
+    self.assertEqual(len(ops), 1)
+    self.assertEqual(ops[0].use_channels, list(range(8)))
+    self.assertEqual(ops[0].resources, self.plate.get_items("A1:H1"))
+    self.assertEqual(ops[0].per_channel["vols"], list(range(8)))
+
+  def test_no_merge(self):
+    # adjacent wells can not be reached by channels 0 and 2 at the same time
+    self.graph.add("aspirate", [self.plate.get_item("A1")], [0], vols=[1])
+    self.graph.add("aspirate", [self.plate.get_item("B1")], [2], vols=[1])
+    # channel order does not match the y order of the wells
+    self.graph.add("aspirate", [self.plate.get_item("A2")], [4], vols=[1])
+    self.graph.add("aspirate", [self.plate.get_item("B2")], [3], vols=[1])
+    # different kwargs
+    self.graph.add("aspirate", [self.plate.get_item("A3")], [5], vols=[1], spread="tight")
+    self.graph.add("aspirate", [self.plate.get_item("B3")], [6], vols=[1])
+    self.assertEqual(len(schedule_operations(self.graph.operations)), 6)
+
+  def test_dependencies(self):
+    self.graph.add("dispense", [self.plate.get_item("A1")], [0], vols=[1])
+    self.graph.add("aspirate", [self.plate.get_item("A1")], [1], vols=[1])
+    self.graph.add("aspirate", [self.plate.get_item("B1")], [1], vols=[1])
+    ops = schedule_operations(self.graph.operations)
+    self.assertEqual([op.index for op in ops], [0, 1, 2])
+
+  def test_reorder(self):
+    self.graph.add("aspirate", [self.plate.get_item("A1")], [0], vols=[1])
+    self.graph.add("dispense", [self.trough], [0], vols=[1])
+    self.graph.add("aspirate", [self.plate.get_item("A2")], [1], vols=[1])
+    ops = schedule_operations(self.graph.operations)
+    self.assertEqual([op.index for op in ops], [0, 2, 1])
+
+  def test_tip_swaps(self):
+    spot = self.tip_rack.get_item("A1")
+    self.graph.add("pick_up_tips", [spot], [0])
+    self.graph.add("drop_tips", [spot], [0])
+    self.graph.add("pick_up_tips", [spot], [0])
+    ops = eliminate_redundant_tip_swaps(self.graph.operations)
+    self.assertEqual([op.index for op in ops], [0])
+
+  def test_tip_swaps_spot_used(self):
+    spot = self.tip_rack.get_item("A1")
+    self.graph.add("drop_tips", [spot], [0])
+    self.graph.add("pick_up_tips", [spot], [1])
+    self.graph.add("drop_tips", [spot], [1])
+    self.graph.add("pick_up_tips", [spot], [0])
+    self.assertEqual(len(eliminate_redundant_tip_swaps(self.graph.operations)), 4)
+
+  def test_tip_swaps_partial(self):
+    spots = self.tip_rack.get_items("A1:B1")
+    self.graph.add("drop_tips", spots, [0, 1])
+    self.graph.add("pick_up_tips", [spots[0]], [0])
+    self.graph.add("pick_up_tips", [self.tip_rack.get_item("C1")], [1])
+    ops = eliminate_redundant_tip_swaps(self.graph.operations)
+    self.assertEqual(len(ops), 2)
+    self.assertEqual(ops[0].use_channels, [1])
+    self.assertEqual(ops[0].resources, [spots[1]])
+
+  def test_tip_swaps_with_liquid(self):
+    self.addCleanup(set_volume_tracking, does_volume_tracking())
+    set_volume_tracking(True)
+    spot, well = self.tip_rack.get_item("A1"), self.plate.get_item("A1")
+    self.graph.add("pick_up_tips", [spot], [0])
+    self.graph.add("aspirate", [well], [0], vols=[10])
+    self.graph.add("drop_tips", [spot], [0])
+    self.graph.add("pick_up_tips", [spot], [0])
+    self.assertEqual(len(eliminate_redundant_tip_swaps(self.graph.operations)), 4)
+
+    self.graph.add("dispense", [well], [0], vols=[10])
+    self.graph.add("drop_tips", [spot], [0])
+    self.graph.add("pick_up_tips", [spot], [0])
+    self.assertEqual(len(eliminate_redundant_tip_swaps(self.graph.operations)), 5)
+
+  def test_tip_swaps_initial_volume(self):
+    self.addCleanup(set_volume_tracking, does_volume_tracking())
+    set_volume_tracking(True)
+    spot = self.tip_rack.get_item("A1")
+    self.graph.add("drop_tips", [spot], [0])
+    self.graph.add("pick_up_tips", [spot], [0])
+    self.assertEqual(len(eliminate_redundant_tip_swaps(self.graph.operations, {0: 5})), 2)
+
+    self.graph.operations.clear()
+    self.graph.add("drop_tips", [spot], [0], allow_nonzero_volume=True)
+    self.graph.add("pick_up_tips", [spot], [0])
+    self.assertEqual(len(eliminate_redundant_tip_swaps(self.graph.operations, {0: 5})), 0)
@@ -0,0 +1,174 @@
+"""Planning of one-to-many transfers over multiple channels."""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Literal, Optional, Sequence
+
+from pylabrobot.liquid_handling.utils import get_wide_single_resource_liquid_op_offsets
+from pylabrobot.resources import Container
+
+MIN_CHANNEL_SPACING = 9  # mm, between the centers of two adjacent channels
+
+
+@dataclass
+class TransferStep:
+  """A single `aspirate` or `dispense` call of a transfer plan."""
+
+  operation: Literal["aspirate", "dispense"]
+  resources: List[Container]
+  vols: List[float]
+  use_channels: List[int]
+  flow_rates: List[Optional[float]]
+
+
+@dataclass
+class TransferPlan:
+  """An ordered list of aspirate and dispense steps that implement a transfer."""
+
+  steps: List[TransferStep] = field(default_factory=list)
+
+  @property
+  def num_steps(self) -> int:
+    return len(self.steps)
+
+  @property
+  def num_aspirations(self) -> int:
+    return sum(1 for step in self.steps if step.operation == "aspirate")
+
+  @property
+  def num_dispenses(self) -> int:
+    return sum(1 for step in self.steps if step.operation == "dispense")
+
+
+def _batch_targets(
+  targets: Sequence[Container], num_channels: int, min_spacing: float
+) -> List[List[int]]:
+  """Group target indices into batches that can be dispensed into in a single step.
+
+  All targets in a batch are in the same column (same x), sorted from back to front, and at least
+  `min_spacing` apart in y so that adjacent channels can reach them at the same time.
+  """
+
+  locations = [target.get_absolute_location(x="c", y="c", z="b") for target in targets]
+  columns: Dict[float, List[int]] = {}
+  for i, location in enumerate(locations):
+    columns.setdefault(round(location.x, 1), []).append(i)
+
+  batches: List[List[int]] = []
+  for column in columns.values():
+    remaining = sorted(column, key=lambda i: -locations[i].y)
+    while len(remaining) > 0:
+      batch: List[int] = []
+      rest: List[int] = []
+      for i in remaining:
+        if len(batch) < num_channels and (
+          len(batch) == 0 or locations[batch[-1]].y - locations[i].y >= min_spacing - 1e-6
+        ):
+          batch.append(i)
+        else:
+          rest.append(i)
+      batches.append(batch)
+      remaining = rest
+  return batches
+
+
+def _fits_channels(resource: Container, num_channels: int) -> bool:
+  """Whether `num_channels` channels can aspirate from `resource` at the same time."""
+  if num_channels == 1:
+    return True
+  try:
+    get_wide_single_resource_liquid_op_offsets(resource=resource, num_channels=num_channels)
+  except ValueError:
+    return False
+  return True
+
+
+def plan_transfer(
+  source: Container,
+  targets: Sequence[Container],
+  target_vols: Sequence[float],
+  use_channels: List[int],
+  tip_volumes: Sequence[float],
+  aspiration_flow_rate: Optional[float] = None,
+  dispense_flow_rates: Optional[Sequence[Optional[float]]] = None,
+  min_spacing: float = MIN_CHANNEL_SPACING,
+) -> TransferPlan:
+  """Plan a transfer from `source` to `targets` using multiple channels in parallel.
+
+  Targets are packed into batches of up to `len(use_channels)` wells in the same column that are
+  at least `min_spacing` apart, which are dispensed into in a single step. Consecutive batches
+  share one aspiration for as long as the volume of each channel fits in its tip. If the source
+  is too small for all channels to aspirate from it at once, the channels aspirate one after the
+  other.
+
+  Args:
+    source: The container to aspirate from.
+    targets: The containers to dispense into.
+    target_vols: The volume to dispense into each target.
+    use_channels: The channels to use, sorted from back to front.
+    tip_volumes: The maximal volume of the tip on each channel in `use_channels`.
+    aspiration_flow_rate: The flow rate for aspirations, or `None` for the backend default.
+    dispense_flow_rates: The flow rate for each target, or `None` for the backend default.
+    min_spacing: The minimum distance in y between two targets dispensed into simultaneously.
+
+  Raises:
+    ValueError: If the arguments are inconsistent, or a target volume exceeds the tip volume.
+  """
+
+  if len(targets) != len(target_vols):
+    raise ValueError("Number of targets and target volumes must be equal.")
+  if len(use_channels) == 0 or len(use_channels) != len(tip_volumes):
+    raise ValueError("Must specify one tip volume for each channel.")
+  if use_channels != sorted(set(use_channels)):
+    raise ValueError("Channels must be sorted and unique.")
+  dispense_flow_rates = dispense_flow_rates or [None] * len(targets)
+
+  plan = TransferPlan()
+  cycle: List[List[int]] = []
+  loaded = [0.0] * len(use_channels)
+
+  def flush():
+    num_used = max(len(batch) for batch in cycle)
+    if _fits_channels(source, num_used):
+      groups = [list(range(num_used))]
+    else:
+      groups = [[c] for c in range(num_used)]
+    for group in groups:
+      plan.steps.append(
+        TransferStep(
+          operation="aspirate",
+          resources=[source] * len(group),
+          vols=[loaded[c] for c in group],
+          use_channels=[use_channels[c] for c in group],
+          flow_rates=[aspiration_flow_rate] * len(group),
+        )
+      )
+    for batch in cycle:
+      plan.steps.append(
+        TransferStep(
+          operation="dispense",
+          resources=[targets[i] for i in batch],
+          vols=[target_vols[i] for i in batch],
+          use_channels=use_channels[: len(batch)],
+          flow_rates=[dispense_flow_rates[i] for i in batch],
+        )
+      )
+    cycle.clear()
+    for c in range(len(loaded)):
+      loaded[c] = 0.0
+
+  for batch in _batch_targets(targets, num_channels=len(use_channels), min_spacing=min_spacing):
+    for c, i in enumerate(batch):
+      if target_vols[i] > tip_volumes[c]:
+        raise ValueError(
+          f"Volume {target_vols[i]} for {targets[i].name} exceeds the tip volume "
+          f"{tip_volumes[c]} of channel {use_channels[c]}."
+        )
+    if any(loaded[c] + target_vols[i] > tip_volumes[c] for c, i in enumerate(batch)):
+      flush()
+    cycle.append(batch)
+    for c, i in enumerate(batch):
+      loaded[c] += target_vols[i]
+  if len(cycle) > 0:
+    flush()
+
+  return plan
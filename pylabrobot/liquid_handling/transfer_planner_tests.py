@@ -0,0 +1,97 @@
+import unittest
+
+from pylabrobot.liquid_handling.transfer_planner import plan_transfer
+from pylabrobot.resources import Coordinate, Cor_96_wellplate_360ul_Fb, Deck
+from pylabrobot.resources.biorad.plates import BioRad_384_wellplate_50uL_Vb
+from pylabrobot.resources.vwr import VWRReagentReservoirs25mL
+
+
+class TestPlanTransfer(unittest.TestCase):
+  def setUp(self):
+    self.deck = Deck()
+    self.plate = Cor_96_wellplate_360ul_Fb(name="plate")
+    self.trough = VWRReagentReservoirs25mL(name="trough")
+    self.deck.assign_child_resource(self.plate, location=Coordinate(100, 100, 0))
+    self.deck.assign_child_resource(self.trough, location=Coordinate(300, 100, 0))
+
+  def test_one_to_96(self):
+    targets = self.plate.get_all_items()
+    plan = plan_transfer(
+      source=self.trough,
+      targets=targets,
+      target_vols=[10] * 96,
+      use_channels=list(range(8)),
+      tip_volumes=[300] * 8,
+    )
+    self.assertEqual(plan.num_steps, 13)
+    self.assertEqual(plan.num_aspirations, 1)
+    aspiration = plan.steps[0]
+    self.assertEqual(aspiration.use_channels, list(range(8)))
+    self.assertEqual(aspiration.vols, [120] * 8)
+    for column, step in enumerate(plan.steps[1:]):
+      self.assertEqual(step.operation, "dispense")
+      self.assertEqual(step.resources, self.plate.get_items(f"A{column + 1}:H{column + 1}"))
+      self.assertEqual(step.use_channels, list(range(8)))
+
+  def test_tip_capacity(self):
+    plan = plan_transfer(
+      source=self.trough,
+      targets=self.plate.get_all_items(),
+      target_vols=[100] * 96,
+      use_channels=list(range(8)),
+      tip_volumes=[300] * 8,
+    )
+    # 3 columns per aspiration
+    self.assertEqual(plan.num_aspirations, 4)
+    self.assertEqual(plan.num_dispenses, 12)
+    self.assertEqual(
+      [step.operation for step in plan.steps[:5]],
+      ["aspirate", "dispense", "dispense", "dispense", "aspirate"],
+    )
+    self.assertEqual(plan.steps[0].vols, [300] * 8)
+
+    with self.assertRaises(ValueError):
+      plan_transfer(
+        source=self.trough,
+        targets=[self.plate.get_item("A1")],
+        target_vols=[400],
+        use_channels=[0],
+        tip_volumes=[300],
+      )
+
+  def test_small_source(self):
+    # a single well is too small for multiple channels, so they aspirate one after the other
+    plan = plan_transfer(
+      source=self.plate.get_item("A1"),
+      targets=self.plate["A2:D2"],
+      target_vols=[10] * 4,
+      use_channels=[0, 1, 2, 3],
+      tip_volumes=[300] * 4,
+    )
+    self.assertEqual([step.operation for step in plan.steps], ["aspirate"] * 4 + ["dispense"])
+    self.assertEqual([step.use_channels for step in plan.steps[:4]], [[0], [1], [2], [3]])
+
+  def test_spacing(self):
+    # wells in a 384 well plate are 4.5mm apart, so every other row can be reached at once
+    plate = BioRad_384_wellplate_50uL_Vb(name="plate_384")
+    self.deck.assign_child_resource(plate, location=Coordinate(100, 300, 0))
+    plan = plan_transfer(
+      source=self.trough,
+      targets=plate["A1:P1"],
+      target_vols=[5] * 16,
+      use_channels=list(range(8)),
+      tip_volumes=[300] * 8,
+    )
+    self.assertEqual(plan.num_dispenses, 2)
+    self.assertEqual(plan.steps[1].resources, plate.get_items([f"{r}1" for r in "ACEGIKMO"]))
+    self.assertEqual(plan.steps[2].resources, plate.get_items([f"{r}1" for r in "BDFHJLNP"]))
+
+  def test_unsorted_channels(self):
+    with self.assertRaises(ValueError):
+      plan_transfer(
+        source=self.trough,
+        targets=[self.plate.get_item("A1")],
+        target_vols=[10],
+        use_channels=[1, 0],
+        tip_volumes=[300, 300],
+      )
@@ -31,6 +31,7 @@ from .opentrons import *
 from .petri_dish import PetriDish, PetriDishHolder
 from .plate import Lid, Plate
 from .plate_adapter import PlateAdapter
+from .plate_volume_tracker import PlateVolumeTracker
 from .porvair import *
 from .powder import Powder
 from .resource import Resource
@@ -16,8 +16,17 @@ from typing import (
 
 import pylabrobot.utils
 
+from .coordinate import Coordinate
+from .errors import NoLocationError
 from .resource import Resource
 
+try:
+  import numpy as np  # type: ignore
+
+  USE_NUMPY = True
+except ImportError:
+  USE_NUMPY = False
+
 if sys.version_info >= (3, 8):
   from typing import Literal
 else:
@@ -87,6 +96,11 @@ class ItemizedResource(Resource, Generic[T], metaclass=ABCMeta):
 
     super().__init__(name, size_x, size_y, size_z, category=category, model=model)
 
+    # lookup tables, see `_index_of_identifier`, `index_of_item` and `_get_grid_size`
+    self._identifier_index: Dict[str, int] = {}
+    self._child_index: Optional[Dict[str, int]] = None
+    self._grid_size: Optional[Tuple[int, int]] = None
+
     if ordered_items is not None:
       if ordering is not None:
         raise ValueError("Cannot specify both `ordered_items` and `ordering`.")
@@ -106,6 +120,32 @@ class ItemizedResource(Resource, Generic[T], metaclass=ABCMeta):
       if identifier[0] not in LETTERS or not identifier[1:].isdigit():
         raise ValueError("Ordering must be in the transposed Excel style notation, e.g. 'A1'.")
 
+    self._identifier_index = {identifier: i for i, identifier in enumerate(self._ordering)}
+
+  def _index_of_identifier(self, identifier: str) -> int:
+    """Get the index of the item with the given identifier, in constant time.
+
+    Raises:
+      ValueError: If there is no item with the identifier.
+    """
+    try:
+      return self._identifier_index[identifier]
+    except KeyError as e:
+      raise ValueError(f"'{identifier}' is not in the ordering of {self.name}.") from e
+
+  def assign_child_resource(
+    self,
+    resource: Resource,
+    location: Optional[Coordinate],
+    reassign: bool = True,
+  ):
+    self._child_index = None
+    super().assign_child_resource(resource, location=location, reassign=reassign)
+
+  def unassign_child_resource(self, resource: Resource):
+    self._child_index = None
+    super().unassign_child_resource(resource)
+
   def __getitem__(
     self,
     identifier: Union[str, int, Sequence[int], Sequence[str], slice, range],
@@ -155,11 +195,11 @@ class ItemizedResource(Resource, Generic[T], metaclass=ABCMeta):
     if isinstance(identifier, (slice, range)):
       start, stop = identifier.start, identifier.stop
       if isinstance(identifier.start, str):
-        start = self._ordering.index(identifier.start)
+        start = self._index_of_identifier(identifier.start)
       elif identifier.start is None:
         start = 0
       if isinstance(identifier.stop, str):
-        stop = self._ordering.index(identifier.stop)
+        stop = self._index_of_identifier(identifier.stop)
       elif identifier.stop is None:
         stop = self.num_items
       identifier = list(range(start, stop, identifier.step or 1))
@@ -188,7 +228,7 @@ class ItemizedResource(Resource, Generic[T], metaclass=ABCMeta):
       identifier = LETTERS[row] + str(column + 1)  # standard transposed-Excel style notation
     if isinstance(identifier, str):
       try:
-        identifier = self._ordering.index(identifier)
+        identifier = self._index_of_identifier(identifier)
       except ValueError as e:
         raise IndexError(
           f"Item with identifier '{identifier}' does not exist on " f"resource '{self.name}'."
@@ -320,59 +360,58 @@ class ItemizedResource(Resource, Generic[T], metaclass=ABCMeta):
         yield batch
         start += batch_size
 
-    if direction == "up":
-      # start at the bottom, and go up in each column
-      indices = [(8 * y + x) for y in range(12) for x in range(7, -1, -1)]
-    elif direction == "down":
+    if direction == "down":
       # start at the top, and go down in each column. This is how the items are stored in the
       # list, so no need to do anything special.
       indices = list(range(self.num_items))
-    elif direction == "right":
-      # Start at the top left, and go right in each row
-      indices = [(8 * y + x) for x in range(8) for y in range(0, 12)]
-    elif direction == "left":
-      # Start at the top right, and go left in each row
-      indices = [(8 * y + x) for x in range(8) for y in range(11, -1, -1)]
-    elif direction == "snake_right":
-      top_right = 88
-      indices = []
-      for x in range(8):
-        if x % 2 == 0:
-          # even rows go left to right
-          indices.extend((8 * y + x) for y in range(0, 12))
-        else:
-          # odd rows go right to left
-          indices.extend((top_right + x - 8 * y) for y in range(0, 12))
-    elif direction == "snake_down":
-      top_right = 88
-      indices = []
-      for x in range(12):
-        if x % 2 == 0:
-          # even columns go top to bottom
-          indices.extend(8 * x + y for y in range(0, 8))
-        else:
-          # odd columns go bottom to top
-          indices.extend(8 * x + (7 - y) for y in range(0, 8))
-    elif direction == "snake_left":
-      top_right = 88
-      indices = []
-      for x in range(8):
-        if x % 2 == 0:
-          # even rows go right to left
-          indices.extend((8 * y + x) for y in range(11, -1, -1))
-        else:
-          # odd rows go left to right
-          indices.extend((top_right + x - 8 * y) for y in range(11, -1, -1))
-    elif direction == "snake_up":
-      top_right = 88
-      indices = []
-      for x in range(12):
-        if x % 2 == 0:
-          # even columns go bottom to top
-          indices.extend(8 * x + y for y in range(7, -1, -1))
-        else:
-          # odd columns go top to bottom
-          indices.extend(8 * x + (7 - y) for y in range(7, -1, -1))
+    elif direction in {"up", "right", "left", "snake_right", "snake_down", "snake_left", "snake_up"}:
+      num_y, num_x = self._get_grid_size()
+      top_right = num_y * (num_x - 1)
+      if direction == "up":
+        # start at the bottom, and go up in each column
+        indices = [(num_y * y + x) for y in range(num_x) for x in range(num_y - 1, -1, -1)]
+      elif direction == "right":
+        # Start at the top left, and go right in each row
+        indices = [(num_y * y + x) for x in range(num_y) for y in range(0, num_x)]
+      elif direction == "left":
+        # Start at the top right, and go left in each row
+        indices = [(num_y * y + x) for x in range(num_y) for y in range(num_x - 1, -1, -1)]
+      elif direction == "snake_right":
+        indices = []
+        for x in range(num_y):
+          if x % 2 == 0:
+            # even rows go left to right
+            indices.extend((num_y * y + x) for y in range(0, num_x))
+          else:
+            # odd rows go right to left
+            indices.extend((top_right + x - num_y * y) for y in range(0, num_x))
+      elif direction == "snake_down":
+        indices = []
+        for x in range(num_x):
+          if x % 2 == 0:
+            # even columns go top to bottom
+            indices.extend(num_y * x + y for y in range(0, num_y))
+          else:
+            # odd columns go bottom to top
+            indices.extend(num_y * x + (num_y - 1 - y) for y in range(0, num_y))
+      elif direction == "snake_left":
+        indices = []
+        for x in range(num_y):
+          if x % 2 == 0:
+            # even rows go right to left
+            indices.extend((num_y * y + x) for y in range(num_x - 1, -1, -1))
+          else:
+            # odd rows go left to right
+            indices.extend((top_right + x - num_y * y) for y in range(num_x - 1, -1, -1))
+      else:  # snake_up
+        indices = []
+        for x in range(num_x):
+          if x % 2 == 0:
+            # even columns go bottom to top
+            indices.extend(num_y * x + y for y in range(num_y - 1, -1, -1))
+          else:
+            # odd columns go top to bottom
+            indices.extend(num_y * x + (num_y - 1 - y) for y in range(num_y - 1, -1, -1))
     else:
       raise ValueError(f"Invalid direction '{direction}'.")
 
@@ -433,9 +472,11 @@ class ItemizedResource(Resource, Generic[T], metaclass=ABCMeta):
 
   def index_of_item(self, item: T) -> Optional[int]:
     """Return the index of the given item in the resource, or `None` if not found."""
-    for i, i_item in enumerate(self.children):
-      if i_item == item:
-        return i
+    if self._child_index is None:
+      self._child_index = {child.name: i for i, child in enumerate(self.children)}
+    index = self._child_index.get(item.name)
+    if index is not None and (self.children[index] is item or self.children[index] == item):
+      return index
     return None
 
   def get_child_identifier(self, item: T) -> str:
@@ -451,7 +492,73 @@ class ItemizedResource(Resource, Generic[T], metaclass=ABCMeta):
 
     return self.get_items(range(self.num_items))
 
-  def _get_grid_size(self, identifiers) -> Tuple[int, int]:
+  def _check_items(self, items: Optional[Sequence[T]]) -> List[T]:
+    if items is None:
+      return self.get_all_items()
+    for item in items:
+      if item.parent is not self:
+        raise ValueError(f"Item {item.name} is not a child of {self.name}.")
+    return list(items)
+
+  def get_absolute_locations_array(
+    self,
+    items: Optional[Sequence[T]] = None,
+    x: str = "l",
+    y: str = "f",
+    z: str = "b",
+  ) -> "np.ndarray":
+    """Get the absolute locations of the given anchor of many items as an `(N, 3)` numpy array,
+    computed in one vectorized pass. Requires numpy.
+
+    Unlike :meth:`~pylabrobot.resources.resource.Resource.get_absolute_location`, the locations
+    are not rounded to 4 decimals.
+
+    Args:
+      items: The items, all children of this resource. Defaults to all items, in the order of
+        :meth:`get_all_items`.
+      x: `"l"`/`"left"`, `"c"`/`"center"`, or `"r"`/`"right"`
+      y: `"b"`/`"back"`, `"c"`/`"center"`, or `"f"`/`"front"`
+      z: `"t"`/`"top"`, `"c"`/`"center"`, or `"b"`/`"bottom"`
+    """
+
+    if not USE_NUMPY:
+      raise RuntimeError("numpy is not installed. Use get_absolute_location on each item instead.")
+
+    items = self._check_items(items)
+    item_locations: List[List[float]] = []
+    for item in items:
+      if item.location is None:
+        raise NoLocationError(f"Resource {item.name} has no location.")
+      item_locations.append(item.location.vector())
+
+    origin = np.array(self._get_absolute_transform().translation, dtype=np.float64)
+    rotation_matrix = np.array(self._get_absolute_rotation_matrix(), dtype=np.float64)
+    locations = np.array(item_locations, dtype=np.float64).reshape(-1, 3)
+    anchors = np.array(
+      [item.get_anchor(x=x, y=y, z=z).vector() for item in items], dtype=np.float64
+    ).reshape(-1, 3)
+
+    absolute_locations: np.ndarray
+    if all(_is_zero_rotation(item) for item in items):
+      absolute_locations = origin + (locations + anchors) @ rotation_matrix.T
+      return absolute_locations
+
+    item_matrices = np.array(
+      [item._get_absolute_rotation_matrix() for item in items], dtype=np.float64
+    )
+    rotated_anchors = np.einsum("nij,nj->ni", item_matrices, anchors)
+    absolute_locations = origin + locations @ rotation_matrix.T + rotated_anchors
+    return absolute_locations
+
+  def _get_grid_size(self) -> Tuple[int, int]:
+    """Get the number of rows and columns of the grid, or raise an error if not a full grid. The
+    size is computed once, the ordering does not change after initialization."""
+    if self._grid_size is None:
+      self._grid_size = self._compute_grid_size(self._ordering)
+    return self._grid_size
+
+  @staticmethod
+  def _compute_grid_size(identifiers) -> Tuple[int, int]:
     """Get the size of the grid from the identifiers, or raise an error if not a full grid."""
     rows_set, columns_set = set(), set()
     for identifier in identifiers:
@@ -472,14 +579,14 @@ class ItemizedResource(Resource, Generic[T], metaclass=ABCMeta):
   def num_items_x(self) -> int:
     """The number of items in the x direction, if the resource is a full grid. If the resource is
     not a full grid, an error will be raised."""
-    _, num_items_x = self._get_grid_size(self._ordering)
+    _, num_items_x = self._get_grid_size()
     return num_items_x
 
   @property
   def num_items_y(self) -> int:
     """The number of items in the y direction, if the resource is a full grid. If the resource is
     not a full grid, an error will be raised."""
-    num_items_y, _ = self._get_grid_size(self._ordering)
+    num_items_y, _ = self._get_grid_size()
     return num_items_y
 
   @property
@@ -493,3 +600,7 @@ class ItemizedResource(Resource, Generic[T], metaclass=ABCMeta):
   def row(self, row: int) -> List[T]:
     """Get all items in the given row."""
     return self[row :: self.num_items_y]
+
+
+def _is_zero_rotation(resource: Resource) -> bool:
+  return resource.rotation.x == resource.rotation.y == resource.rotation.z == 0
@@ -1,6 +1,6 @@
 import sys
 import unittest
-from typing import List
+from typing import List, cast
 
 from pylabrobot.resources import (
   Coordinate,
@@ -9,6 +9,7 @@ from pylabrobot.resources import (
   create_equally_spaced_2d,
   create_ordered_items_2d,
 )
+from pylabrobot.resources.itemized_resource import USE_NUMPY
 
 if sys.version_info >= (3, 8):
   from typing import Literal
@@ -82,6 +83,16 @@ class TestItemizedResource(unittest.TestCase):
       Coordinate(99, 0, 0),
     )
 
+  @unittest.skipIf(not USE_NUMPY, "requires numpy")
+  def test_get_absolute_locations_array(self):
+    self.plate.location = Coordinate(10, 20, 30)
+    self.plate.rotate(z=90)
+    locations = self.plate.get_absolute_locations_array(x="c", y="c", z="t")
+    self.assertEqual(locations.shape, (96, 3))
+    for row, well in zip(locations, self.plate.get_all_items()):
+      for a, b in zip(row, well.get_absolute_location(x="c", y="c", z="t").vector()):
+        self.assertAlmostEqual(a, b, places=3)
+
   def test_getitem_int(self):
     self.assertEqual(self.plate[0][0].name, "plate_well_0_0")
 
@@ -963,6 +974,53 @@ class TestItemizedResource(unittest.TestCase):
       ],
     )
 
+  def test_get_item_unknown_identifier(self):
+    with self.assertRaises(IndexError):
+      self.plate.get_item("Z1")
+    with self.assertRaises(ValueError):
+      self.plate["A1":"Z1"]  # pylint: disable=pointless-statement
+
+  def test_index_of_item(self):
+    well = self.plate.get_item("C3")
+    self.assertEqual(self.plate.index_of_item(well), 18)
+    self.assertEqual(self.plate.get_child_identifier(well), "C3")
+    self.assertIsNone(self.plate.index_of_item(Well("other", size_x=1, size_y=1, size_z=1)))
+
+    self.plate.unassign_child_resource(well)
+    self.assertIsNone(self.plate.index_of_item(well))
+    self.assertEqual(self.plate.index_of_item(cast(Well, self.plate.children[18])), 18)
+
+  def test_384_well_plate(self):
+    plate = Plate(
+      "plate_384",
+      size_x=1,
+      size_y=1,
+      size_z=1,
+      ordered_items=create_ordered_items_2d(
+        Well,
+        num_items_x=24,
+        num_items_y=16,
+        dx=0,
+        dy=0,
+        dz=0,
+        item_dx=4.5,
+        item_dy=4.5,
+        size_x=4,
+        size_y=4,
+        size_z=4,
+      ),
+    )
+    self.assertEqual((plate.num_items_x, plate.num_items_y), (24, 16))
+    self.assertEqual(plate.get_item("P24").name, "plate_384_well_23_15")
+    self.assertEqual(len(plate.get_items("A1:P24")), 384)
+    self.assertEqual([w.name for w in plate.row(15)][-1], "plate_384_well_23_15")
+    self.assertEqual([w.name for w in plate.column(23)][0], "plate_384_well_23_0")
+
+    batches = list(plate.traverse(batch_size=24, direction="right"))
+    self.assertEqual(batches[1], plate.row(1))
+    batches = list(plate.traverse(batch_size=16, direction="snake_down"))
+    self.assertEqual(batches[1], plate.column(1)[::-1])
+
 
 class TestCreateEquallySpaced(unittest.TestCase):
   """Test for create_ordered_items_2d function."""
@@ -0,0 +1,102 @@
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, MutableSet, Optional, cast
+
+from pylabrobot.resources.liquid import Liquid
+from pylabrobot.serializer import deserialize, serialize
+
+# Registry of interned liquids. Ids are local to the process and are never serialized. `None` and
+# the members of `Liquid` are interned first, so that common liquids have small ids.
+_liquids: List[Hashable] = [None, *Liquid]
+_liquid_ids: Dict[Hashable, int] = {liquid: i for i, liquid in enumerate(_liquids)}
+
+
+def intern_liquid(liquid: Hashable) -> int:
+  """Get the small integer id of a liquid, registering the liquid if it is new."""
+  liquid_id = _liquid_ids.get(liquid)
+  if liquid_id is None:
+    liquid_id = _liquid_ids[liquid] = len(_liquids)
+    _liquids.append(liquid)
+  return liquid_id
+
+
+def get_interned_liquid(liquid_id: int) -> Hashable:
+  """Get the liquid with the given id."""
+  return _liquids[liquid_id]
+
+
+class LiquidHistory(MutableSet):
+  """A set of liquids, stored as a bitset over interned liquid ids.
+
+  Behaves like a `set` of liquids. Unions and subset checks with other histories are single
+  bitwise operations on `bits`, regardless of the number of distinct liquids.
+  """
+
+  __slots__ = ("bits",)
+
+  def __init__(self, liquids: Iterable[Hashable] = (), bits: int = 0):
+    self.bits = bits
+    for liquid in liquids:
+      self.add(liquid)
+
+  def __contains__(self, liquid: object) -> bool:
+    liquid_id = _liquid_ids.get(liquid)  # type: ignore[call-overload]
+    return liquid_id is not None and (self.bits >> liquid_id) & 1 == 1
+
+  def __iter__(self) -> Iterator[Hashable]:
+    bits = self.bits
+    while bits:
+      lowest = bits & -bits
+      yield _liquids[lowest.bit_length() - 1]
+      bits ^= lowest
+
+  def __len__(self) -> int:
+    return bin(self.bits).count("1")
+
+  def add(self, liquid: Hashable) -> None:
+    self.bits |= 1 << intern_liquid(liquid)
+
+  def discard(self, liquid: Hashable) -> None:
+    liquid_id = _liquid_ids.get(liquid)
+    if liquid_id is not None:
+      self.bits &= ~(1 << liquid_id)
+
+  def update(self, *others: Iterable[Hashable]) -> None:
+    for other in others:
+      if isinstance(other, LiquidHistory):
+        self.bits |= other.bits
+      else:
+        for liquid in other:
+          self.add(liquid)
+
+  def clear(self) -> None:
+    self.bits = 0
+
+  def issubset(self, other: Iterable[Hashable]) -> bool:
+    if isinstance(other, LiquidHistory):
+      return self.bits & ~other.bits == 0
+    return self <= (other if isinstance(other, (set, frozenset)) else set(other))
+
+  def copy(self) -> "LiquidHistory":
+    return LiquidHistory(bits=self.bits)
+
+  def __repr__(self) -> str:
+    return repr(set(self)) if self.bits else "set()"
+
+  def serialize(self) -> List[Any]:
+    """Serialize the history as a list of serialized liquids. Members of
+    :class:`~pylabrobot.resources.liquid.Liquid` are serialized by name, so the result does not
+    depend on the ids of the liquids."""
+    return [serialize(liquid) for liquid in self]
+
+  @staticmethod
+  def deserialize(data: Optional[List[Any]]) -> "LiquidHistory":
+    """Deserialize a history. Names of members of :class:`~pylabrobot.resources.liquid.Liquid`
+    are loaded as the members."""
+    if data is None:
+      return LiquidHistory()
+    return LiquidHistory(_deserialize_liquid(liquid) for liquid in data)
+
+
+def _deserialize_liquid(data: Any) -> Hashable:
+  if isinstance(data, str) and data in Liquid.__members__:
+    return Liquid[data]
+  return cast(Hashable, deserialize(data))
@@ -0,0 +1,50 @@
+import unittest
+
+from pylabrobot.resources.liquid import Liquid
+from pylabrobot.resources.liquid_history import LiquidHistory
+from pylabrobot.resources.volume_tracker import VolumeTracker
+
+
+class TestLiquidHistory(unittest.TestCase):
+  def test_set(self):
+    history = LiquidHistory([Liquid.WATER, None])
+    history.add(Liquid.DMSO)
+    history.add(Liquid.WATER)
+    self.assertEqual(len(history), 3)
+    self.assertIn(Liquid.WATER, history)
+    self.assertNotIn(Liquid.ETHANOL, history)
+    self.assertEqual(set(history), {None, Liquid.WATER, Liquid.DMSO})
+    history.discard(Liquid.WATER)
+    self.assertEqual(set(history), {None, Liquid.DMSO})
+    self.assertEqual(repr(LiquidHistory()), "set()")
+
+  def test_update_issubset(self):
+    tip = LiquidHistory([Liquid.WATER])
+    well = LiquidHistory([Liquid.WATER, Liquid.DMSO])
+    self.assertTrue(tip.issubset(well))
+    self.assertTrue(tip.issubset({Liquid.WATER}))
+    tip.update(well, ["custom liquid"])
+    self.assertEqual(set(tip), {Liquid.WATER, Liquid.DMSO, "custom liquid"})
+    self.assertFalse(tip.issubset(well))
+
+  def test_serialize(self):
+    history = LiquidHistory([None, Liquid.ETHANOL])
+    data = history.serialize()
+    self.assertEqual(set(data), {None, "ETHANOL"})
+    self.assertEqual(set(LiquidHistory.deserialize(data)), {None, Liquid.ETHANOL})
+
+    history = LiquidHistory([None, "another custom liquid"])
+    data = history.serialize()
+    self.assertEqual(set(LiquidHistory.deserialize(data)), {None, "another custom liquid"})
+    self.assertEqual(len(LiquidHistory.deserialize(None)), 0)
+
+  def test_volume_tracker(self):
+    tracker = VolumeTracker(max_volume=100, liquid_history={Liquid.WATER})
+    tracker.add_liquid(Liquid.DMSO, 10)
+    self.assertIsInstance(tracker.liquid_history, LiquidHistory)
+    self.assertEqual(set(tracker.liquid_history), {Liquid.WATER, Liquid.DMSO})
+
+    state = tracker.serialize()
+    tracker.liquid_history.clear()
+    tracker.load_state(state)
+    self.assertEqual(set(tracker.liquid_history), {Liquid.WATER, Liquid.DMSO})
@@ -16,6 +16,7 @@ from pylabrobot.resources.resource_holder import get_child_location
 
 from .itemized_resource import ItemizedResource
 from .liquid import Liquid
+from .plate_volume_tracker import PlateVolumeTracker
 from .resource import Coordinate, Resource
 
 if TYPE_CHECKING:
@@ -101,6 +102,7 @@ class Plate(ItemizedResource["Well"]):
     )
     self._lid: Optional[Lid] = None
     self.plate_type = plate_type
+    self.array_volume_tracker: Optional[PlateVolumeTracker] = None
 
     if lid is not None:
       self.assign_child_resource(lid)
@@ -199,6 +201,7 @@ class Plate(ItemizedResource["Well"]):
       liquids = cast(List[List[Tuple[Optional["Liquid"], float]]], liquids)
       liquids = [list(column) for column in zip(*liquids)]  # transpose the list of lists
       liquids = [volume for column in liquids for volume in column]  # flatten the list of lists
+    liquids = cast(List[Tuple[Optional["Liquid"], float]], liquids)
 
     if len(liquids) != self.num_items:
       raise ValueError(
@@ -206,6 +209,18 @@ class Plate(ItemizedResource["Well"]):
         f"({self.num_items}) in plate '{self.name}'."
       )
 
+    if self.array_volume_tracker is not None:
+      if len(set(liquids)) == 1:
+        self.array_volume_tracker.fill(*liquids[0])
+      else:
+        self.array_volume_tracker.set_liquids([[liquid] for liquid in liquids])
+      for well, (liquid, _) in zip(self.get_all_items(), liquids):
+        if not well.tracker.is_cross_contamination_tracking_disabled:
+          well.tracker.liquid_history.add(liquid)
+        if well.tracker._callback is not None:
+          well.tracker._callback()
+      return
+
     for i, (liquid, volume) in enumerate(liquids):
       well = self.get_well(i)
       well.tracker.set_liquids([(liquid, volume)])  # type: ignore
@@ -222,6 +237,36 @@ class Plate(ItemizedResource["Well"]):
     for well in self.get_all_items():
       well.tracker.enable()
 
+  def enable_array_volume_tracking(self) -> PlateVolumeTracker:
+    """Track the volumes of all wells in the plate in numpy arrays.
+
+    The volume tracker of each well is replaced by a view over a row of a single
+    :class:`~pylabrobot.resources.plate_volume_tracker.PlateVolumeTracker`, which keeps the state of
+    the current trackers. This avoids copying lists of liquids on every operation, and allows
+    setting, committing and rolling back the liquids of many wells at once. Requires numpy.
+
+    Returns:
+      The plate volume tracker, also available as `array_volume_tracker`.
+    """
+
+    if self.array_volume_tracker is not None:
+      return self.array_volume_tracker
+
+    wells = self.get_all_items()
+    tracker = PlateVolumeTracker(max_volumes=[well.tracker.max_volume for well in wells])
+    for i, well in enumerate(wells):
+      old = well.tracker
+      new = tracker.get_well_tracker(i)
+      new.liquids = old.liquids
+      new.pending_liquids = old.pending_liquids
+      new.liquid_history = old.liquid_history
+      new._is_disabled = old.is_disabled
+      new._is_cross_contamination_tracking_disabled = old.is_cross_contamination_tracking_disabled
+      new._callback = old._callback
+      well.tracker = new
+    self.array_volume_tracker = tracker
+    return tracker
+
   def get_quadrant(
     self,
     quadrant: Literal[
@@ -0,0 +1,472 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, cast
+
+from pylabrobot.resources.errors import TooLittleLiquidError, TooLittleVolumeError
+from pylabrobot.resources.liquid import Liquid
+from pylabrobot.resources.volume_tracker import VolumeTracker
+
+try:
+  import numpy as np  # type: ignore
+
+  USE_NUMPY = True
+except ImportError:
+  USE_NUMPY = False
+
+
+class PlateVolumeTracker:
+  """Tracks the liquids in all wells of a plate in numpy arrays.
+
+  The liquids in a well are a stack of layers, from bottom to top. Layer `j` of well `i` holds
+  `volumes[i, j]` uL of the liquid with id `liquid_ids[i, j]`, and only the first `num_layers[i]`
+  layers of a well are used. Liquids are stored as ids into a table shared by all wells, where id
+  0 is `None`. Operations are applied to the `pending_*` arrays, and copied to the committed arrays
+  by :meth:`commit`.
+
+  The per-well :class:`~pylabrobot.resources.volume_tracker.VolumeTracker` API is available
+  through :meth:`get_well_tracker`, which returns a view over row `i` of the arrays. Use
+  :meth:`~pylabrobot.resources.plate.Plate.enable_array_volume_tracking` to use this tracker for
+  the wells of a plate.
+  """
+
+  def __init__(self, max_volumes: Sequence[float], max_layers: int = 2):
+    """Create a new plate volume tracker.
+
+    Args:
+      max_volumes: The maximum volume of each well.
+      max_layers: The initial number of layers per well. The arrays grow when a well needs more.
+    """
+
+    if not USE_NUMPY:
+      raise RuntimeError("numpy is not installed. Use the per-well VolumeTracker instead.")
+
+    num_wells = len(max_volumes)
+    self.max_volumes = np.array(max_volumes, dtype=float)
+    self.volumes = np.zeros((num_wells, max_layers))
+    self.liquid_ids = np.zeros((num_wells, max_layers), dtype=np.int32)
+    self.num_layers = np.zeros(num_wells, dtype=np.int32)
+    self.pending_volumes = np.zeros_like(self.volumes)
+    self.pending_liquid_ids = np.zeros_like(self.liquid_ids)
+    self.pending_num_layers = np.zeros_like(self.num_layers)
+
+    self._liquids: List[Optional[Liquid]] = [None]
+    self._liquid_ids: Dict[Optional[Liquid], int] = {None: 0}
+    self._update_buffers()
+
+  @property
+  def num_wells(self) -> int:
+    return len(self.max_volumes)
+
+  @property
+  def max_layers(self) -> int:
+    return int(self.volumes.shape[1])
+
+  def get_liquid_id(self, liquid: Optional[Liquid]) -> int:
+    """Get the id of a liquid in the liquid table, adding it if it is not there yet."""
+    liquid_id = self._liquid_ids.get(liquid)
+    if liquid_id is None:
+      liquid_id = self._liquid_ids[liquid] = len(self._liquids)
+      self._liquids.append(liquid)
+    return liquid_id
+
+  def get_liquid(self, liquid_id: int) -> Optional[Liquid]:
+    return self._liquids[liquid_id]
+
+  def _grow(self, layers: int) -> None:
+    """Make sure every well has room for at least `layers` layers."""
+    if layers <= self.max_layers:
+      return
+    extra = max(layers, 2 * self.max_layers) - self.max_layers
+
+    def pad(a):
+      return np.concatenate([a, np.zeros((self.num_wells, extra), dtype=a.dtype)], axis=1)
+
+    self.volumes, self.pending_volumes = pad(self.volumes), pad(self.pending_volumes)
+    self.liquid_ids, self.pending_liquid_ids = pad(self.liquid_ids), pad(self.pending_liquid_ids)
+    self._update_buffers()
+
+  def _update_buffers(self) -> None:
+    """Create memoryviews of the arrays. Reading and writing single elements of a memoryview is
+    about twice as fast as indexing the array, which matters for the per-well operations."""
+    self._committed_buffers: Tuple[Any, Any, Any] = (
+      memoryview(cast(Any, self.liquid_ids)),
+      memoryview(cast(Any, self.volumes)),
+      memoryview(cast(Any, self.num_layers)),
+    )
+    self._pending_buffers: Tuple[Any, Any, Any] = (
+      memoryview(cast(Any, self.pending_liquid_ids)),
+      memoryview(cast(Any, self.pending_volumes)),
+      memoryview(cast(Any, self.pending_num_layers)),
+    )
+
+  def _indices(self, indices: Optional[Sequence[int]]):
+    if indices is None:
+      return np.arange(self.num_wells)
+    return np.asarray(indices, dtype=np.intp)
+
+  def set_liquids(
+    self,
+    liquids: Sequence[Sequence[Tuple[Optional[Liquid], float]]],
+    indices: Optional[Sequence[int]] = None,
+  ) -> None:
+    """Set the liquids in wells, both committed and pending.
+
+    Args:
+      liquids: The layers of liquid for each well, bottom to top.
+      indices: The wells to set. Defaults to all wells.
+    """
+    self._write(liquids, self._indices(indices), committed=True, pending=True)
+
+  def _write(
+    self,
+    liquids: Sequence[Sequence[Tuple[Optional[Liquid], float]]],
+    rows,
+    committed: bool,
+    pending: bool,
+  ) -> None:
+    if len(liquids) != len(rows):
+      raise ValueError(f"Got liquids for {len(liquids)} wells, but {len(rows)} indices.")
+    num_layers = [len(well_liquids) for well_liquids in liquids]
+    self._grow(max(num_layers, default=0))
+
+    padding = [[(None, 0.0)] * (self.max_layers - n) for n in num_layers]
+    ids = np.array(
+      [
+        [self.get_liquid_id(liquid) for liquid, _ in list(well_liquids) + pad]
+        for well_liquids, pad in zip(liquids, padding)
+      ],
+      dtype=np.int32,
+    ).reshape(len(rows), self.max_layers)
+    volumes = np.array(
+      [
+        [volume for _, volume in list(well_liquids) + pad]
+        for well_liquids, pad in zip(liquids, padding)
+      ],
+      dtype=float,
+    ).reshape(len(rows), self.max_layers)
+
+    targets = []
+    if committed:
+      targets.append((self.liquid_ids, self.volumes, self.num_layers))
+    if pending:
+      targets.append((self.pending_liquid_ids, self.pending_volumes, self.pending_num_layers))
+    for target_ids, target_volumes, target_num_layers in targets:
+      target_ids[rows] = ids
+      target_volumes[rows] = volumes
+      target_num_layers[rows] = num_layers
+
+  def _write_row(
+    self, index: int, liquids: Sequence[Tuple[Optional[Liquid], float]], pending: bool
+  ) -> None:
+    """Fast path of :meth:`_write` for a single well."""
+    n = len(liquids)
+    if n > self.volumes.shape[1]:
+      self._grow(n)
+    if pending:
+      ids, vols, num_layers = self.pending_liquid_ids, self.pending_volumes, self.pending_num_layers
+    else:
+      ids, vols, num_layers = self.liquid_ids, self.volumes, self.num_layers
+    if n > 0:
+      ids[index, :n] = [self.get_liquid_id(liquid) for liquid, _ in liquids]
+      vols[index, :n] = [volume for _, volume in liquids]
+    ids[index, n:] = 0
+    vols[index, n:] = 0
+    num_layers[index] = n
+
+  def _copy_row(self, index: int, to_pending: bool) -> None:
+    """Fast path of :meth:`commit` and :meth:`rollback` for a single well.
+
+    Layers above the layer count of a well are always zero, so only the layers used by either
+    copy are written.
+    """
+    if to_pending:
+      src, dst = self._committed_buffers, self._pending_buffers
+    else:
+      src, dst = self._pending_buffers, self._committed_buffers
+    src_ids, src_vols, src_num_layers = src
+    dst_ids, dst_vols, dst_num_layers = dst
+    n = src_num_layers[index]
+    for j in range(max(n, dst_num_layers[index])):
+      dst_ids[index, j] = src_ids[index, j]
+      dst_vols[index, j] = src_vols[index, j]
+    dst_num_layers[index] = n
+
+  def _get_used_volume(self, index: int) -> float:
+    """Fast path of :meth:`get_used_volumes` for a single well, including pending operations."""
+    _, vols, num_layers = self._pending_buffers
+    used = 0.0
+    for j in range(num_layers[index]):
+      used += vols[index, j]
+    return used
+
+  def fill(
+    self,
+    liquid: Optional[Liquid],
+    volumes: Union[float, Sequence[float]],
+    indices: Optional[Sequence[int]] = None,
+  ) -> None:
+    """Set a single layer of `liquid` in wells, both committed and pending.
+
+    Args:
+      liquid: The liquid.
+      volumes: The volume for each well, or a single volume for all wells.
+      indices: The wells to set. Defaults to all wells.
+    """
+
+    rows = self._indices(indices)
+    liquid_id = self.get_liquid_id(liquid)
+    for ids, vols, num_layers in (
+      (self.liquid_ids, self.volumes, self.num_layers),
+      (self.pending_liquid_ids, self.pending_volumes, self.pending_num_layers),
+    ):
+      ids[rows] = 0
+      ids[rows, 0] = liquid_id
+      vols[rows] = 0
+      vols[rows, 0] = volumes
+      num_layers[rows] = 1
+
+  def get_used_volumes(self, pending: bool = True):
+    """The used volume of each well, as an array. Includes pending operations by default."""
+    return (self.pending_volumes if pending else self.volumes).sum(axis=1)
+
+  def get_free_volumes(self, pending: bool = True):
+    """The free volume of each well, as an array. Includes pending operations by default."""
+    return self.max_volumes - self.get_used_volumes(pending=pending)
+
+  def get_well_liquids(
+    self, index: int, pending: bool = True
+  ) -> List[Tuple[Optional[Liquid], float]]:
+    """The layers of liquid in a well, bottom to top."""
+    if pending:
+      ids, vols, num_layers = self.pending_liquid_ids, self.pending_volumes, self.pending_num_layers
+    else:
+      ids, vols, num_layers = self.liquid_ids, self.volumes, self.num_layers
+    n = int(num_layers[index])
+    return [
+      (self._liquids[liquid_id], volume)
+      for liquid_id, volume in zip(ids[index, :n].tolist(), vols[index, :n].tolist())
+    ]
+
+  def add_liquid(
+    self,
+    liquid: Optional[Liquid],
+    volumes: Union[float, Sequence[float]],
+    indices: Optional[Sequence[int]] = None,
+  ) -> None:
+    """Add `liquid` to the top of wells (pending).
+
+    Args:
+      liquid: The liquid to add.
+      volumes: The volume for each well, or a single volume for all wells.
+      indices: The wells to add to, without duplicates. Defaults to all wells.
+
+    Raises:
+      TooLittleVolumeError: If a well does not have enough free volume. Nothing is added then.
+    """
+
+    rows = self._indices(indices)
+    vols = np.broadcast_to(np.asarray(volumes, dtype=float), rows.shape)
+    free = self.max_volumes[rows] - self.pending_volumes[rows].sum(axis=1)
+    too_much = np.flatnonzero(vols > free)
+    if len(too_much) > 0:
+      i = too_much[0]
+      raise TooLittleVolumeError(
+        f"Container has too little volume: {vols[i]}uL > {free[i]}uL (well {rows[i]})."
+      )
+
+    liquid_id = self.get_liquid_id(liquid)
+    num_layers = self.pending_num_layers[rows]
+    top = np.maximum(num_layers - 1, 0)
+    same = (num_layers > 0) & (self.pending_liquid_ids[rows, top] == liquid_id)
+    self.pending_volumes[rows[same], top[same]] += vols[same]
+
+    new = ~same
+    if new.any():
+      self._grow(int(num_layers[new].max()) + 1)
+      self.pending_liquid_ids[rows[new], num_layers[new]] = liquid_id
+      self.pending_volumes[rows[new], num_layers[new]] = vols[new]
+      self.pending_num_layers[rows[new]] += 1
+
+  def remove_liquid(
+    self,
+    volumes: Union[float, Sequence[float]],
+    indices: Optional[Sequence[int]] = None,
+  ) -> None:
+    """Remove liquid from the top of wells (pending).
+
+    Args:
+      volumes: The volume for each well, or a single volume for all wells.
+      indices: The wells to remove from, without duplicates. Defaults to all wells.
+
+    Raises:
+      TooLittleLiquidError: If a well does not have enough liquid. Nothing is removed then.
+    """
+
+    rows = self._indices(indices)
+    remaining = np.array(np.broadcast_to(np.asarray(volumes, dtype=float), rows.shape))
+    used = self.pending_volumes[rows].sum(axis=1)
+    too_much = np.flatnonzero(remaining > used)
+    if len(too_much) > 0:
+      i = too_much[0]
+      raise TooLittleLiquidError(
+        f"Container has too little liquid: {remaining[i]}uL > {used[i]}uL (well {rows[i]})."
+      )
+
+    # remove one layer per iteration, at most max_layers times
+    while True:
+      active = (remaining > 0) & (self.pending_num_layers[rows] > 0)
+      if not active.any():
+        break
+      r = rows[active]
+      top = self.pending_num_layers[r] - 1
+      top_volumes = self.pending_volumes[r, top]
+      to_remove = remaining[active]
+
+      emptied = top_volumes <= to_remove
+      self.pending_volumes[r, top] = np.where(emptied, 0, top_volumes - to_remove)
+      self.pending_liquid_ids[r[emptied], top[emptied]] = 0
+      self.pending_num_layers[r[emptied]] -= 1
+      remaining[active] = np.where(emptied, to_remove - top_volumes, 0)
+
+  def commit(self, indices: Optional[Sequence[int]] = None) -> None:
+    """Commit the pending operations of wells. Defaults to all wells."""
+    if indices is None:
+      np.copyto(self.volumes, self.pending_volumes)
+      np.copyto(self.liquid_ids, self.pending_liquid_ids)
+      np.copyto(self.num_layers, self.pending_num_layers)
+      return
+    rows = self._indices(indices)
+    self.volumes[rows] = self.pending_volumes[rows]
+    self.liquid_ids[rows] = self.pending_liquid_ids[rows]
+    self.num_layers[rows] = self.pending_num_layers[rows]
+
+  def rollback(self, indices: Optional[Sequence[int]] = None) -> None:
+    """Roll back the pending operations of wells to the committed state. Defaults to all wells."""
+    if indices is None:
+      np.copyto(self.pending_volumes, self.volumes)
+      np.copyto(self.pending_liquid_ids, self.liquid_ids)
+      np.copyto(self.pending_num_layers, self.num_layers)
+      return
+    rows = self._indices(indices)
+    self.pending_volumes[rows] = self.volumes[rows]
+    self.pending_liquid_ids[rows] = self.liquid_ids[rows]
+    self.pending_num_layers[rows] = self.num_layers[rows]
+
+  def get_well_tracker(self, index: int) -> "WellVolumeTracker":
+    """Get a :class:`~pylabrobot.resources.volume_tracker.VolumeTracker` for well `index`."""
+    return WellVolumeTracker(self, index)
+
+
+class WellVolumeTracker(VolumeTracker):
+  """A :class:`~pylabrobot.resources.volume_tracker.VolumeTracker` for a single well, stored in a
+  row of a :class:`PlateVolumeTracker`."""
+
+  def __init__(self, plate_tracker: PlateVolumeTracker, index: int):
+    self._plate_tracker = plate_tracker
+    self._index = index
+    super().__init__(max_volume=float(plate_tracker.max_volumes[index]))
+
+  @property
+  def max_volume(self) -> float:  # type: ignore[override]
+    return float(self._plate_tracker.max_volumes[self._index])
+
+  @max_volume.setter
+  def max_volume(self, max_volume: float) -> None:
+    self._plate_tracker.max_volumes[self._index] = max_volume
+
+  @property
+  def liquids(self) -> List[Tuple[Optional[Liquid], float]]:  # type: ignore[override]
+    """A copy of the committed liquids. Assigning sets the committed liquids."""
+    return self._plate_tracker.get_well_liquids(self._index, pending=False)
+
+  @liquids.setter
+  def liquids(self, liquids: List[Tuple[Optional[Liquid], float]]) -> None:
+    self._plate_tracker._write_row(self._index, liquids, pending=False)
+
+  @property
+  def pending_liquids(self) -> List[Tuple[Optional[Liquid], float]]:  # type: ignore[override]
+    """A copy of the pending liquids. Assigning sets the pending liquids."""
+    return self._plate_tracker.get_well_liquids(self._index, pending=True)
+
+  @pending_liquids.setter
+  def pending_liquids(self, liquids: List[Tuple[Optional[Liquid], float]]) -> None:
+    self._plate_tracker._write_row(self._index, liquids, pending=True)
+
+  def set_liquids(self, liquids: List[Tuple[Optional[Liquid], float]]) -> None:
+    self._plate_tracker._write_row(self._index, liquids, pending=False)
+    self._plate_tracker._write_row(self._index, liquids, pending=True)
+
+    if not self.is_cross_contamination_tracking_disabled:
+      self.liquid_history.update([liquid[0] for liquid in liquids])
+
+    if self._callback is not None:
+      self._callback()
+
+  def remove_liquid(self, volume: float) -> List[Tuple[Optional[Liquid], float]]:
+    pt, i = self._plate_tracker, self._index
+    used_volume = pt._get_used_volume(i)
+    if volume > used_volume:
+      raise TooLittleLiquidError(f"Container has too little liquid: {volume}uL > {used_volume}uL.")
+
+    # remove layers from the top of the row, like `_remove_liquid` does for a list
+    ids, vols, num_layers = pt._pending_buffers
+    n = num_layers[i]
+    removed_liquids: List[Tuple[Optional[Liquid], float]] = []
+    removed_volume = 0.0
+    while removed_volume < volume and n > 0:
+      liquid, liquid_volume = pt._liquids[ids[i, n - 1]], vols[i, n - 1]
+      removed_volume += liquid_volume
+      if removed_volume > volume:
+        vols[i, n - 1] = removed_volume - volume
+        removed_liquids.append((liquid, liquid_volume - (removed_volume - volume)))
+      else:
+        n -= 1
+        ids[i, n] = 0
+        vols[i, n] = 0.0
+        removed_liquids.append((liquid, liquid_volume))
+    num_layers[i] = n
+
+    if self._callback is not None:
+      self._callback()
+
+    return removed_liquids
+
+  def add_liquid(self, liquid: Optional[Liquid], volume: float) -> None:
+    pt, i = self._plate_tracker, self._index
+    free_volume = pt.max_volumes.item(i) - pt._get_used_volume(i)
+    if volume > free_volume:
+      raise TooLittleVolumeError(f"Container has too little volume: {volume}uL > {free_volume}uL.")
+
+    if not self.is_cross_contamination_tracking_disabled:
+      if liquid is not None:
+        self.liquid_history.add(liquid)
+
+    # add to the top layer of the row if it holds the same liquid, like `_add_liquid` does
+    ids, vols, num_layers = pt._pending_buffers
+    n = num_layers[i]
+    if n > 0 and pt._liquids[ids[i, n - 1]] == liquid:
+      vols[i, n - 1] += volume
+    else:
+      if n == pt.max_layers:
+        pt._grow(n + 1)
+        ids, vols, num_layers = pt._pending_buffers
+      ids[i, n] = pt.get_liquid_id(liquid)
+      vols[i, n] = volume
+      num_layers[i] = n + 1
+
+    if self._callback is not None:
+      self._callback()
+
+  def get_used_volume(self) -> float:
+    return self._plate_tracker._get_used_volume(self._index)
+
+  def commit(self) -> None:
+    assert not self.is_disabled, "Volume tracker is disabled. Call `enable()`."
+
+    self._plate_tracker._copy_row(self._index, to_pending=False)
+
+    if self._callback is not None:
+      self._callback()
+
+  def rollback(self) -> None:
+    """Roll back the pending operations to the committed state."""
+    assert not self.is_disabled, "Volume tracker is disabled. Call `enable()`."
+    self._plate_tracker._copy_row(self._index, to_pending=True)
@@ -0,0 +1,124 @@
+import unittest
+from typing import List, Optional, Tuple, Union
+
+from pylabrobot.resources import Cor_96_wellplate_360ul_Fb
+from pylabrobot.resources.errors import TooLittleLiquidError, TooLittleVolumeError
+from pylabrobot.resources.liquid import Liquid
+from pylabrobot.resources.plate_volume_tracker import USE_NUMPY, PlateVolumeTracker
+
+
+@unittest.skipIf(not USE_NUMPY, "numpy is not installed")
+class TestPlateVolumeTracker(unittest.TestCase):
+  def setUp(self):
+    self.tracker = PlateVolumeTracker(max_volumes=[100] * 4, max_layers=1)
+
+  def test_set_liquids(self):
+    self.tracker.set_liquids([[(Liquid.WATER, 10)], [], [(None, 5), (Liquid.DMSO, 5)], []])
+    self.assertEqual(self.tracker.get_used_volumes().tolist(), [10, 0, 10, 0])
+    self.assertEqual(self.tracker.get_well_liquids(2), [(None, 5), (Liquid.DMSO, 5)])
+    self.assertEqual(self.tracker.get_well_liquids(2, pending=False), [(None, 5), (Liquid.DMSO, 5)])
+
+    self.tracker.fill(Liquid.ETHANOL, [1, 2], indices=[0, 2])
+    self.assertEqual(self.tracker.get_well_liquids(2), [(Liquid.ETHANOL, 2)])
+
+  def test_well_tracker_rows(self):
+    well = self.tracker.get_well_tracker(3)
+    well.add_liquid(Liquid.WATER, 10)
+    well.add_liquid(Liquid.WATER, 5)
+    well.add_liquid(Liquid.DMSO, 5)  # grows the arrays past max_layers=1
+    self.assertEqual(self.tracker.max_layers, 2)
+    self.assertEqual(well.pending_liquids, [(Liquid.WATER, 15), (Liquid.DMSO, 5)])
+    self.assertEqual(well.get_used_volume(), 20)
+    well.commit()
+    self.assertEqual(well.liquids, [(Liquid.WATER, 15), (Liquid.DMSO, 5)])
+
+    self.assertEqual(well.remove_liquid(8), [(Liquid.DMSO, 5), (Liquid.WATER, 3)])
+    self.assertEqual(self.tracker.pending_num_layers[3], 1)
+    self.assertEqual(self.tracker.pending_volumes[3].tolist(), [12, 0])
+    self.assertEqual(self.tracker.pending_liquid_ids[3].tolist()[1], 0)
+    well.commit()
+    self.assertEqual(self.tracker.volumes[3].tolist(), [12, 0])
+    self.assertEqual(self.tracker.get_well_liquids(3, pending=False), [(Liquid.WATER, 12)])
+
+    with self.assertRaises(TooLittleLiquidError):
+      well.remove_liquid(13)
+    with self.assertRaises(TooLittleVolumeError):
+      well.add_liquid(None, 89)
+    self.assertEqual(well.pending_liquids, [(Liquid.WATER, 12)])
+
+  def test_add_remove(self):
+    self.tracker.fill(Liquid.WATER, 50)
+    self.tracker.add_liquid(Liquid.WATER, 10, indices=[0])
+    self.tracker.add_liquid(Liquid.DMSO, [5, 6], indices=[0, 1])
+    self.assertEqual(self.tracker.get_well_liquids(0), [(Liquid.WATER, 60), (Liquid.DMSO, 5)])
+    self.assertEqual(self.tracker.get_well_liquids(1), [(Liquid.WATER, 50), (Liquid.DMSO, 6)])
+
+    self.tracker.remove_liquid([10, 6, 20], indices=[0, 1, 2])
+    self.assertEqual(self.tracker.get_well_liquids(0), [(Liquid.WATER, 55)])
+    self.assertEqual(self.tracker.get_well_liquids(1), [(Liquid.WATER, 50)])
+    self.assertEqual(self.tracker.get_well_liquids(2), [(Liquid.WATER, 30)])
+
+    with self.assertRaises(TooLittleVolumeError):
+      self.tracker.add_liquid(None, [1, 60], indices=[2, 3])
+    with self.assertRaises(TooLittleLiquidError):
+      self.tracker.remove_liquid(60, indices=[0])
+    self.assertEqual(self.tracker.get_used_volumes().tolist(), [55, 50, 30, 50])
+
+  def test_commit_rollback(self):
+    self.tracker.fill(None, 50)
+    self.tracker.remove_liquid(10)
+    self.assertEqual(self.tracker.get_used_volumes(pending=False).tolist(), [50] * 4)
+    self.tracker.commit(indices=[0, 1])
+    self.assertEqual(self.tracker.get_used_volumes(pending=False).tolist(), [40, 40, 50, 50])
+    self.tracker.rollback()
+    self.assertEqual(self.tracker.get_used_volumes().tolist(), [40, 40, 50, 50])
+
+
+@unittest.skipIf(not USE_NUMPY, "numpy is not installed")
+class TestWellVolumeTracker(unittest.TestCase):
+  def setUp(self):
+    self.plate = Cor_96_wellplate_360ul_Fb(name="plate")
+    self.plate.get_item("A1").tracker.set_liquids([(Liquid.WATER, 10)])
+    self.tracker = self.plate.enable_array_volume_tracking()
+
+  def test_existing_state(self):
+    well = self.plate.get_item("A1")
+    self.assertEqual(well.tracker.liquids, [(Liquid.WATER, 10)])
+    self.assertEqual(well.tracker.get_used_volume(), 10)
+    self.assertEqual(well.tracker.max_volume, well.max_volume)
+    self.assertIn(Liquid.WATER, well.tracker.liquid_history)
+
+  def test_view(self):
+    tracker = self.plate.get_item("B1").tracker
+    tracker.add_liquid(Liquid.WATER, 20)
+    tracker.add_liquid(Liquid.DMSO, 10)
+    self.assertEqual(tracker.get_used_volume(), 30)
+    self.assertEqual(self.tracker.get_used_volumes()[1], 30)
+    self.assertEqual(tracker.liquids, [])
+    tracker.commit()
+    self.assertEqual(tracker.liquids, [(Liquid.WATER, 20), (Liquid.DMSO, 10)])
+    self.assertEqual(tracker.get_liquids(top_volume=15), [(Liquid.DMSO, 10), (Liquid.WATER, 5)])
+
+    self.assertEqual(tracker.remove_liquid(15), [(Liquid.DMSO, 10), (Liquid.WATER, 5)])
+    tracker.rollback()
+    self.assertEqual(tracker.get_used_volume(), 30)
+
+    with self.assertRaises(TooLittleVolumeError):
+      tracker.add_liquid(None, 1000)
+
+  def test_set_well_liquids(self):
+    self.plate.set_well_liquids((Liquid.WATER, 20))
+    self.assertEqual(self.tracker.get_used_volumes().tolist(), [20] * 96)
+    liquids: List[Tuple[Optional[Liquid], Union[int, float]]] = [
+      (Liquid.WATER, i) for i in range(96)
+    ]
+    self.plate.set_well_liquids(liquids)
+    self.assertEqual(self.plate.get_item(95).tracker.get_used_volume(), 95)
+
+  def test_serialize(self):
+    tracker = self.plate.get_item("A1").tracker
+    tracker.set_liquids([(None, 10)])
+    state = tracker.serialize()
+    tracker.set_liquids([])
+    tracker.load_state(state)
+    self.assertEqual(tracker.liquids, [(None, 10)])
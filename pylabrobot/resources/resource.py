@@ -7,7 +7,7 @@ import sys
 from typing import Any, Callable, Dict, List, Optional, cast
 
 from pylabrobot.serializer import deserialize, serialize
-from pylabrobot.utils.linalg import matrix_vector_multiply_3x3
+from pylabrobot.utils.linalg import Matrix3x3, Transform, matrix_vector_multiply_3x3
 from pylabrobot.utils.object_parsing import find_subclass
 
 from .coordinate import Coordinate
@@ -57,13 +57,18 @@ class Resource:
     self._size_y = size_y
     self._size_z = size_z
     self._local_size_z = size_z
-    self.rotation = rotation or Rotation()
     self.category = category
     self.model = model
 
+    # Cached absolute transform, see `get_absolute_location`. Cleared for the subtree whenever the
+    # location, rotation or parent of a resource changes.
+    self._absolute_rotation: Optional[Rotation] = None
+    self._absolute_transform: Optional[Transform] = None
+
+    self.children: List[Resource] = []
+    self.rotation = rotation or Rotation()
     self.location: Optional[Coordinate] = None
     self.parent: Optional[Resource] = None
-    self.children: List[Resource] = []
 
     self._will_assign_resource_callbacks: List[WillAssignResourceCallback] = []
     self._did_assign_resource_callbacks: List[DidAssignResourceCallback] = []
@@ -99,6 +104,48 @@ class Resource:
       "parent_name": self.parent.name if self.parent is not None else None,
     }
 
+  @property
+  def location(self) -> Optional[Coordinate]:
+    """The location of this resource, relative to its parent."""
+    return self._location
+
+  @location.setter
+  def location(self, location: Optional[Coordinate]):
+    self._location = location
+    self._invalidate_absolute_transform()
+
+  @property
+  def rotation(self) -> Rotation:
+    """The rotation of this resource, relative to its parent."""
+    return self._rotation
+
+  @rotation.setter
+  def rotation(self, rotation: Rotation):
+    self._rotation = rotation
+    self._invalidate_absolute_transform()
+
+  @property
+  def parent(self) -> Optional[Resource]:
+    return self._parent
+
+  @parent.setter
+  def parent(self, parent: Optional[Resource]):
+    self._parent = parent
+    self._invalidate_absolute_transform()
+
+  def _invalidate_absolute_transform(self):
+    """Clear the cached absolute transform of this resource and all its children.
+
+    A cached transform is only computed from the cached transform of the parent, so when nothing is
+    cached for a resource, nothing is cached for its children either and the walk can stop.
+    """
+    if self._absolute_transform is None and self._absolute_rotation is None:
+      return
+    self._absolute_rotation = None
+    self._absolute_transform = None
+    for child in self.children:
+      child._invalidate_absolute_transform()
+
   @property
   def name(self) -> str:
     """Get the name of this resource."""
@@ -199,13 +246,43 @@ class Resource:
     """Get the absolute rotation of this resource."""
     if self.parent is None:
       return self.rotation
-    return self.parent.get_absolute_rotation() + self.rotation
+    rotation = self._get_absolute_rotation()
+    return Rotation(x=rotation.x, y=rotation.y, z=rotation.z)
+
+  def _get_absolute_rotation(self) -> Rotation:
+    """The cached absolute rotation. Do not modify the returned rotation."""
+    if self._absolute_rotation is None:
+      if self.parent is None:
+        self._absolute_rotation = Rotation(x=self.rotation.x, y=self.rotation.y, z=self.rotation.z)
+      else:
+        self._absolute_rotation = self.parent._get_absolute_rotation() + self.rotation
+    return self._absolute_rotation
+
+  def _get_absolute_rotation_matrix(self) -> Matrix3x3:
+    return self._get_absolute_rotation().get_rotation_matrix()
+
+  def _get_absolute_transform(self) -> Transform:
+    """The cached transform from the coordinate system of this resource to absolute coordinates:
+    the absolute rotation, and the absolute location of the left front bottom corner."""
+    if self._absolute_transform is None:
+      if self.location is None:
+        raise NoLocationError(f"Resource {self.name} has no location.")
+      if self.parent is None:
+        origin = self.location
+      else:
+        origin = Coordinate(*self.parent._get_absolute_transform().apply(self.location.vector()))
+      self._absolute_transform = Transform(self._get_absolute_rotation_matrix(), origin.vector())
+    return self._absolute_transform
 
   def get_absolute_location(self, x: str = "l", y: str = "f", z: str = "b") -> Coordinate:
     """Get the absolute location of this resource, probably within the
     :class:`pylabrobot.resources.Deck`. The `x`, `y`, and `z` arguments specify the anchor point
     within the resource. The default is the left front bottom corner.
 
+    The absolute transform is cached per resource, and cleared when the `location`, `rotation` or
+    `parent` of the resource or one of its ancestors is set, or when it is rotated with
+    :meth:`rotate`. Modifying a `location` or `rotation` in place is not detected.
+
     Args:
       x: `"l"`/`"left"`, `"c"`/`"center"`, or `"r"`/`"right"`
       y: `"b"`/`"back"`, `"c"`/`"center"`, or `"f"`/`"front"`
@@ -215,28 +292,11 @@ class Resource:
     if self.location is None:
       raise NoLocationError(f"Resource {self.name} has no location.")
 
-    rotated_anchor = Coordinate(
-      *matrix_vector_multiply_3x3(
-        self.get_absolute_rotation().get_rotation_matrix(),
-        self.get_anchor(x=x, y=y, z=z).vector(),
-      )
-    )
-
-    if self.parent is None:
-      return self.location + rotated_anchor
-
-    parent_pos = self.parent.get_absolute_location()
-    rotated_location = Coordinate(
-      *matrix_vector_multiply_3x3(
-        self.parent.get_absolute_rotation().get_rotation_matrix(),
-        self.location.vector(),
-      )
-    )
-    return parent_pos + rotated_location + rotated_anchor
+    transform = self._get_absolute_transform()
+    return Coordinate(*transform.apply(self.get_anchor(x=x, y=y, z=z).vector()))
 
   def _get_rotated_corners(self) -> List[Coordinate]:
-    absolute_rotation = self.get_absolute_rotation()
-    rot_mat = absolute_rotation.get_rotation_matrix()
+    rot_mat = self._get_absolute_rotation_matrix()
     return [
       Coordinate(*matrix_vector_multiply_3x3(rot_mat, corner.vector()))
       for corner in [
@@ -459,6 +519,7 @@ class Resource:
     self.rotation.x = (self.rotation.x + x) % 360
     self.rotation.y = (self.rotation.y + y) % 360
     self.rotation.z = (self.rotation.z + z) % 360
+    self._invalidate_absolute_transform()
 
   def copy(self) -> Self:
     resource_copy = self.__class__.deserialize(self.serialize(), allow_marshal=True)
@@ -371,6 +371,45 @@ class TestResource(unittest.TestCase):
     self.assertAlmostEqual(r.get_absolute_size_y(), 100)
     self.assertEqual(c.get_absolute_location(), Coordinate(20, 10, 10))
 
+  def test_absolute_location_cached(self):
+    deck = Deck()
+    parent = Resource("parent", size_x=10, size_y=10, size_z=10)
+    deck.assign_child_resource(parent, location=Coordinate(10, 10, 10))
+    child = Resource("child", size_x=5, size_y=5, size_z=5)
+    parent.assign_child_resource(child, location=Coordinate(5, 5, 5))
+    self.assertEqual(child.get_absolute_location(), Coordinate(15, 15, 15))
+
+    with unittest.mock.patch.object(
+      Rotation, "get_rotation_matrix", side_effect=AssertionError("not cached")
+    ):
+      self.assertEqual(child.get_absolute_location(), Coordinate(15, 15, 15))
+      self.assertEqual(child.get_absolute_location(x="r"), Coordinate(20, 15, 15))
+
+  def test_absolute_location_cache_invalidation(self):
+    deck = Deck()
+    parent = Resource("parent", size_x=10, size_y=10, size_z=10)
+    deck.assign_child_resource(parent, location=Coordinate(10, 10, 10))
+    child = Resource("child", size_x=5, size_y=5, size_z=5)
+    parent.assign_child_resource(child, location=Coordinate(5, 5, 5))
+    self.assertEqual(child.get_absolute_location(), Coordinate(15, 15, 15))
+
+    # setting the location of an ancestor
+    parent.location = Coordinate(20, 20, 20)
+    self.assertEqual(child.get_absolute_location(), Coordinate(25, 25, 25))
+
+    # rotating an ancestor
+    parent.rotate(z=180)
+    self.assertEqual(child.get_absolute_location(), Coordinate(15, 15, 25))
+    parent.rotation = Rotation()
+    self.assertEqual(child.get_absolute_location(), Coordinate(25, 25, 25))
+
+    # reassigning an ancestor
+    other = Resource("other", size_x=10, size_y=10, size_z=10)
+    deck.assign_child_resource(other, location=Coordinate(100, 0, 0))
+    parent.unassign()
+    other.assign_child_resource(parent, location=Coordinate(0, 0, 0))
+    self.assertEqual(child.get_absolute_location(), Coordinate(105, 5, 5))
+
 
 class TestResourceCallback(unittest.TestCase):
   def setUp(self) -> None:
@@ -1,17 +1,64 @@
 import math
+from typing import Optional, Tuple, cast
 
-from pylabrobot.utils.linalg import matrix_multiply_3x3
+from pylabrobot.utils.linalg import Matrix3x3, matrix_multiply_3x3
+
+# Rotation matrices for rotations by 0, 90, 180 and 270 degrees around the z-axis, which are the
+# only rotations most resources have.
+_QUARTER_TURNS_Z: Tuple[Matrix3x3, ...] = (
+  ((1, 0, 0), (0, 1, 0), (0, 0, 1)),
+  ((0, -1, 0), (1, 0, 0), (0, 0, 1)),
+  ((-1, 0, 0), (0, -1, 0), (0, 0, 1)),
+  ((0, 1, 0), (-1, 0, 0), (0, 0, 1)),
+)
 
 
 class Rotation:
   """Represents a 3D rotation."""
 
   def __init__(self, x: float = 0, y: float = 0, z: float = 0):
-    self.x = x  # around x-axis, roll
-    self.y = y  # around y-axis, pitch
-    self.z = z  # around z-axis, yaw
+    self._x = x  # around x-axis, roll
+    self._y = y  # around y-axis, pitch
+    self._z = z  # around z-axis, yaw
+    self._rotation_matrix: Optional[Matrix3x3] = None
+
+  @property
+  def x(self) -> float:
+    return self._x
+
+  @x.setter
+  def x(self, x: float):
+    self._x = x
+    self._rotation_matrix = None
+
+  @property
+  def y(self) -> float:
+    return self._y
+
+  @y.setter
+  def y(self, y: float):
+    self._y = y
+    self._rotation_matrix = None
+
+  @property
+  def z(self) -> float:
+    return self._z
+
+  @z.setter
+  def z(self, z: float):
+    self._z = z
+    self._rotation_matrix = None
+
+  def get_rotation_matrix(self) -> Matrix3x3:
+    """Get the rotation matrix. The matrix is cached until `x`, `y` or `z` change."""
+    if self._rotation_matrix is None:
+      self._rotation_matrix = self._compute_rotation_matrix()
+    return self._rotation_matrix
+
+  def _compute_rotation_matrix(self) -> Matrix3x3:
+    if self.x % 360 == 0 and self.y % 360 == 0 and self.z % 90 == 0:
+      return _QUARTER_TURNS_Z[int(self.z // 90) % 4]
 
-  def get_rotation_matrix(self):
     # Create rotation matrices for each axis
     Rz = [
       [
@@ -54,7 +101,8 @@ class Rotation:
     ]
     # Combine rotations: The order of multiplication matters and defines the behavior significantly.
     # This is a common order: Rz * Ry * Rx
-    return matrix_multiply_3x3(matrix_multiply_3x3(Rz, Ry), Rx)
+    R = matrix_multiply_3x3(matrix_multiply_3x3(Rz, Ry), Rx)
+    return cast(Matrix3x3, tuple(tuple(row) for row in R))
 
   def __str__(self) -> str:
     return f"Rotation(x={self.x}, y={self.y}, z={self.z})"
@@ -62,6 +110,9 @@ class Rotation:
   def __add__(self, other) -> "Rotation":
     return Rotation(x=self.x + other.x, y=self.y + other.y, z=self.z + other.z)
 
+  def serialize(self) -> dict:
+    return {"x": self.x, "y": self.y, "z": self.z, "type": "Rotation"}
+
   @staticmethod
   def deserialize(data) -> "Rotation":
     return Rotation(data["x"], data["y"], data["z"])
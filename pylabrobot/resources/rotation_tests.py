@@ -0,0 +1,30 @@
+import unittest
+
+from .rotation import Rotation
+
+
+class TestRotation(unittest.TestCase):
+  def test_quarter_turns(self):
+    for z in range(-360, 720, 90):
+      general = Rotation(z=z + 1e-9)._compute_rotation_matrix()  # avoid the fast path
+      quarter_turn = Rotation(z=z).get_rotation_matrix()
+      for row_general, row_quarter_turn in zip(general, quarter_turn):
+        for a, b in zip(row_general, row_quarter_turn):
+          self.assertAlmostEqual(a, b)
+
+  def test_rotation_matrix_cached(self):
+    rotation = Rotation(x=10, y=20, z=30)
+    matrix = rotation.get_rotation_matrix()
+    self.assertIs(rotation.get_rotation_matrix(), matrix)
+
+    rotation.z = 40
+    self.assertIsNot(rotation.get_rotation_matrix(), matrix)
+    self.assertEqual(
+      rotation.get_rotation_matrix(), Rotation(x=10, y=20, z=40).get_rotation_matrix()
+    )
+
+  def test_serialize(self):
+    rotation = Rotation(x=10, y=20, z=30)
+    self.assertEqual(rotation.serialize(), {"x": 10, "y": 20, "z": 30, "type": "Rotation"})
+    deserialized = Rotation.deserialize(rotation.serialize())
+    self.assertEqual(deserialized.get_rotation_matrix(), rotation.get_rotation_matrix())
@@ -1,6 +1,6 @@
 import contextlib
 import sys
-from typing import TYPE_CHECKING, Callable, Optional, cast
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple, cast
 
 from pylabrobot.resources.errors import HasTipError, NoTipError
 from pylabrobot.resources.tip import Tip
@@ -34,17 +34,25 @@ TrackerCallback = Callable[[], None]
 
 
 class TipTracker:
-  """A tip tracker tracks tip operations and raises errors if the tip operations are invalid."""
+  """A tip tracker tracks tip operations and raises errors if the tip operations are invalid.
+
+  Pending operations are appended to a log of `(tip, origin)` states. Committing applies the last
+  state, and rolling back truncates the log.
+  """
 
   def __init__(self, thing: str):
     self.thing = thing
     self._is_disabled = False
     self._tip: Optional["Tip"] = None
-    self._pending_tip: Optional["Tip"] = None
-    self._tip_origin: Optional["TipSpot"] = None  # not currently in a transaction, do we need that?
+    self._tip_origin: Optional["TipSpot"] = None
+    self._log: List[Tuple[Optional["Tip"], Optional["TipSpot"]]] = []
 
     self._callback: Optional[TrackerCallback] = None
 
+  @property
+  def _pending_tip(self) -> Optional["Tip"]:
+    return self._log[-1][0] if len(self._log) > 0 else self._tip
+
   @property
   def is_disabled(self) -> bool:
     return self._is_disabled
@@ -90,9 +98,7 @@ class TipTracker:
       raise RuntimeError("Tip tracker is disabled. Call `enable()`.")
     if self._pending_tip is not None:
       raise HasTipError(f"{self.thing} already has a tip.")
-    self._pending_tip = tip
-
-    self._tip_origin = origin
+    self._log.append((tip, origin))
 
     if commit:
       self.commit()
@@ -103,26 +109,29 @@ class TipTracker:
       raise RuntimeError("Tip tracker is disabled. Call `enable()`.")
     if self._pending_tip is None:
       raise NoTipError(f"{self.thing} does not have a tip.")
-    self._pending_tip = None
+    self._log.append((None, None))
 
     if commit:
       self.commit()
 
   def commit(self) -> None:
     """Commit the pending operations."""
-    self._tip = self._pending_tip
+    if len(self._log) > 0:
+      self._tip, self._tip_origin = self._log[-1]
+      self._log.clear()
     if self._callback is not None:
       self._callback()
 
   def rollback(self) -> None:
     """Rollback the pending operations."""
     assert not self.is_disabled, "Tip tracker is disabled. Call `enable()`."
-    self._pending_tip = self._tip
+    self._log.clear()
 
   def clear(self) -> None:
     """Clear the history."""
     self._tip = None
-    self._pending_tip = None
+    self._tip_origin = None
+    self._log.clear()
 
   def serialize(self) -> dict:
     """Serialize the state of the tip tracker."""
@@ -136,11 +145,13 @@ class TipTracker:
     """Load a saved tip tracker state."""
 
     self._tip = cast(Optional[Tip], deserialize(state.get("tip")))
-    self._pending_tip = cast(Optional[Tip], deserialize(state.get("pending_tip")))
+    self._log.clear()
+    if state.get("pending_tip") != state.get("tip"):
+      self._log.append((cast(Optional[Tip], deserialize(state.get("pending_tip"))), None))
 
   def get_tip_origin(self) -> Optional["TipSpot"]:
-    """Get the origin of the current tip, if known."""
-    return self._tip_origin
+    """Get the origin of the current tip, if known. Note that this includes pending operations."""
+    return self._log[-1][1] if len(self._log) > 0 else self._tip_origin
 
   def __repr__(self) -> str:
     return (
@@ -1,4 +1,5 @@
 import unittest
+import unittest.mock
 
 from pylabrobot.resources.tip import Tip
 from pylabrobot.resources.tip_tracker import (
@@ -42,3 +43,14 @@ class TestTipTracker(unittest.TestCase):
 
     with self.assertRaises(NoTipError):
       tracker.get_tip()
+
+  def test_rollback(self):
+    tracker = TipTracker(thing="tester")
+    origin = unittest.mock.MagicMock()
+    tracker.add_tip(self.tip, origin=origin)
+    tracker.remove_tip()
+    tracker.add_tip(self.tip, origin=None, commit=False)
+    self.assertIsNone(tracker.get_tip_origin())
+    tracker.rollback()
+    self.assertEqual(tracker.has_tip, True)
+    self.assertIs(tracker.get_tip_origin(), origin)
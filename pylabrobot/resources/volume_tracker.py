@@ -1,5 +1,4 @@
 import contextlib
-import copy
 import sys
 from typing import Callable, List, Optional, Tuple, cast
 
@@ -8,6 +7,7 @@ from pylabrobot.resources.errors import (
   TooLittleVolumeError,
 )
 from pylabrobot.resources.liquid import Liquid
+from pylabrobot.resources.liquid_history import LiquidHistory
 from pylabrobot.serializer import deserialize, serialize
 
 this = sys.modules[__name__]
@@ -61,9 +61,49 @@ def no_cross_contamination_tracking():
 VolumeTrackerCallback = Callable[[], None]
 
 
+def _remove_liquid(
+  liquids: List[Tuple[Optional[Liquid], float]], volume: float
+) -> List[Tuple[Optional[Liquid], float]]:
+  """Remove `volume` uL from the top of the list of `liquids` in place, and return what was
+  removed. If the layers hold less than `volume` uL, which happens when rounding errors build up,
+  all layers are removed."""
+
+  removed_liquids = []
+  removed_volume = 0.0
+  while removed_volume < volume and len(liquids) > 0:
+    liquid, liquid_volume = liquids.pop()
+    removed_volume += liquid_volume
+
+    # If we have more liquid than we need, put the excess back.
+    if removed_volume > volume:
+      liquids.append((liquid, removed_volume - volume))
+      removed_liquids.append((liquid, liquid_volume - (removed_volume - volume)))
+    else:
+      removed_liquids.append((liquid, liquid_volume))
+  return removed_liquids
+
+
+def _add_liquid(
+  liquids: List[Tuple[Optional[Liquid], float]], liquid: Optional[Liquid], volume: float
+) -> None:
+  """Add `volume` uL of `liquid` to the top of the list of `liquids` in place."""
+
+  # If the last liquid is the same as the one we want to add, just add the volume to it.
+  if len(liquids) > 0 and liquids[-1][0] == liquid:
+    liquids[-1] = (liquid, liquids[-1][1] + volume)
+  else:
+    liquids.append((liquid, volume))
+
+
 class VolumeTracker:
   """A volume tracker tracks operations that change the volume in a container and raises errors
-  if the volume operations are invalid."""
+  if the volume operations are invalid.
+
+  Pending operations are kept as a log on top of the committed liquids: the committed layers below
+  `_pending_base` are unchanged, and `_pending_top` holds the layers above it. Committing replaces
+  the committed layers above the base with the pending ones in place, and rolling back truncates
+  the log. The pending volume is kept as a running total.
+  """
 
   def __init__(
     self,
@@ -76,10 +116,18 @@ class VolumeTracker:
     self._is_cross_contamination_tracking_disabled = False
     self.max_volume = max_volume
 
-    self.liquids: List[Tuple[Optional[Liquid], float]] = liquids or []
-    self.pending_liquids: List[Tuple[Optional[Liquid], float]] = pending_liquids or []
+    self._liquids: List[Tuple[Optional[Liquid], float]] = []
+    self._pending_base = 0
+    self._pending_top: List[Tuple[Optional[Liquid], float]] = []
+    self._pending_volume = 0.0
+    self._volume = 0.0
+    self.liquids = liquids or []
+    if pending_liquids is not None:
+      self.pending_liquids = pending_liquids
 
-    self.liquid_history = {liquid for liquid in (liquid_history or set()) if liquid is not None}
+    self.liquid_history = LiquidHistory(
+      liquid for liquid in (liquid_history or set()) if liquid is not None
+    )
 
     self._callback: Optional[VolumeTrackerCallback] = None
 
@@ -87,6 +135,28 @@ class VolumeTracker:
   def is_disabled(self) -> bool:
     return self._is_disabled
 
+  @property
+  def liquids(self) -> List[Tuple[Optional[Liquid], float]]:
+    """The committed liquids, bottom to top. Assigning also discards pending operations."""
+    return self._liquids
+
+  @liquids.setter
+  def liquids(self, liquids: List[Tuple[Optional[Liquid], float]]) -> None:
+    self._liquids = list(liquids)
+    self._volume = sum(volume for _, volume in self._liquids)
+    self._discard_pending()
+
+  @property
+  def pending_liquids(self) -> List[Tuple[Optional[Liquid], float]]:
+    """The liquids including pending operations, bottom to top. This is a new list."""
+    return self._liquids[: self._pending_base] + self._pending_top
+
+  @pending_liquids.setter
+  def pending_liquids(self, liquids: List[Tuple[Optional[Liquid], float]]) -> None:
+    self._pending_base = 0
+    self._pending_top = list(liquids)
+    self._pending_volume = sum(volume for _, volume in self._pending_top)
+
   @property
   def is_cross_contamination_tracking_disabled(self) -> bool:
     return self._is_cross_contamination_tracking_disabled
@@ -110,7 +180,6 @@ class VolumeTracker:
   def set_liquids(self, liquids: List[Tuple[Optional["Liquid"], float]]) -> None:
     """Set the liquids in the container."""
     self.liquids = liquids
-    self.pending_liquids = liquids
 
     if not self.is_cross_contamination_tracking_disabled:
       self.liquid_history.update([liquid[0] for liquid in liquids])
@@ -126,18 +195,18 @@ class VolumeTracker:
         f"Container has too little liquid: {volume}uL > {self.get_used_volume()}uL."
       )
 
-    removed_liquids = []
-    removed_volume = 0.0
-    while removed_volume < volume:
-      liquid, liquid_volume = self.pending_liquids.pop()
-      removed_volume += liquid_volume
+    # move just enough committed layers into the log to remove the volume from
+    top_volume = sum(v for _, v in self._pending_top)
+    while top_volume < volume and self._pending_base > 0:
+      self._pending_base -= 1
+      layer = self._liquids[self._pending_base]
+      self._pending_top.insert(0, layer)
+      top_volume += layer[1]
 
-      # If we have more liquid than we need, put the excess back.
-      if removed_volume > volume:
-        self.pending_liquids.append((liquid, removed_volume - volume))
-        removed_liquids.append((liquid, liquid_volume - (removed_volume - volume)))
-      else:
-        removed_liquids.append((liquid, liquid_volume))
+    removed_liquids = _remove_liquid(self._pending_top, volume)
+    self._pending_volume = max(self._pending_volume - volume, 0.0)
+    if self._pending_base == 0 and len(self._pending_top) == 0:
+      self._pending_volume = 0.0
 
     if self._callback is not None:
       self._callback()
@@ -157,25 +226,22 @@ class VolumeTracker:
       if liquid is not None:
         self.liquid_history.add(liquid)
 
-    # If the last liquid is the same as the one we want to add, just add the volume to it.
-    if len(self.pending_liquids) > 0:
-      last_pending_liquid_tuple = self.pending_liquids[-1]
-      if last_pending_liquid_tuple[0] == liquid:
-        self.pending_liquids[-1] = (
-          liquid,
-          last_pending_liquid_tuple[1] + volume,
-        )
-      else:
-        self.pending_liquids.append((liquid, volume))
-    else:
-      self.pending_liquids.append((liquid, volume))
+    if (
+      len(self._pending_top) == 0
+      and self._pending_base > 0
+      and self._liquids[self._pending_base - 1][0] == liquid
+    ):
+      self._pending_base -= 1
+      self._pending_top.append(self._liquids[self._pending_base])
+    _add_liquid(self._pending_top, liquid, volume)
+    self._pending_volume += volume
 
     if self._callback is not None:
       self._callback()
 
   def get_used_volume(self) -> float:
     """Get the used volume of the container. Note that this includes pending operations."""
-    return sum(volume for _, volume in self.pending_liquids)
+    return self._pending_volume
 
   def get_free_volume(self) -> float:
     """Get the free volume of the container. Note that this includes pending operations."""
@@ -205,7 +271,12 @@ class VolumeTracker:
     """Commit the pending operations."""
     assert not self.is_disabled, "Volume tracker is disabled. Call `enable()`."
 
-    self.liquids = copy.deepcopy(self.pending_liquids)
+    if self._pending_base < len(self._liquids) or len(self._pending_top) > 0:
+      del self._liquids[self._pending_base :]
+      self._liquids.extend(self._pending_top)
+      self._pending_base = len(self._liquids)
+      self._pending_top = []
+    self._volume = self._pending_volume
 
     if self._callback is not None:
       self._callback()
@@ -213,7 +284,12 @@ class VolumeTracker:
   def rollback(self) -> None:
     """Rollback the pending operations."""
     assert not self.is_disabled, "Volume tracker is disabled. Call `enable()`."
-    self.pending_liquids.clear()
+    self._discard_pending()
+
+  def _discard_pending(self) -> None:
+    self._pending_base = len(self._liquids)
+    self._pending_top = []
+    self._pending_volume = self._volume
 
   def clear_cross_contamination_history(self) -> None:
     """Resets the liquid_history for cross contamination tracking. Use when there is a wash step."""
@@ -223,10 +299,13 @@ class VolumeTracker:
     """Serialize the volume tracker."""
 
     if not self.is_cross_contamination_tracking_disabled:
+      history = self.liquid_history
+      if not isinstance(history, LiquidHistory):
+        history = LiquidHistory(history)
       return {
         "liquids": [serialize(liquid) for liquid in self.liquids],
         "pending_liquids": [serialize(liquid) for liquid in self.pending_liquids],
-        "liquid_history": [serialize(liquid) for liquid in self.liquid_history],
+        "liquid_history": history.serialize(),
       }
 
     return {
@@ -244,7 +323,7 @@ class VolumeTracker:
     self.pending_liquids = [load_liquid(liquid) for liquid in state["pending_liquids"]]
 
     if not self.is_cross_contamination_tracking_disabled:
-      self.liquid_history = set(state["liquid_history"])
+      self.liquid_history = LiquidHistory.deserialize(state.get("liquid_history"))
 
   def register_callback(self, callback: VolumeTrackerCallback) -> None:
     self._callback = callback
@@ -47,6 +47,20 @@ class TestVolumeTracker(unittest.TestCase):
     with self.assertRaises(TooLittleLiquidError):
       tracker.remove_liquid(volume=100)
 
+  def test_remove_liquid_rounding(self):
+    tracker = VolumeTracker(max_volume=10)
+    tracker.add_liquid(None, 1)
+    tracker.commit()
+    tracker.remove_liquid(0.3)
+    tracker.remove_liquid(0.2)
+    tracker.add_liquid(Liquid.WATER, 0.7)
+    tracker.remove_liquid(0.2)
+    # the layers hold slightly less than the running total
+    self.assertEqual(tracker.get_used_volume(), 1)
+    tracker.remove_liquid(1)
+    self.assertEqual(tracker.pending_liquids, [])
+    self.assertEqual(tracker.get_used_volume(), 0)
+
   def test_get_liquids(self):
     tracker = VolumeTracker(max_volume=200)
     tracker.add_liquid(liquid=None, volume=60)
@@ -64,3 +78,24 @@ class TestVolumeTracker(unittest.TestCase):
 
     with self.assertRaises(TooLittleLiquidError):
       tracker.get_liquids(top_volume=600)
+
+  def test_commit_rollback(self):
+    tracker = VolumeTracker(max_volume=200)
+    tracker.set_liquids([(None, 50), (Liquid.WATER, 50)])
+    tracker.remove_liquid(volume=70)
+    tracker.add_liquid(liquid=Liquid.ETHANOL, volume=10)
+    self.assertEqual(tracker.pending_liquids, [(None, 30), (Liquid.ETHANOL, 10)])
+    self.assertEqual(tracker.get_used_volume(), 40)
+    self.assertEqual(tracker.liquids, [(None, 50), (Liquid.WATER, 50)])
+
+    tracker.rollback()
+    self.assertEqual(tracker.pending_liquids, [(None, 50), (Liquid.WATER, 50)])
+    self.assertEqual(tracker.get_used_volume(), 100)
+
+    tracker.remove_liquid(volume=20)
+    tracker.add_liquid(liquid=Liquid.WATER, volume=5)
+    tracker.commit()
+    self.assertEqual(tracker.liquids, [(None, 50), (Liquid.WATER, 35)])
+    self.assertEqual(tracker.get_used_volume(), 85)
+    tracker.rollback()
+    self.assertEqual(tracker.get_used_volume(), 85)
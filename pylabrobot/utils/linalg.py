@@ -1,3 +1,11 @@
+from typing import Sequence, Tuple
+
+Vector3 = Tuple[float, float, float]
+Matrix3x3 = Tuple[Vector3, Vector3, Vector3]
+
+_IDENTITY: Tuple[float, ...] = (1, 0, 0, 0, 1, 0, 0, 0, 1)
+
+
 def matrix_multiply_3x3(A, B):
   """Multiplies two 3x3 matrices A and B."""
   return [[sum(A[i][k] * B[k][j] for k in range(3)) for j in range(3)] for i in range(3)]
@@ -6,3 +14,63 @@ def matrix_multiply_3x3(A, B):
 def matrix_vector_multiply_3x3(A, v):
   """Multiplies a 3x3 matrix A with a 3x1 vector v."""
   return [sum(A[i][j] * v[j] for j in range(3)) for i in range(3)]
+
+
+class Transform:
+  """A rotation by a 3x3 matrix followed by a translation.
+
+  The matrix is stored as a flat tuple, and applying a transform does not allocate anything but
+  the resulting tuple. Transforms without a rotation skip the matrix multiplication.
+  """
+
+  __slots__ = ("matrix", "translation", "is_translation")
+
+  def __init__(
+    self,
+    matrix: Sequence[Sequence[float]] = ((1, 0, 0), (0, 1, 0), (0, 0, 1)),
+    translation: Sequence[float] = (0, 0, 0),
+  ):
+    self.matrix: Tuple[float, ...] = tuple(m for row in matrix for m in row)
+    self.translation: Vector3 = (translation[0], translation[1], translation[2])
+    self.is_translation = self.matrix == _IDENTITY
+
+  def rotate(self, v: Sequence[float]) -> Vector3:
+    """Apply only the rotation to the vector `v`."""
+    if self.is_translation:
+      return (v[0], v[1], v[2])
+    m = self.matrix
+    return (
+      m[0] * v[0] + m[1] * v[1] + m[2] * v[2],
+      m[3] * v[0] + m[4] * v[1] + m[5] * v[2],
+      m[6] * v[0] + m[7] * v[1] + m[8] * v[2],
+    )
+
+  def apply(self, v: Sequence[float]) -> Vector3:
+    """Apply the transform to the vector `v`."""
+    r = self.rotate(v)
+    t = self.translation
+    return (r[0] + t[0], r[1] + t[1], r[2] + t[2])
+
+  def compose(self, other: "Transform") -> "Transform":
+    """The transform that applies `other` first, and then this transform."""
+    if other.is_translation:
+      return Transform(self.get_matrix(), self.apply(other.translation))
+    a, b = self.matrix, other.matrix
+    matrix = [
+      [sum(a[3 * i + k] * b[3 * k + j] for k in range(3)) for j in range(3)] for i in range(3)
+    ]
+    return Transform(matrix, self.apply(other.translation))
+
+  def get_matrix(self) -> Matrix3x3:
+    m = self.matrix
+    return ((m[0], m[1], m[2]), (m[3], m[4], m[5]), (m[6], m[7], m[8]))
+
+  def __eq__(self, other) -> bool:
+    return (
+      isinstance(other, Transform)
+      and self.matrix == other.matrix
+      and self.translation == other.translation
+    )
+
+  def __repr__(self) -> str:
+    return f"Transform(matrix={self.get_matrix()}, translation={self.translation})"
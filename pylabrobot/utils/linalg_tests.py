@@ -1,6 +1,6 @@
 import unittest
 
-from .linalg import matrix_multiply_3x3, matrix_vector_multiply_3x3
+from .linalg import Transform, matrix_multiply_3x3, matrix_vector_multiply_3x3
 
 
 class TestLinalg(unittest.TestCase):
@@ -17,3 +17,22 @@ class TestLinalg(unittest.TestCase):
     B = [1, 2, 3]
     C = matrix_vector_multiply_3x3(A, B)
     assert C == [14, 32, 50]
+
+  def test_transform_apply(self):
+    t = Transform([[0, -1, 0], [1, 0, 0], [0, 0, 1]], (10, 20, 30))
+    self.assertFalse(t.is_translation)
+    self.assertEqual(t.rotate((1, 2, 3)), (-2, 1, 3))
+    self.assertEqual(t.apply((1, 2, 3)), (8, 21, 33))
+
+    translation = Transform(translation=(1, 1, 1))
+    self.assertTrue(translation.is_translation)
+    self.assertEqual(translation.apply((1, 2, 3)), (2, 3, 4))
+
+  def test_transform_compose(self):
+    a = Transform([[0, -1, 0], [1, 0, 0], [0, 0, 1]], (10, 20, 30))
+    b = Transform([[1, 0, 0], [0, 0, -1], [0, 1, 0]], (1, 2, 3))
+    composed = a.compose(b)
+    for v in [(1, 2, 3), (-4, 5, 0.5)]:
+      self.assertEqual(composed.apply(v), a.apply(b.apply(v)))
+    translated = a.compose(Transform(translation=(1, 2, 3)))
+    self.assertEqual(translated.apply((0, 0, 0)), a.apply((1, 2, 3)))
@@ -0,0 +1,134 @@
+"""Benchmark the overhead of the Tecan Fluent SiLA backends against the FluentControl stand-in.
+
+For every backend, runs alternating aspirations and dispenses against
+`pylabrobot.liquid_handling.backends.tecan.fluent_simulator` and reports operations per second,
+connector calls per operation and the overhead per connector call, which is the wall time that is
+not explained by the simulated latency and method run time.
+
+Usage:
+    python tools/benchmarks/fluent_sila_backends.py --ops 200 --latency 0.001 --run-time 0
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from pylabrobot.liquid_handling.backends.tecan.fluent import Fluent
+from pylabrobot.liquid_handling.backends.tecan.fluent_simulator import FluentControlSimulator
+from pylabrobot.liquid_handling.backends.tecan_silas_backend import TecanSiLABackend
+from pylabrobot.liquid_handling.backends.unitelabs_silas import UnitelabsSilasBackend
+from pylabrobot.liquid_handling.standard import SingleChannelAspiration, SingleChannelDispense
+from pylabrobot.resources import Coordinate, Cor_96_wellplate_360ul_Fb, Deck
+
+
+def make_plate():
+  plate = Cor_96_wellplate_360ul_Fb(name="plate")
+  plate.location = Coordinate.zero()
+  return plate
+
+
+def make_ops(plate, n: int) -> List:
+  ops = []
+  for i in range(n):
+    well = plate.get_all_items()[i % plate.num_items]
+    op_class = SingleChannelAspiration if i % 2 == 0 else SingleChannelDispense
+    ops.append(
+      op_class(
+        resource=well,
+        offset=Coordinate.zero(),
+        tip=None,  # type: ignore[arg-type]
+        volume=10 + i % 5,
+        flow_rate=None,
+        liquid_height=None,
+        blow_out_air_volume=None,
+        liquids=[],
+      )
+    )
+  return ops
+
+
+async def run_fluent(simulator: FluentControlSimulator, ops: List):
+  backend = Fluent(num_channels=8, connector=simulator.tecan_fluent())
+  await backend.setup()
+  for op in ops:
+    if isinstance(op, SingleChannelAspiration):
+      await backend.aspirate(op.resource, volume=op.volume)
+    else:
+      await backend.dispense(op.resource, volume=op.volume)
+  return backend.stop
+
+
+async def run_fluent_batched(simulator: FluentControlSimulator, ops: List):
+  backend = Fluent(num_channels=8, connector=simulator.tecan_fluent(), batch_mode=True)
+  await backend.setup()
+  for op in ops:
+    if isinstance(op, SingleChannelAspiration):
+      await backend.aspirate(op.resource, volume=op.volume)
+    else:
+      await backend.dispense(op.resource, volume=op.volume)
+  await backend.flush()
+  return backend.stop
+
+
+async def run_tecan_sila(simulator: FluentControlSimulator, ops: List):
+  backend = TecanSiLABackend(num_channels=8, connector=simulator.fluent_control())
+  backend.set_deck(Deck())
+  await backend.setup()
+  for op in ops:
+    if isinstance(op, SingleChannelAspiration):
+      await backend.aspirate([op], use_channels=[0])
+    else:
+      await backend.dispense([op], use_channels=[0])
+  return backend.stop
+
+
+async def run_unitelabs(simulator: FluentControlSimulator, ops: List):
+  backend = UnitelabsSilasBackend(num_channels=8, connector=simulator.unitelabs_client())
+  backend.set_deck(Deck())
+  await backend.setup()
+  for op in ops:
+    if isinstance(op, SingleChannelAspiration):
+      await backend.aspirate([op])
+    else:
+      await backend.dispense([op])
+  return backend.stop
+
+
+BACKENDS = {
+  "Fluent": run_fluent,
+  "Fluent (batch mode)": run_fluent_batched,
+  "TecanSiLABackend": run_tecan_sila,
+  "UnitelabsSilasBackend": run_unitelabs,
+}
+
+
+async def benchmark(num_ops: int, latency: float, run_time: float) -> None:
+  ops = make_ops(make_plate(), num_ops)
+
+  print(f"{num_ops} operations, {latency * 1000:.2f} ms per call, {run_time * 1000:.2f} ms per run")
+  print(f"{'backend':<24}{'ops/s':>10}{'calls/op':>10}{'overhead/call (us)':>20}")
+  for name, run in BACKENDS.items():
+    simulator = FluentControlSimulator(call_latency=latency, method_run_time=run_time)
+    start = time.perf_counter()
+    stop = await run(simulator, ops)
+    elapsed = time.perf_counter() - start
+    await stop()
+
+    calls = simulator.total_calls
+    overhead = elapsed - calls * latency - simulator.method_runs * run_time
+    overhead = overhead / calls if calls else 0.0
+    print(f"{name:<24}{num_ops / elapsed:>10.1f}{calls / num_ops:>10.2f}{overhead * 1e6:>20.1f}")
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+  parser.add_argument("--ops", type=int, default=200, help="number of operations per backend")
+  parser.add_argument("--latency", type=float, default=0.0, help="latency per call in seconds")
+  parser.add_argument("--run-time", type=float, default=0.0, help="method run time in seconds")
+  args = parser.parse_args()
+  asyncio.run(benchmark(args.ops, args.latency, args.run_time))
+
+
+if __name__ == "__main__":
+  main()
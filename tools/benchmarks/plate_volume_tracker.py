@@ -0,0 +1,92 @@
+"""Benchmark per-well volume tracking with and without a `PlateVolumeTracker`.
+
+Every well of a 384-well plate gets a remove, commit, add and commit through its own tracker,
+once with the default list-backed `VolumeTracker`s and once with the views returned by
+`Plate.enable_array_volume_tracking`. The views are also timed with the commits done once for the
+whole plate, and the same operations through the bulk `PlateVolumeTracker` API are timed for
+reference. Reports the best time per pass over the plate.
+
+Usage:
+  python tools/benchmarks/plate_volume_tracker.py --repeats 30
+"""
+
+import argparse
+import time
+
+from pylabrobot.resources import BioRad_384_wellplate_50uL_Vb
+from pylabrobot.resources.liquid import Liquid
+
+
+def make_plate(array: bool):
+  plate = BioRad_384_wellplate_50uL_Vb(name="plate")
+  if array:
+    plate.enable_array_volume_tracking()
+  plate.set_well_liquids((Liquid.WATER, 20))
+  return plate
+
+
+def per_well(array: bool):
+  trackers = [well.tracker for well in make_plate(array).get_all_items()]
+
+  def run():
+    for tracker in trackers:
+      tracker.remove_liquid(5)
+      tracker.commit()
+      tracker.add_liquid(Liquid.WATER, 5)
+      tracker.commit()
+
+  return run
+
+
+def per_well_plate_commit():
+  plate = make_plate(array=True)
+  tracker = plate.enable_array_volume_tracking()
+  trackers = [well.tracker for well in plate.get_all_items()]
+
+  def run():
+    for well_tracker in trackers:
+      well_tracker.remove_liquid(5)
+    tracker.commit()
+    for well_tracker in trackers:
+      well_tracker.add_liquid(Liquid.WATER, 5)
+    tracker.commit()
+
+  return run
+
+
+def bulk():
+  tracker = make_plate(array=True).enable_array_volume_tracking()
+
+  def run():
+    tracker.remove_liquid(5)
+    tracker.commit()
+    tracker.add_liquid(Liquid.WATER, 5)
+    tracker.commit()
+
+  return run
+
+
+def benchmark(num_repeats: int) -> None:
+  for name, run in [
+    ("per-well VolumeTracker", per_well(array=False)),
+    ("per-well array views", per_well(array=True)),
+    ("per-well array views, plate commit", per_well_plate_commit()),
+    ("bulk PlateVolumeTracker", bulk()),
+  ]:
+    best = float("inf")
+    for _ in range(num_repeats):
+      start = time.perf_counter()
+      run()
+      best = min(best, time.perf_counter() - start)
+    print(f"{name}: best of {num_repeats}: {best * 1e3:.2f} ms per 384 wells")
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+  parser.add_argument("--repeats", type=int, default=30, help="number of repeats")
+  args = parser.parse_args()
+  benchmark(args.repeats)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,170 @@
+"""Benchmark `parse_star_fw_string` against the parser it replaced.
+
+The firmware strings are the command and response strings captured in `STAR_tests.py`, and the
+formats are the `fmt` arguments in `STAR.py`, plus the empty format that only reads the id. Every
+string is parsed with every format that matches it. The compiled, cached parser in `STAR.py` is
+checked to give the same results as `uncached_parse_star_fw_string`, a copy of the previous
+implementation that builds and runs one regex per parameter on every call. Reports the best time
+per parse of both over a number of repeats.
+
+Usage:
+  python tools/benchmarks/star_fw_parser.py --repeats 20
+"""
+
+import argparse
+import ast
+import re
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import pylabrobot.liquid_handling.backends.hamilton as hamilton
+from pylabrobot.liquid_handling.backends.hamilton.STAR import parse_star_fw_string
+
+HAMILTON_DIR = Path(hamilton.__file__).parent
+FW_STRING = re.compile(r"^[A-Z][A-Z0-9][A-Z]{2}id\d{4}")
+
+
+def uncached_parse_star_fw_string(resp: str, fmt: str = "") -> dict:
+  """`parse_star_fw_string` before the format strings were compiled and cached."""
+
+  # Remove device and cmd identifier from response.
+  resp = resp[4:]
+
+  # Parse the parameters in the fmt string.
+  info = {}
+
+  def find_param(param):
+    name, data = param[0:2], param[2:]
+    type_ = {"#": "int", "*": "hex", "&": "str"}[data[0]]
+
+    # Build a regex to match this parameter.
+    exp = {
+      "int": r"[-+]?[\d ]",
+      "hex": r"[\da-fA-F ]",
+      "str": ".",
+    }[type_]
+    len_ = len(data.split(" ")[0])  # Get length of first block.
+    regex = f"{name}((?:{exp}{ {len_} }"
+
+    if param.endswith(" (n)"):
+      regex += " ?)+)"
+      is_list = True
+    else:
+      regex += "))"
+      is_list = False
+
+    # Match response against regex, save results in right datatype.
+    r = re.search(regex, resp)
+    if r is None:
+      raise ValueError(f"could not find matches for parameter {name}")
+
+    g = r.groups()
+    if len(g) == 0:
+      raise ValueError(f"could not find value for parameter {name}")
+    m = g[0]
+
+    if is_list:
+      m = m.split(" ")
+
+      if type_ == "str":
+        info[name] = m
+      elif type_ == "int":
+        info[name] = [int(m_) for m_ in m if m_ != ""]
+      elif type_ == "hex":
+        info[name] = [int(m_, base=16) for m_ in m if m_ != ""]
+    else:
+      if type_ == "str":
+        info[name] = m
+      elif type_ == "int":
+        info[name] = int(m)
+      elif type_ == "hex":
+        info[name] = int(m, base=16)
+
+  # Find params in string. All params are identified by 2 lowercase chars.
+  param = ""
+  prevchar = None
+  for char in fmt:
+    if char.islower() and prevchar != "(":
+      if len(param) > 2:
+        find_param(param)
+        param = ""
+    param += char
+    prevchar = char
+  if param != "":
+    find_param(param)  # last parameter is not closed by loop.
+
+  # If id not in fmt, add it.
+  if "id" not in info:
+    find_param("id####")
+
+  return info
+
+
+def load_fw_strings() -> List[str]:
+  """The firmware strings in `STAR_tests.py`."""
+  tree = ast.parse((HAMILTON_DIR / "STAR_tests.py").read_text())
+  strings = {
+    node.value
+    for node in ast.walk(tree)
+    if isinstance(node, ast.Constant) and isinstance(node.value, str)
+  }
+  return sorted(s for s in strings if FW_STRING.match(s))
+
+
+def load_formats() -> List[str]:
+  """The `fmt` arguments in `STAR.py`."""
+  tree = ast.parse((HAMILTON_DIR / "STAR.py").read_text())
+  formats = {""}
+  for node in ast.walk(tree):
+    if isinstance(node, ast.Call):
+      for keyword in node.keywords:
+        if keyword.arg == "fmt" and isinstance(keyword.value, ast.Constant):
+          formats.add(keyword.value.value)
+  return sorted(formats)
+
+
+def load_pairs() -> List[Tuple[str, str]]:
+  """Every (string, format) pair that parses, checking that both parsers agree."""
+  pairs = []
+  for resp in load_fw_strings():
+    for fmt in load_formats():
+      try:
+        expected = uncached_parse_star_fw_string(resp, fmt)
+      except (ValueError, IndexError):  # IndexError: formats without parameters, like "#"
+        continue
+      assert parse_star_fw_string(resp, fmt) == expected, (resp, fmt)
+      pairs.append((resp, fmt))
+  return pairs
+
+
+def time_parser(parse: Callable[[str, str], dict], pairs, num_repeats: int) -> float:
+  best = float("inf")
+  for _ in range(num_repeats):
+    start = time.perf_counter()
+    for resp, fmt in pairs:
+      parse(resp, fmt)
+    best = min(best, (time.perf_counter() - start) / len(pairs))
+  return best
+
+
+def benchmark(num_repeats: int) -> None:
+  pairs = load_pairs()
+  print(f"{len(pairs)} (string, format) pairs")
+  for name, parse in [
+    ("uncached parser", uncached_parse_star_fw_string),
+    ("compiled, cached parser", parse_star_fw_string),
+  ]:
+    best = time_parser(parse, pairs, num_repeats)
+    print(f"{name}: best of {num_repeats}: {best * 1e6:.2f} us per parse")
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+  parser.add_argument("--repeats", type=int, default=20, help="number of repeats")
+  args = parser.parse_args()
+  benchmark(args.repeats)
+
+
+if __name__ == "__main__":
+  main()
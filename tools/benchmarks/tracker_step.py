@@ -0,0 +1,89 @@
+"""Benchmark the tracker overhead of one liquid handling step.
+
+A step is the tracker calls of an 8-channel aspiration and dispense, and of picking up and dropping
+tips on 8 head trackers, as made by `LiquidHandler`. Reports the best time per step over a number
+of repeats.
+
+Usage:
+  python tools/benchmarks/tracker_step.py --steps 50 --repeats 50
+"""
+
+import argparse
+import time
+
+from pylabrobot.resources import HTF, Cor_96_wellplate_360ul_Fb
+from pylabrobot.resources.liquid import Liquid
+from pylabrobot.resources.tip_tracker import TipTracker
+
+NUM_CHANNELS = 8
+
+
+def make_step():
+  plate = Cor_96_wellplate_360ul_Fb(name="plate")
+  tip_rack = HTF(name="tip_rack")
+  sources = plate.get_items("A1:H1")
+  targets = plate.get_items("A2:H2")
+  spots = tip_rack.get_items("A1:H1")
+  head = [TipTracker(thing=f"Channel {c}") for c in range(NUM_CHANNELS)]
+  for well in sources:
+    well.tracker.set_liquids([(Liquid.WATER, 300)])
+
+  def step():
+    tips = []
+    for spot, channel in zip(spots, head):
+      tip = spot.get_tip()
+      spot.tracker.remove_tip()
+      channel.add_tip(tip, origin=spot, commit=False)
+      spot.tracker.commit()
+      channel.commit()
+      tips.append(tip)
+
+    for well, tip in zip(sources, tips):
+      for liquid, volume in well.tracker.remove_liquid(10):
+        tip.tracker.add_liquid(liquid, volume)
+      well.tracker.commit()
+      tip.tracker.commit()
+
+    for well, tip in zip(targets, tips):
+      for liquid, volume in reversed(tip.tracker.remove_liquid(10)):
+        well.tracker.add_liquid(liquid, volume)
+      tip.tracker.commit()
+      well.tracker.commit()
+
+    for spot, channel, tip in zip(spots, head, tips):
+      channel.remove_tip()
+      spot.tracker.add_tip(tip, commit=False)
+      channel.commit()
+      spot.tracker.commit()
+
+    # move the liquid back, so every step starts from the same state
+    for source, target in zip(sources, targets):
+      source.tracker.add_liquid(Liquid.WATER, target.tracker.get_used_volume())
+      target.tracker.remove_liquid(target.tracker.get_used_volume())
+      source.tracker.commit()
+      target.tracker.commit()
+
+  return step
+
+
+def benchmark(num_steps: int, num_repeats: int) -> None:
+  step = make_step()
+  best = float("inf")
+  for _ in range(num_repeats):
+    start = time.perf_counter()
+    for _ in range(num_steps):
+      step()
+    best = min(best, (time.perf_counter() - start) / num_steps)
+  print(f"best of {num_repeats}x{num_steps} steps: {best * 1e6:.1f} us per step")
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+  parser.add_argument("--steps", type=int, default=50, help="number of steps per repeat")
+  parser.add_argument("--repeats", type=int, default=50, help="number of repeats")
+  args = parser.parse_args()
+  benchmark(args.steps, args.repeats)
+
+
+if __name__ == "__main__":
+  main()